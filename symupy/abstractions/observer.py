@@ -15,6 +15,8 @@ import abc
 
 
 class AbsObserver(metaclass=abc.ABCMeta):
+    __slots__ = ()
+
     @abc.abstractmethod
     def update(self, value):
         """Local update method to retrieve subject data"""
@@ -0,0 +1,297 @@
+"""
+Columnar Trajectories
+=====================
+One time conversion of SymuFlow trajectory outputs (``*_traf.xml``) into a compressed columnar store.
+
+The store is a directory next to the output (``<file><TRAJ_CACHE_EXTENSION>``) containing:
+
+* ``traj_<n>.npz``: trajectories of a time window, one compressed array per column. Links are dictionary encoded.
+* ``vehicles.npz``: one row per vehicle with its origin, destination, times and itinerary.
+* ``manifest.json``: time windows, link dictionary, simulation start and the size and modification time of the source, written last.
+
+Example:
+    To convert an output once and read trajectories of some vehicles ::
+
+        >>> cache = TrajectoryCache.build("defaultOut_traf.xml")
+        >>> cache = TrajectoryCache.load("defaultOut_traf.xml") # None when stale
+        >>> cache.trajectories(["0", "12"])["12"]["vit"]
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import os
+import json
+import shutil
+from functools import cached_property
+
+import numpy as np
+from lxml import etree
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.utils.constants import TRAJ_CACHE_EXTENSION, TRAJ_CACHE_WINDOW
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+# Trajectory attribute → column type, ``time`` and ``tron`` are added
+TRAJ_COLUMNS = {
+    "id": np.int64,
+    "abs": np.float64,
+    "ord": np.float64,
+    "acc": np.float64,
+    "vit": np.float64,
+    "dst": np.float64,
+    "voie": np.int32,
+}
+
+VEHICLE_COLUMNS = ("id", "entree", "sortie", "instC", "instE", "instS", "itineraire")
+
+
+class TrajectoryCache:
+    """Columnar store of the trajectories of a SymuFlow output
+
+    Args:
+        path (str): store directory
+        manifest (dict): store description
+
+    :return: Trajectory cache
+    :rtype: TrajectoryCache
+    """
+
+    version = 1
+
+    def __init__(self, path: str, manifest: dict) -> None:
+        self.path = path
+        self.manifest = manifest
+        self.start = manifest["start"]
+        self.window = manifest["window"]
+        self.partitions = manifest["partitions"]
+        self.links = np.array(manifest["links"], dtype=object)
+
+    def __len__(self) -> int:
+        return sum(partition["rows"] for partition in self.partitions)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path}, rows={len(self)})"
+
+    @staticmethod
+    def location(filename: str) -> str:
+        """Default store directory of an output"""
+        return filename + TRAJ_CACHE_EXTENSION
+
+    @classmethod
+    def _stamp(cls, filename: str) -> list:
+        stat = os.stat(filename)
+        return [cls.version, stat.st_size, stat.st_mtime_ns]
+
+    @classmethod
+    def load(cls, filename: str, path: str = None):
+        """Opens the store of an output
+
+        Args:
+            filename (str): path towards the SymuFlow output
+            path (str): store directory, defaults to ``location(filename)``
+
+        Returns:
+            TrajectoryCache: store, ``None`` when missing or older than the output
+        """
+        path = path or cls.location(filename)
+        try:
+            with open(os.path.join(path, "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("stamp") != cls._stamp(filename):
+            return None
+        return cls(path, manifest)
+
+    @classmethod
+    def build(cls, filename: str, window: float = TRAJ_CACHE_WINDOW, path: str = None):
+        """Converts an output in a single streaming pass, trajectories are written window by window
+
+        Args:
+            filename (str): path towards the SymuFlow output
+            window (float): duration in seconds of each partition, defaults to ``TRAJ_CACHE_WINDOW``
+            path (str): store directory, defaults to ``location(filename)``
+
+        Returns:
+            TrajectoryCache: store
+        """
+        path = path or cls.location(filename)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+        manifest = {
+            "stamp": cls._stamp(filename),
+            "start": "00:00:00",
+            "window": window,
+            "partitions": [],
+        }
+        codes = {}
+        rows = {key: [] for key in ("time", "tron", *TRAJ_COLUMNS)}
+        vehicles = {key: [] for key in VEHICLE_COLUMNS}
+        current, time = None, 0.0
+
+        context = etree.iterparse(
+            filename, events=("start", "end"), tag=("SIMULATION", "INST", "TRAJ", "VEH")
+        )
+        for event, elem in context:
+            if event == "start":
+                if elem.tag == "INST":
+                    time = float(elem.get("val"))
+                    if current is not None and time // window != current:
+                        cls._write_partition(path, manifest, rows)
+                    current = time // window
+                elif elem.tag == "SIMULATION":
+                    manifest["start"] = elem.get("debut", manifest["start"])
+                continue
+            if elem.tag == "TRAJ":
+                get = elem.get
+                rows["time"].append(time)
+                rows["tron"].append(codes.setdefault(get("tron"), len(codes)))
+                for key in TRAJ_COLUMNS:
+                    rows[key].append(get(key))
+                continue
+            if elem.tag == "VEH":
+                for key in VEHICLE_COLUMNS:
+                    vehicles[key].append(elem.get(key, ""))
+            elif elem.tag == "SIMULATION":
+                continue
+            # Parsed elements are dropped to keep memory bounded
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        del context
+        cls._write_partition(path, manifest, rows)
+
+        with open(os.path.join(path, "vehicles.npz"), "wb") as f:
+            np.savez_compressed(
+                f, **{key: np.array(values, dtype=str) for key, values in vehicles.items()}
+            )
+        manifest["links"] = list(codes)
+        with open(os.path.join(path, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        return cls(path, manifest)
+
+    @staticmethod
+    def _write_partition(path: str, manifest: dict, rows: dict) -> None:
+        if not rows["time"]:
+            return
+        columns = {
+            "time": np.array(rows["time"], dtype=np.float64),
+            "tron": np.array(rows["tron"], dtype=np.int32),
+        }
+        for key, dtype in TRAJ_COLUMNS.items():
+            columns[key] = np.array(rows[key], dtype=np.float64).astype(dtype)
+        name = f"traj_{len(manifest['partitions']):04d}.npz"
+        with open(os.path.join(path, name), "wb") as f:
+            np.savez_compressed(f, **columns)
+        manifest["partitions"].append(
+            {
+                "file": name,
+                "t0": float(columns["time"][0]),
+                "t1": float(columns["time"][-1]),
+                "rows": len(columns["time"]),
+            }
+        )
+        for values in rows.values():
+            values.clear()
+
+    def partition(self, index: int) -> dict:
+        """Columns of a partition, ``tron`` holds codes into :py:attr:`links`
+
+        Args:
+            index (int): partition number
+
+        Returns:
+            dict: column name → array
+        """
+        with np.load(os.path.join(self.path, self.partitions[index]["file"])) as data:
+            return {key: data[key] for key in data.files}
+
+    @cached_property
+    def vehicles(self) -> dict:
+        """Vehicle table, raw attribute values of the ``VEH`` elements (empty when missing)
+
+        Returns:
+            dict: column name → array of strings
+        """
+        with np.load(os.path.join(self.path, "vehicles.npz")) as data:
+            return {key: data[key] for key in data.files}
+
+    @cached_property
+    def vehicle_rows(self) -> dict:
+        """Row of each vehicle within the vehicle table
+
+        Returns:
+            dict: vehid (str) → row
+        """
+        return {vehid: row for row, vehid in enumerate(self.vehicles["id"].tolist())}
+
+    def trajectories(self, vehids) -> dict:
+        """Trajectories of a set of vehicles, ordered by time
+
+        Args:
+            vehids (iterable): vehicle ids
+
+        Returns:
+            dict: vehid (str) → column name → array, links decoded. Vehicles without states are omitted
+        """
+        wanted = np.array(sorted({int(vehid) for vehid in vehids}), dtype=np.int64)
+        selected = []
+        for index in range(len(self.partitions)):
+            columns = self.partition(index)
+            mask = np.isin(columns["id"], wanted)
+            if mask.any():
+                selected.append({key: values[mask] for key, values in columns.items()})
+        if not selected:
+            return {}
+
+        columns = {key: np.concatenate([s[key] for s in selected]) for key in selected[0]}
+        order = np.argsort(columns["id"], kind="stable")
+        columns = {key: values[order] for key, values in columns.items()}
+        columns["tron"] = self.links[columns["tron"]]
+        vehids, starts = np.unique(columns["id"], return_index=True)
+        bounds = np.append(starts, len(columns["id"]))
+        return {
+            str(vehid): {key: values[a:b] for key, values in columns.items()}
+            for vehid, a, b in zip(vehids.tolist(), bounds[:-1], bounds[1:])
+        }
+
+    def scan(self, lower: float, upper: float, vehids=None, links=None):
+        """Trajectories within a time range, only partitions overlapping the range are read
+
+        Args:
+            lower (float): first time (s), relative to the simulation start
+            upper (float): last time (s), relative to the simulation start
+            vehids (iterable): vehicle ids to keep, defaults to all
+            links (iterable): links to keep, defaults to all
+
+        Returns:
+            Iterator[dict]: one batch per partition with selected rows, column name → array, links decoded
+        """
+        if vehids is not None:
+            vehids = np.array(sorted({int(vehid) for vehid in vehids}), dtype=np.int64)
+        if links is not None:
+            links = np.flatnonzero(np.isin(self.links, list(links)))
+
+        for index, partition in enumerate(self.partitions):
+            if partition["t1"] < lower or partition["t0"] > upper:
+                continue
+            columns = self.partition(index)
+            mask = (columns["time"] >= lower) & (columns["time"] <= upper)
+            if vehids is not None:
+                mask &= np.isin(columns["id"], vehids)
+            if links is not None:
+                mask &= np.isin(columns["tron"], links)
+            if not mask.any():
+                continue
+            batch = {key: values[mask] for key, values in columns.items()}
+            batch["tron"] = self.links[batch["tron"]]
+            yield batch
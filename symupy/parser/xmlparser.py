@@ -8,124 +8,349 @@ A generic parser for XML files.
 # INTERNAL IMPORTS
 # ============================================================================
 
+import os
 import re
+import sys
+import mmap
+from collections import defaultdict
 from functools import cache, cached_property
 from typing import Pattern
-from symupy.utils.constants import FIELD_FORMAT, FIELD_DATA
+
+import numpy as np
+
+from symupy.utils.constants import (
+    FIELD_FORMAT,
+    FIELD_FORMATCOL,
+    FIELD_DATA,
+    XML_INDEX_EXTENSION,
+)
+from symupy.utils.exceptions import SymupyWarning, SymupyFileLoadError
 
 # ============================================================================
 # CLASS AND DEFINITIONS
 # ============================================================================
 
 
+class XMLIndex:
+    """Byte offset index of all elements of a XML file, built in a single pass.
+
+    Elements are numbered in document order, for each element the index keeps its tag, the byte span of its opening tag and of the whole element, its line, its parent and its first child and next sibling. Attributes are not kept, they are read from the opening tag when needed. Numeric attributes of the children of an element can be kept as arrays, see :py:meth:`child_values`.
+
+    On request, the index is persisted in a sidecar file (``<file><XML_INDEX_EXTENSION>``) and reused as long as the size and modification time of the file are unchanged. Failures to write the sidecar only emit a warning.
+
+    Args:
+        filename (str): path towards the XML file
+        sidecar (bool): keep the index in a sidecar file, defaults to False
+
+    Raises:
+        SymupyFileLoadError: the file is not well formed, its tags are not balanced
+    """
+
+    version = 1
+    fields = ("start", "head", "stop", "line", "parent", "first_child", "next_sibling", "tag")
+    pattern_token = re.compile(
+        rb'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<[?!][^>]*>|<(/?)([^\s/>]+)((?:[^>"]|"[^"]*")*)>',
+        re.DOTALL,
+    )
+
+    def __init__(self, filename: str, sidecar: bool = False):
+        self.filename = filename
+        stat = os.stat(filename)
+        self._stamp = (self.version, stat.st_size, stat.st_mtime_ns)
+        self._path = filename + XML_INDEX_EXTENSION
+        self._sidecar = sidecar
+        self._values = {}
+        if not (sidecar and self._load()):
+            self._build()
+            if sidecar:
+                self._save()
+        self._by_tag = {}
+        self._by_attr = {}
+        self._first = {}
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.filename}, elements={len(self)})"
+
+    @cached_property
+    def buffer(self):
+        """Read only mapping of the file, shared by all elements of the index
+
+        Returns:
+            mmap.mmap: file mapping (empty ``bytes`` for an empty file)
+        """
+        with open(self.filename, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Releases the file mapping, it is mapped again on next access"""
+        buffer = self.__dict__.pop("buffer", None)
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+    def _build(self) -> None:
+        columns = {field: [] for field in self.fields}
+        last_child = []
+        codes = {}
+        stack = []
+        line, previous = 1, 0
+
+        data = self.buffer
+        for match in self.pattern_token.finditer(data):
+            closing, name, rest = match.groups()
+            if name is None:
+                continue
+            line += data[previous : match.start()].count(b"\n")
+            previous = match.start()
+            if closing:
+                if not stack or columns["tag"][stack[-1]] != codes.get(name):
+                    raise SymupyFileLoadError(
+                        f"Unexpected closing tag </{name.decode('UTF8')}> on line {line}",
+                        self.filename,
+                    )
+                columns["stop"][stack.pop()] = match.end()
+                continue
+
+            node = len(last_child)
+            parent = stack[-1] if stack else -1
+            columns["start"].append(match.start())
+            columns["head"].append(match.end())
+            columns["stop"].append(match.end())
+            columns["line"].append(line)
+            columns["parent"].append(parent)
+            columns["first_child"].append(-1)
+            columns["next_sibling"].append(-1)
+            columns["tag"].append(codes.setdefault(name, len(codes)))
+            last_child.append(-1)
+            if parent >= 0:
+                if last_child[parent] < 0:
+                    columns["first_child"][parent] = node
+                else:
+                    columns["next_sibling"][last_child[parent]] = node
+                last_child[parent] = node
+            if not rest.endswith(b"/"):
+                stack.append(node)
+
+        if stack:
+            node = stack[-1]
+            name = list(codes)[columns["tag"][node]].decode("UTF8")
+            raise SymupyFileLoadError(
+                f"Element <{name}> on line {columns['line'][node]} is not closed",
+                self.filename,
+            )
+        for field, values in columns.items():
+            dtype = np.int32 if field == "tag" else np.int64
+            setattr(self, field, np.array(values, dtype=dtype))
+        self.tags = tuple(name.decode("UTF8") for name in codes)
+
+    def _load(self) -> bool:
+        try:
+            with np.load(self._path) as data:
+                if tuple(data["stamp"]) != self._stamp:
+                    return False
+                for field in self.fields:
+                    setattr(self, field, data[field])
+                self.tags = tuple(data["tags"].tolist())
+                for name in data.files:
+                    if name.startswith("values_"):
+                        _, node, attr = name.split("_", 2)
+                        self._values[int(node), attr] = data[name]
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _save(self) -> None:
+        arrays = {field: getattr(self, field) for field in self.fields}
+        for (node, attr), values in self._values.items():
+            arrays[f"values_{node}_{attr}"] = values
+        try:
+            with open(self._path, "wb") as f:
+                np.savez(
+                    f,
+                    stamp=np.array(self._stamp, dtype=np.int64),
+                    tags=np.array(self.tags, dtype=str),
+                    **arrays,
+                )
+        except OSError:
+            SymupyWarning(f"XML index could not be saved in {self._path}")
+
+    def read_head(self, node: int) -> bytes:
+        """Opening tag of an element"""
+        return self.buffer[self.start[node] : self.head[node]]
+
+    def read(self, node: int) -> bytes:
+        """Whole element, from its opening tag to its closing tag"""
+        return self.buffer[self.start[node] : self.stop[node]]
+
+    def first(self, tag: str) -> int:
+        """First element with a tag in document order, -1 when missing"""
+        if tag not in self._first:
+            node = -1
+            if tag in self.tags:
+                matches = np.flatnonzero(self.tag == self.tags.index(tag))
+                node = int(matches[0]) if len(matches) else -1
+            self._first[tag] = node
+        return self._first[tag]
+
+    def children(self, node: int):
+        """Iterates over the children of an element"""
+        child = int(self.first_child[node])
+        while child >= 0:
+            yield child
+            child = int(self.next_sibling[child])
+
+    def child_by_tag(self, node: int, tag: str) -> int:
+        """First child of an element with a tag, -1 when missing"""
+        if node not in self._by_tag:
+            by_tag = {}
+            for child in self.children(node):
+                by_tag.setdefault(self.tags[self.tag[child]], child)
+            self._by_tag[node] = by_tag
+        return self._by_tag[node].get(tag, -1)
+
+    def child_by_attr(self, node: int, attr: str, val: str) -> int:
+        """First child of an element with an attribute value, -1 when missing"""
+        key = (node, attr)
+        if key not in self._by_attr:
+            by_value = {}
+            for child in self.children(node):
+                attrs = XMLElement.parse_attributes(self.read_head(child))
+                if attr in attrs:
+                    by_value.setdefault(attrs[attr], child)
+            self._by_attr[key] = by_value
+        return self._by_attr[key].get(val, -1)
+
+    def child_values(self, node: int, attr: str) -> np.ndarray:
+        """Numeric attribute of all children of an element, e.g. times of ``INST`` elements. Values are read once from the opening tags and kept with the index (and its sidecar), children are found with :py:meth:`children` in the same order.
+
+        Args:
+            node (int): parent element
+            attr (str): attribute name
+
+        Returns:
+            ndarray: ``float64`` values, NaN when a child has no such attribute
+        """
+        key = (node, attr)
+        if key not in self._values:
+            pattern = re.compile(rb"\s" + re.escape(attr.encode("UTF8")) + rb'="(.*?)"')
+            data = self.buffer
+            children = np.flatnonzero(self.parent == node)
+            values = np.full(len(children), np.nan)
+            for i, (start, head) in enumerate(
+                zip(self.start[children].tolist(), self.head[children].tolist())
+            ):
+                match = pattern.search(data, start, head)
+                if match:
+                    values[i] = float(match.group(1))
+            self._values[key] = values
+            if self._sidecar:
+                self._save()
+        return self._values[key]
+
+
 class XMLElement:
-    pattern_tag = re.compile("(?<=<)(\w+)(?=>|\s|\/)")
-    pattern_comment = re.compile("^<!(.*)>$")
-    pattern_args = re.compile('\s([a-zA-Z0-9_:]+)="(.*?)"')
-    pattern_childrens = re.compile("\/>$")
+    """Element of a XML file described by a ``XMLIndex``. Attributes are sliced from the file mapping of the index on first access.
 
-    def __init__(self, line, pos, filename, linenum):
-        self._filename = filename
-        self._pos = pos
-        self.tag = XMLElement.pattern_tag.findall(line)[0]
-        self.attr = {key: val for key, val in XMLElement.pattern_args.findall(line)}
-        self.sourceline = linenum
+    Args:
+        index (XMLIndex): index of the file
+        node (int): element number within the index
+    """
+
+    pattern_args = re.compile(rb'\s([a-zA-Z0-9_:]+)="(.*?)"')
+
+    def __init__(self, index: XMLIndex, node: int):
+        self._index = index
+        self._node = node
+        self.tag = index.tags[index.tag[node]]
+        self.sourceline = int(index.line[node])
+
+    @classmethod
+    def parse_attributes(cls, head: bytes) -> dict:
+        return {
+            key.decode("UTF8"): val.decode("UTF8")
+            for key, val in cls.pattern_args.findall(head)
+        }
+
+    @cached_property
+    def attr(self) -> dict:
+        return XMLElement.parse_attributes(self._index.read_head(self._node))
+
+    @property
+    def source(self) -> bytes:
+        """Element as written in the file, including its childrens"""
+        return self._index.read(self._node)
+
+    @property
+    def _filename(self) -> str:
+        return self._index.filename
 
-        if XMLElement.pattern_childrens.findall(line):
-            self._has_childrens = False
-        else:
-            self._has_childrens = True
+    @property
+    def _pos(self) -> int:
+        return int(self._index.start[self._node])
+
+    def _element(self, node: int):
+        return XMLElement(self._index, node) if node >= 0 else None
 
     def iterchildrens(self):
-        linenum = self.sourceline
-        with open(self._filename) as f:
-            f.seek(self._pos)
-            f.readline()
-
-            if self._has_childrens:
-                linenum += 1
-                line = f.readline().strip()
-                while not any(
-                    bool(x)
-                    for x in [
-                        re.findall(self._end_tag(self.tag), line),
-                        re.findall(self._startend_tag(self.tag), line),
-                    ]
-                ):
-                    # Checking if line is a comment or blank
-                    if not XMLElement.pattern_comment.findall(line) and line != "":
-                        new_tag = XMLElement.pattern_tag.findall(line)[0]
-                        end_tag = re.compile(f"<\/{new_tag}>")
-                        if re.findall(self._startend_tag(new_tag), line):
-                            pos = f.tell() - (len(line) + 2)
-                            yield XMLElement(line, pos, self._filename, linenum)
-                        elif re.findall(self._start_tag(new_tag), line):
-                            pos = f.tell() - (len(line) + 2)
-                            keep_line = line
-                            keepnum = linenum
-                            while True:
-                                linenum += 1
-                                line = f.readline().strip()
-                                if end_tag.findall(line):
-                                    break
-                            yield XMLElement(keep_line, pos, self._filename, keepnum)
-                        else:
-                            break
-                    linenum += 1
-                    line = f.readline().strip()
-            else:
-                yield from ()
+        for child in self._index.children(self._node):
+            yield XMLElement(self._index, child)
 
     def getchildrens(self):
         return list(self.iterchildrens())
 
     def find_children_tag(self, tag):
-        for child in self.iterchildrens():
-            if child.tag == tag:
-                return child
+        return self._element(self._index.child_by_tag(self._node, tag))
 
     def find_children_attr(self, attr, val):
-        for child in self.iterchildrens():
-            if attr in child.attr.keys():
-                if child.attr[attr] == val:
-                    return child
-
-    def _start_tag(self, tag):
-        return f"<{tag}.*>"
-
-    def _end_tag(self, tag):
-        return f"<\/{tag}>"
-
-    def _startend_tag(self, tag):
-        return f"^<{tag}.*\/>"
+        return self._element(self._index.child_by_attr(self._node, attr, val))
 
     def __repr__(self):
         return f"XMLElement({self.tag}, {self.attr.__repr__()})"
 
     def __hash__(self):
-        return hash((self._filename, self.sourceline))
+        return hash((self._filename, self._node))
 
     def __eq__(self, another):
-        return (
-            self.sourceline == another.sourceline
-            and self._filename == another._filename
-        )
+        return self._node == another._node and self._filename == another._filename
 
 
 class XMLParser(object):
-    def __init__(self, filename):
+    """Parser navigating a XML file through a ``XMLIndex``. The file is memory mapped once, all elements of the parser share the mapping.
+
+    Args:
+        filename (str): path towards the XML file
+        sidecar (bool): keep the index in a sidecar file, defaults to False
+    """
+
+    def __init__(self, filename, sidecar: bool = False):
         self._filename = filename
+        self._sidecar = sidecar
+
+    @cached_property
+    def index(self) -> XMLIndex:
+        return XMLIndex(self._filename, self._sidecar)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Releases the file mapping shared by the elements of the parser"""
+        if "index" in self.__dict__:
+            self.index.close()
+
+    def _element(self, node: int):
+        return XMLElement(self.index, node) if node >= 0 else None
 
     def get_elem(self, elem):
-        linenum = 1
-        with open(self._filename, "r") as f:
-            line = f.readline()
-            while line:
-                if re.findall(f"(?<=<){elem}(?=>|\s|\/)", line):
-                    pos = f.tell() - len(line)
-                    return XMLElement(line.strip(), pos, self._filename, linenum)
-                linenum += 1
-                line = f.readline()
+        return self._element(self.index.first(elem))
 
     def xpath(self, path):
         tags = path.split("/")
@@ -140,42 +365,39 @@ class XMLParser(object):
         return elem
 
     def get_root(self):
-        linenum = 1
-        with open(self._filename, "r") as f:
-            line = f.readline()
-            # Check first elem in XML but ignore header and comment
-            while not re.findall("^<[^\?|!](.*)>$", line):
-                linenum += 1
-                line = f.readline()
-            pos = f.tell() - len(line)
-            return XMLElement(line.strip(), pos, self._filename, linenum)
+        return self._element(0 if len(self.index) else -1)
 
 
 PATTERN = {
-    "abs": re.compile(r'abs="(.*?)"'),
-    "acc": re.compile(r'acc="(.*?)"'),
-    "dst": re.compile(r'dst="(.*?)"'),
-    "etat_pilotage": re.compile(r'dst="([\d\.]*?)"( etat_pilotage=".*?")? id="(.*?)"'),
-    "id": re.compile(r'id="(\d+)"'),
-    "ord": re.compile(r'ord="(.*?)"'),
-    "tron": re.compile(r'tron="(.*?)"'),
-    "type": re.compile(r'tron="(.*?)" type="(.*?)" vit="(.*?)"'),
-    "vit": re.compile(r'vit="(.*?)"'),
-    "voie": re.compile(r'voie="(.*?)"'),
-    "z": re.compile(r'z="(.*?)"'),
-    "traj": re.compile(
-        r'abs="(.*?)" acc="(.*?)" dst="([\d\.]*?)"( etat_pilotage=".*?")? id="(.*?)" ord="(.*?)" tron="(.*?)" type="(.*?)" vit="(.*?)" voie="(.*?)" z="(.*?)"'
+    "traj_row": re.compile(
+        rb'<TRAJ abs="([^"]*)" acc="([^"]*)" dst="([^"]*)"( etat_pilotage="[^"]*")? id="([^"]*)" ord="([^"]*)" tron="([^"]*)" type="([^"]*)" vit="([^"]*)" voie="([^"]*)" z="([^"]*)"'
     ),
-    "inst": re.compile(r'val="(.*?)"'),
-    "nbveh": re.compile(r'nbVeh="(.*?)"'),
-    "extract_traj_balise": re.compile('<TRAJS>(.*?)<\/TRAJS>')
+    "traj_open": re.compile(rb"<TRAJ\s"),
+    "traj_elem": re.compile(rb"<TRAJ\s(.*?)/>"),
+    "traj_attr": re.compile(rb'([a-zA-Z0-9_:]+)="(.*?)"'),
+    "inst": re.compile(rb'val="(.*?)"'),
+    "nbveh": re.compile(rb'nbVeh="(.*?)"'),
+    "extract_traj_balise": re.compile(rb"<TRAJS>([^\x00]*?)</TRAJS>"),
+    "end_of_string": re.compile(rb"\x00"),
 }
 
 CAV_TYPE = tuple(value for key, value in FIELD_FORMAT.items())
 
+TRAJ_FIELDS = tuple(FIELD_FORMAT.keys())
+
+TRAJ_DEFAULTS = {
+    key.encode(): b"" if FIELD_FORMATCOL[key] in (bool, object) else b"0"
+    for key in TRAJ_FIELDS
+}
+
+SNAPSHOT_DTYPE = np.dtype([(FIELD_DATA[key], FIELD_FORMATCOL[key]) for key in TRAJ_FIELDS])
+
 
 class XMLTrajectory:
-    """Model object for a trajectory, it can be created from a xml and contains trajectories for a set of vehicles."""
+    """Model object for a trajectory, it can be created from a xml and contains trajectories for a set of vehicles.
+
+    The ``<TRAJS>`` block is decoded once into typed columns (see :py:attr:`columns`), per field properties are views built over these columns.
+    """
 
     aliases = {
         "abscissa": "abs",
@@ -191,12 +413,32 @@ class XMLTrajectory:
     }
 
     def __init__(self, xml: bytes):
-        self._xml = xml.decode("UTF8")
-        self._trajs = ''
-        if len(self._xml)>0:
-            pattern = PATTERN['extract_traj_balise'].findall(self._xml)
-            if len(pattern)>0:
-                self._trajs = pattern[0]
+        """Create a trajectory from a simulator response
+
+        Args:
+            xml (bytes): simulator response, either ``bytes`` or a writable buffer such as the ``ctypes`` string buffer filled by the simulator. Buffers are parsed in place without intermediate copies, since they are reused by the simulator all data is decoded immediately. The raw string is only decoded on access and remains valid until the simulator writes its next answer in the buffer.
+        """
+        self._buffer = xml
+        self._end = len(xml)
+        self._span = (0, 0)
+
+        if not isinstance(xml, bytes):
+            end = PATTERN["end_of_string"].search(xml)
+            if end:
+                self._end = end.start()
+
+        match = PATTERN["extract_traj_balise"].search(xml, 0, self._end)
+        if match:
+            self._span = match.span(1)
+
+        if not isinstance(xml, bytes):
+            self.columns
+            if self._end:
+                self.inst, self.nbveh
+
+    @cached_property
+    def _xml(self) -> str:
+        return self._buffer[: self._end].decode("UTF8")
 
     def __getattr__(self, name):
         if name == "aliases":
@@ -205,42 +447,57 @@ class XMLTrajectory:
         return object.__getattribute__(self, name)
 
     @cached_property
-    def abs(self) -> tuple:
-        """`abs` cached values for all vehicles in network
+    def columns(self) -> dict:
+        """Typed columns for all vehicles in network, decoded in a single pass
+        over the ``<TRAJS>`` block.
+
+        Kinematics are stored as ``float64`` arrays, ``id`` and ``voie`` as integer arrays, ``tron`` and ``type`` as object arrays of interned strings and ``etat_pilotage`` as a boolean array.
 
         Returns:
-            tuple: cached `abs` values
+            dict: XML attribute name → numpy array
         """
+        rows = PATTERN.get("traj_row").findall(self._buffer, *self._span)
+        if len(rows) != len(PATTERN.get("traj_open").findall(self._buffer, *self._span)):
+            # Attributes out of the expected order or extra attributes
+            rows = [
+                XMLTrajectory._tokenize(elem)
+                for elem in PATTERN.get("traj_elem").findall(self._buffer, *self._span)
+            ]
+        values = zip(*rows) if rows else ((),) * len(TRAJ_FIELDS)
+        return {
+            key: XMLTrajectory._tocolumn(key, column)
+            for key, column in zip(TRAJ_FIELDS, values)
+        }
+
+    def _todict(self, key: str) -> dict:
+        return dict(zip(self.id, self.columns[key].tolist()))
 
-        abs = tuple(
-            map(
-                lambda x: FIELD_FORMAT["abs"](x.replace(',', '.')),
-                PATTERN.get("abs").findall(self._trajs),
-            )
-        )
-
-        return dict(zip(self.id, abs))
+    @cached_property
+    def abs(self) -> dict:
+        """`abs` cached values for all vehicles in network
 
+        Returns:
+            dict: cached `abs` values
+        """
+        return self._todict("abs")
 
     @cached_property
     def acc(self):
         """`acceleration` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `acc` values
+            dict: cached `acc` values
         """
-        acc = tuple(map(lambda x: FIELD_FORMAT["acc"](x.replace(',', '.')), PATTERN.get("acc").findall(self._trajs)))
-        return dict(zip(self.id, acc))
+        return self._todict("acc")
 
     @cached_property
     def dst(self):
         """`distance` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `dst` values
+            dict: cached `dst` values
         """
-        dst = tuple(map(lambda x: FIELD_FORMAT["dst"](x.replace(',', '.')), PATTERN.get("dst").findall(self._trajs)))
-        return  dict(zip(self.id, dst))
+        return self._todict("dst")
 
     @cached_property
     def driven(self):
@@ -252,12 +509,10 @@ class XMLTrajectory:
         """`etat_pilotage` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `etat_pilotage` values
+            dict: cached `etat_pilotage` values
         """
-        drv = PATTERN.get("etat_pilotage").findall(self._trajs)
-        if drv:
-            drv = tuple(map(FIELD_FORMAT["etat_pilotage"], [x[1] for x in drv]))
-            return dict(zip(self.id, drv))
+        if self.id:
+            return self._todict("etat_pilotage")
 
     @cached_property
     def id(self):
@@ -266,72 +521,61 @@ class XMLTrajectory:
         Returns:
             tuple: cached `id` values
         """
-        return tuple(
-            map(
-                FIELD_FORMAT["id"],
-                [x for x in PATTERN.get("id").findall(self._trajs)],
-            )
-        )
+        return tuple(self.columns["id"].tolist())
 
     @cached_property
     def ord(self):
         """`ordinate` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `ord` values
+            dict: cached `ord` values
         """
-        ord = tuple(map(lambda x: FIELD_FORMAT["ord"](x.replace(',', '.')), PATTERN.get("ord").findall(self._trajs)))
-        return dict(zip(self.id, ord))
+        return self._todict("ord")
 
     @cached_property
     def tron(self):
         """`link` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `tron` values
+            dict: cached `tron` values
         """
-        tron = tuple(PATTERN.get("tron").findall(self._trajs))
-        return dict(zip(self.id, tron))
+        return self._todict("tron")
 
     @cached_property
     def type(self):
         """Vehicle `type` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `type` values
+            dict: cached `type` values
         """
-        types = tuple(x[1] for x in PATTERN.get("type").findall(self._trajs))
-        return dict(zip(self.id, types))
+        return self._todict("type")
 
     @cached_property
     def vit(self):
         """`speed` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `vit` values
+            dict: cached `vit` values
         """
-        vit = [FIELD_FORMAT["vit"](vit.replace(',', '.')) for vit in PATTERN.get("vit").findall(self._trajs)]
-        return dict(zip(self.id, vit))
+        return self._todict("vit")
 
     @cached_property
     def voie(self):
         """`lane` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `voie` values
+            dict: cached `voie` values
         """
-        voie = tuple(map(FIELD_FORMAT["voie"], PATTERN.get("voie").findall(self._trajs)))
-        return dict(zip(self.id, voie))
+        return self._todict("voie")
 
     @cached_property
     def z(self):
         """`elevation` cached values for all vehicles in network
 
         Returns:
-            tuple: cached `z` values
+            dict: cached `z` values
         """
-        z = (float(z.replace(',', '.')) for z in PATTERN.get("z").findall(self._trajs))
-        return dict(zip(self.id, z))
+        return self._todict("z")
 
     @cached_property
     def traj(self):
@@ -340,28 +584,68 @@ class XMLTrajectory:
         Returns:
             tuple: cached `traj` values
         """
-        return tuple(
-            XMLTrajectory._typeconvert(x)
-            for x in PATTERN.get("traj").findall(self._trajs)
-        )
+        return tuple(zip(*(self.columns[key].tolist() for key in TRAJ_FIELDS)))
+
+    @cached_property
+    def records(self) -> np.ndarray:
+        """Structured array with one record per vehicle in network. Fields
+        are named after ``FIELD_DATA`` e.g. ``vehid``, ``link``, ``speed``
+
+        Returns:
+            np.ndarray: cached structured array
+        """
+        records = np.empty(len(self.columns["id"]), dtype=SNAPSHOT_DTYPE)
+        for key in TRAJ_FIELDS:
+            records[FIELD_DATA[key]] = self.columns[key]
+        return records
+
+    @cached_property
+    def index(self) -> dict:
+        """Row of each vehicle within the columns
+
+        Returns:
+            dict: cached `id` → row values
+        """
+        return {vehid: row for row, vehid in enumerate(self.id)}
+
+    @cached_property
+    def link_index(self) -> dict:
+        """Vehicle ids traveling on each (link, lane), following the order of
+        the trajectories
+
+        Returns:
+            dict: cached (`tron`, `voie`) → `id` values
+        """
+        index = defaultdict(list)
+        for vehid, link, lane in zip(
+            self.id, self.columns["tron"].tolist(), self.columns["voie"].tolist()
+        ):
+            index[(link, lane)].append(vehid)
+        return {key: tuple(vehids) for key, vehids in index.items()}
 
     @cached_property
     def inst(self):
         """`val` simulation time instant for current trajectory
 
         Returns:
-            float: simulation time
+            float: simulation time, None when the response holds no instant
         """
-        return float(PATTERN.get("inst").findall(self._xml)[0].replace(',', '.'))
+        match = PATTERN.get("inst").search(self._buffer, 0, self._end)
+        if match is None:
+            return None
+        return float(match.group(1).replace(b",", b"."))
 
     @cached_property
     def nbveh(self):
         """`nbveh` simulation time instant for current trajectory
 
         Returns:
-            int: number of vehicles
+            int: number of vehicles, None when the response holds no instant
         """
-        return int(PATTERN.get("nbveh").findall(self._xml)[0])
+        match = PATTERN.get("nbveh").search(self._buffer, 0, self._end)
+        if match is None:
+            return None
+        return int(match.group(1))
 
     @cached_property
     def todict(self):
@@ -370,8 +654,25 @@ class XMLTrajectory:
         return tuple(dict(zip(FIELD_DATA.values(), x)) for x in self.traj)
 
     @classmethod
-    def _typeconvert(cls, data: tuple):
-        return tuple(a(b) for a, b in zip(CAV_TYPE, data))
+    def _tokenize(cls, elem: bytes) -> tuple:
+        """Extract trajectory fields from a single ``<TRAJ>`` element regardless of the attribute order"""
+        attrs = dict(PATTERN.get("traj_attr").findall(elem))
+        return tuple(attrs.get(key, default) for key, default in TRAJ_DEFAULTS.items())
+
+    @classmethod
+    def _tocolumn(cls, key: str, values: tuple) -> np.ndarray:
+        """Convert raw values of a field into its typed column"""
+        fmt = FIELD_FORMATCOL[key]
+        if fmt is object:
+            strings = {v: sys.intern(v.decode("UTF8")) for v in set(values)}
+            return np.array([strings[v] for v in values], dtype=object)
+        if fmt is bool:
+            return np.array([bool(v) for v in values], dtype=bool)
+        try:
+            return np.array(values, dtype=fmt)
+        except ValueError:
+            # Decimal comma
+            return np.array([v.replace(b",", b".") for v in values], dtype=fmt)
 
 
 if __name__ == "__main__":
@@ -8,13 +8,17 @@ import os
 from collections import OrderedDict, Counter
 from functools import cached_property, lru_cache
 
+from lxml import etree
+
 # ============================================================================
 # INTERNAL IMPORTS
 # ============================================================================
 
 from symupy.tsc.journey import Path, State, Trip
 from symupy.tsc.network import Network
-from symupy.parser.xmlparser import XMLParser
+from symupy.parser.xmlparser import XMLParser, XMLTrajectory
+from symupy.parser.columnar import TrajectoryCache, TRAJ_COLUMNS
+from symupy.utils.constants import TRAJ_CACHE_WINDOW, SCAN_BATCH_INSTANTS
 from symupy.utils.exceptions import SymupyWarning
 from symupy.utils.time import Date
 from symupy.abstractions.reader import AbstractNetworkReader, AbstractTrafficDataReader
@@ -33,6 +37,9 @@ class SymuFlowNetworkReader(AbstractNetworkReader):
         Description of parameter `file`.
     remove_comments : type
         Description of parameter `remove_comments`.
+    sidecar : bool
+        Keep the element index of the file in a sidecar file, reused by the
+        next readers of the same file as long as it is unchanged.
 
     Attributes
     ----------
@@ -51,12 +58,12 @@ class SymuFlowNetworkReader(AbstractNetworkReader):
 
     _ext = "xml"
 
-    def __init__(self, file, remove_comments=True):
+    def __init__(self, file, remove_comments=True, sidecar=False):
         super().__init__()
 
         assert file.split(".")[-1] == "xml"
         self._file = file
-        self._parser = XMLParser(self._file)
+        self._parser = XMLParser(self._file, sidecar)
 
         root = self._parser.get_root()
         if root.tag == "OUT":
@@ -234,6 +241,16 @@ class SymuFlowTrafficDataReader(AbstractTrafficDataReader):
         Path to the SymuFlow output xml file.
     lru_cache_size : int
         Description of parameter `lru_cache_size`.
+    backend : str
+        ``index`` navigates the file through its element index, ``stream``
+        parses the file incrementally, reading trips in a single pass.
+    cache : bool
+        Use the columnar store of the file (see ``build_cache``) when it is
+        up to date.
+    sidecar : bool
+        Keep the element index of the file (``index`` backend) in a sidecar
+        file, reused by the next readers of the same file as long as it is
+        unchanged instead of indexing the file again.
 
     Attributes
     ----------
@@ -254,102 +271,322 @@ class SymuFlowTrafficDataReader(AbstractTrafficDataReader):
 
     _ext = "xml"
 
-    def __init__(self, traficdatafile, lru_cache_size=None):
+    def __init__(
+        self, traficdatafile, lru_cache_size=None, backend="index", cache=True, sidecar=False
+    ):
         super().__init__()
+        assert backend in ("index", "stream"), "Backend must be index or stream"
         self._file = traficdatafile
-        self.parser = XMLParser(self._file)
-        sim = self.parser.xpath("OUT/SIMULATION")
-        for elem in sim.iterchildrens():
-            if elem.tag == "INSTANTS":
-                self._inst = elem
-            elif elem.tag == "VEHS":
-                self._vehs = elem
-                break
-        self._start_sim = Date(sim.attr["debut"])
+        self._backend = backend
+        self._sidecar = sidecar
+        self._cache = TrajectoryCache.load(traficdatafile) if cache else None
+        if self._cache is not None:
+            self._start_sim = Date(self._cache.start)
+        elif backend == "index":
+            self._start_sim = Date(self._simulation.attr["debut"])
+        else:
+            self._start_sim = Date(self._stream_simulation_start())
         self.get_ids_from_inst = lru_cache(maxsize=lru_cache_size)(
             self._get_ids_from_inst
         )
         self.get_veh_element = lru_cache(maxsize=lru_cache_size)(self._get_veh_element)
 
+    @cached_property
+    def parser(self):
+        return XMLParser(self._file, self._sidecar)
+
+    @cached_property
+    def _simulation(self):
+        return self.parser.xpath("OUT/SIMULATION")
+
+    @cached_property
+    def _inst(self):
+        return self._simulation.find_children_tag("INSTANTS")
+
+    @cached_property
+    def _vehs(self):
+        return self._simulation.find_children_tag("VEHS")
+
     def _get_veh_element(self, vehid):
         return self._vehs.find_children_attr("id", str(vehid))
 
+    def _get_vehicle(self, vehid):
+        if self._cache is None:
+            return self.get_veh_element(vehid).attr
+        row = self._cache.vehicle_rows[str(vehid)]
+        table = self._cache.vehicles
+        return {key: str(table[key][row]) for key in table if table[key][row]}
+
+    def _iter_vehicles(self):
+        if self._cache is None:
+            for el in self._vehs.iterchildrens():
+                yield el.attr
+            return
+        table = self._cache.vehicles
+        for row in zip(*(table[key].tolist() for key in table)):
+            yield {key: value for key, value in zip(table, row) if value}
+
+    def _seconds(self, time, default):
+        # Clock time (str or Date) to seconds from the simulation start
+        if time is None:
+            return default
+        if isinstance(time, (int, float)):
+            return float(time)
+        date = time if isinstance(time, Date) else Date(time)
+        return date.to_seconds() - self._start_sim.to_seconds()
+
+    def _iter_vehicles_between(self, start_period, end_period):
+        # Bounds are converted once, entry times are compared as floats
+        start = self._seconds(start_period, -np.inf)
+        end = self._seconds(end_period, np.inf)
+        for el in self._iter_vehicles():
+            if start <= float(el.get("instE", el["instC"])) <= end:
+                yield el
+
+    @cached_property
+    def _instants(self):
+        """Instant offset index: times and nodes of ``INST``, ordered by time"""
+        index = self.parser.index
+        node = self._inst._node
+        return index.child_values(node, "val"), np.flatnonzero(index.parent == node)
+
+    def scan(self, t0=None, t1=None, vehids=None, links=None):
+        """Trajectories within a time range, for a subset of vehicles and
+        links. Only the instants within the range are read: the first one is
+        found by a binary search over the instant offset index (or over the
+        time partitions of the columnar store) and reading stops after the
+        last one. Rows are filtered as soon as each instant is decoded.
+        Without a columnar store the file is indexed on first use: open the
+        reader with ``sidecar=True`` so that the index and the instant times
+        are persisted and the next readers only read the requested range.
+
+        Parameters
+        ----------
+        t0 : str, Date or float
+            First time, clock time (``hh:mm:ss``) or seconds from the
+            simulation start, defaults to the beginning of the simulation.
+        t1 : str, Date or float
+            Last time, defaults to the end of the simulation.
+        vehids : iterable
+            Vehicle ids to keep, defaults to all.
+        links : iterable
+            Links to keep, defaults to all.
+
+        Yields
+        ------
+        dict
+            Columnar batch, column name → array. ``time`` is given in seconds
+            from the simulation start, other columns are named after the
+            ``TRAJ`` attributes.
+
+        """
+        lower = self._seconds(t0, -np.inf)
+        upper = self._seconds(t1, np.inf)
+        if self._cache is not None:
+            yield from self._cache.scan(lower, upper, vehids, links)
+            return
+
+        if vehids is not None:
+            vehids = np.array(sorted({int(vehid) for vehid in vehids}), dtype=np.int64)
+        if links is not None:
+            links = list(links)
+        index = self.parser.index
+        times, instants = self._instants
+        first = np.searchsorted(times, lower, side="left")
+        last = np.searchsorted(times, upper, side="right")
+
+        batch = []
+        for position in range(first, last):
+            columns = XMLTrajectory(index.read(instants[position])).columns
+            mask = np.ones(len(columns["id"]), dtype=bool)
+            if vehids is not None:
+                mask &= np.isin(columns["id"], vehids)
+            if links is not None:
+                mask &= np.isin(columns["tron"], links)
+            if mask.any():
+                selected = {"time": np.full(mask.sum(), times[position])}
+                for key, dtype in (("tron", object), *TRAJ_COLUMNS.items()):
+                    selected[key] = columns[key][mask].astype(dtype)
+                batch.append(selected)
+            if len(batch) == SCAN_BATCH_INSTANTS or (batch and position == last - 1):
+                yield {key: np.concatenate([b[key] for b in batch]) for key in batch[0]}
+                batch = []
+
+    def build_cache(self, window=TRAJ_CACHE_WINDOW):
+        """Converts the file into a columnar store, used from then on by the
+        reader and by readers created later on the same file.
+
+        Parameters
+        ----------
+        window : float
+            Duration in seconds of the time partitions.
+
+        Returns
+        -------
+        symupy.parser.columnar.TrajectoryCache
+            Columnar store
+
+        """
+        self._cache = TrajectoryCache.build(self._file, window)
+        return self._cache
+
+    def _get_cached_trips(self, vehids):
+        trips = dict()
+        for vehid, columns in self._cache.trajectories(vehids).items():
+            rows = zip(*(columns[key].tolist() for key in columns))
+            states = [
+                self._state(attr, Date(attr["time"]) + self._start_sim)
+                for attr in (dict(zip(columns, row)) for row in rows)
+            ]
+            trips[vehid] = self._trip(vehid, self._get_vehicle(vehid), states)
+        return trips
+
+    @staticmethod
+    def _trip(vehid, attr, states):
+        return Trip(
+            states=states,
+            path=Path(attr["itineraire"].split(" ")),
+            departure_time=attr.get("instE"),
+            arrival_time=attr.get("instS"),
+            origin=attr["entree"],
+            destination=attr["sortie"],
+            vehicle=vehid,
+        )
+
+    @staticmethod
+    def _state(attr, time):
+        return State(
+            time=time,
+            absolute_position=np.array([float(attr["abs"]), float(attr["ord"])]),
+            curvilinear_abscissa=float(attr["dst"]),
+            acceleration=float(attr["acc"]),
+            speed=float(attr["vit"]),
+            lane=int(attr["voie"]),
+            link=attr["tron"],
+        )
+
     def _get_states(self, vehid):
         states = list()
         for inst in self._inst.iterchildrens():
             trajs = self.get_ids_from_inst(inst)
             if vehid in trajs.keys():
-                vehtraj = trajs[vehid]
-                abs = float(vehtraj.attr["abs"])
-                ord = float(vehtraj.attr["ord"])
-                acc = float(vehtraj.attr["acc"])
-                vit = float(vehtraj.attr["vit"])
-                voie = int(vehtraj.attr["voie"])
-                curv_pos = float(vehtraj.attr["dst"])
-                tron = vehtraj.attr["tron"]
                 time = Date(float(inst.attr["val"])) + self._start_sim
-                states.append(
-                    State(
-                        time=time,
-                        absolute_position=np.array([abs, ord]),
-                        curvilinear_abscissa=curv_pos,
-                        acceleration=acc,
-                        speed=vit,
-                        lane=voie,
-                        link=tron,
-                    )
-                )
+                states.append(self._state(trajs[vehid].attr, time))
         return states
 
+    # =========================================================================
+    # STREAMING BACKEND
+    # =========================================================================
+
+    def _stream_simulation_start(self):
+        for _, elem in etree.iterparse(self._file, events=("start",), tag="SIMULATION"):
+            return elem.get("debut")
+
+    @staticmethod
+    def _release(elem):
+        # Keeps the tree bounded: drops the element and its already parsed siblings
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    def get_trips(self, vehids):
+        """Trips of a set of vehicles, read in a single pass over the file.
+
+        The file is parsed incrementally, states of the requested vehicles are routed to one accumulator per vehicle and parsed elements are released on the fly, memory is bounded by the size of the requested trips.
+
+        Parameters
+        ----------
+        vehids : iterable
+            Vehicle ids.
+
+        Returns
+        -------
+        dict
+            dict with veh id (str) as key and Trip as value, vehicles absent from the file are omitted
+
+        """
+        if self._cache is not None:
+            return self._get_cached_trips(vehids)
+
+        wanted = set(map(str, vehids))
+        states = {vehid: [] for vehid in wanted}
+        vehicles = {}
+        time = None
+
+        context = etree.iterparse(
+            self._file, events=("start", "end"), tag=("INST", "TRAJ", "VEH")
+        )
+        for event, elem in context:
+            if elem.tag == "INST":
+                if event == "start":
+                    time = Date(float(elem.get("val"))) + self._start_sim
+                else:
+                    self._release(elem)
+            elif event == "start":
+                continue
+            elif elem.tag == "TRAJ":
+                vehid = elem.get("id")
+                if vehid in wanted:
+                    states[vehid].append(self._state(elem.attrib, time))
+            else:
+                vehid = elem.get("id")
+                if vehid in wanted:
+                    vehicles[vehid] = dict(elem.attrib)
+                self._release(elem)
+        del context
+
+        return {
+            vehid: self._trip(vehid, attr, states[vehid])
+            for vehid, attr in vehicles.items()
+        }
+
     def get_OD(self, origin, destination, start_period=None, end_period=None):
         OD = (origin, destination)
         result = list()
         if start_period is None and end_period is None:
-            for el in self._vehs.iterchildrens():
-                if OD == (el.attr["entree"], el.attr["sortie"]):
-                    veh_el = self.get_veh_element(el.attr["id"])
-                    path = Path(veh_el.attr["itineraire"].split(" "))
+            for el in self._iter_vehicles():
+                if OD == (el["entree"], el["sortie"]):
+                    path = Path(el["itineraire"].split(" "))
                     result.append(path)
         else:
-            start = Date(start_period)
-            end = Date(end_period)
-            for el in self._vehs.iterchildrens():
-                inst = (
-                    Date(float(el.attr.get("instE", el.attr["instC"])))
-                    + self._start_sim
-                )
-                if OD == (el.attr["entree"], el.attr["sortie"]) and (
-                    start <= inst <= end
-                ):
-                    veh_el = self.get_veh_element(el.attr["id"])
-                    path = Path(veh_el.attr["itineraire"].split(" "))
+            for el in self._iter_vehicles_between(start_period, end_period):
+                if OD == (el["entree"], el["sortie"]):
+                    path = Path(el["itineraire"].split(" "))
                     result.append(path)
         return result
 
     def count_OD(self, period=None):
         if period is None:
-            c = Counter(
-                [
-                    (el.attr["entree"], el.attr["sortie"])
-                    for el in self._vehs.iterchildrens()
-                ]
-            )
+            c = Counter([(el["entree"], el["sortie"]) for el in self._iter_vehicles()])
         else:
-            start = Date(period[0])
-            end = Date(period[1])
             c = Counter(
                 [
-                    (el.attr["entree"], el.attr["sortie"])
-                    for el in self._vehs.iterchildrens()
-                    if start
-                    <= Date(float(el.attr.get("instE", el.attr["instC"])))
-                    + self._start_sim
-                    <= end
+                    (el["entree"], el["sortie"])
+                    for el in self._iter_vehicles_between(*period)
                 ]
             )
         return c
 
     def get_trip(self, vehid):
+        """Trip of a single vehicle.
+
+        With the ``stream`` backend (and no columnar store) each call reads
+        the whole file once: to read several trips use :py:meth:`get_trips`,
+        which collects all of them in a single pass.
+
+        Parameters
+        ----------
+        vehid : int or str
+            Vehicle id.
+
+        Returns
+        -------
+        symupy.tsc.journey.Trip
+            Trip of the vehicle
+
+        """
+        if self._backend == "stream" or self._cache is not None:
+            return self.get_trips((vehid,)).get(str(vehid))
         states = self._get_states(vehid)
         veh_el = self.get_veh_element(vehid)
         path = Path(veh_el.attr["itineraire"].split(" "))
@@ -369,8 +606,7 @@ class SymuFlowTrafficDataReader(AbstractTrafficDataReader):
         )
 
     def get_path(self, vehid):
-        veh_el = self.get_veh_element(vehid)
-        path = Path(veh_el.attr["itineraire"].split(" "))
+        path = Path(self._get_vehicle(vehid)["itineraire"].split(" "))
 
         return path
 
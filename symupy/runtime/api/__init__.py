@@ -5,4 +5,5 @@ Contains direct implementations to connect to the traffic simulator.
 """
 
 from .connector import Simulator
-from .scenario import Simulation
+from .scenario import Simulation, ScenarioTemplate
+from .asynchronous import AsyncSimulator
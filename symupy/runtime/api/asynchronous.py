@@ -0,0 +1,105 @@
+"""
+    This module contains an ``AsyncSimulator`` object, a facade of the ``Simulator`` for ``asyncio`` applications.
+
+    Simulator calls (steps, commands, connection) are run in a single dedicated thread, so that the event loop stays responsive while the simulator computes e.g. to exchange with a remote controller. Steps are produced one at a time: the next step is only computed once the consumer asks for it, commands issued between two steps are applied before the next one.
+
+    The SymuFlow library holds a single simulation per process, only one simulator can be run at a time in a process, asynchronous or not. To run several scenarios in parallel use :py:class:`symupy.runtime.batch.BatchRunner`, which runs each of them in its own process.
+
+    Example:
+        To step a simulator while serving a controller from the same event loop ::
+
+            >>> async def follow(simulator):
+            ...     async with AsyncSimulator(simulator) as s:
+            ...         async for step in s.steps():
+            ...             await controller.send(s.request.snapshot())
+            >>> await asyncio.gather(follow(simulator), controller.serve())
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+
+class AsyncSimulator:
+    """Runs a ``Simulator`` from an ``asyncio`` event loop
+
+    Args:
+        simulator (Simulator): simulator with a registered scenario
+
+    :return: Asynchronous simulator
+    :rtype: AsyncSimulator
+    """
+
+    def __init__(self, simulator) -> None:
+        self.simulator = simulator
+        # A single thread keeps the library calls of a simulator ordered
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="symupy-simulator"
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.simulator!r})"
+
+    def __getattr__(self, name):
+        # Attributes such as request, vehicles, do_next are read from the simulator
+        if name == "simulator":
+            raise AttributeError(name)
+        return getattr(self.simulator, name)
+
+    async def __aenter__(self):
+        await self.call(self.simulator.__enter__)
+        return self
+
+    async def __aexit__(self, type, value, traceback) -> bool:
+        try:
+            return await self.call(self.simulator.__exit__, type, value, traceback)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def call(self, method: Callable, *args, **kwargs):
+        """Runs a simulator method in the simulator thread e.g. a command
+
+        Example:
+            Drive a vehicle before next step ::
+
+                >>> await s.call(s.simulator.drive_vehicle, 0, 20.0, "Zone_001")
+
+        Args:
+            method (Callable): simulator method or any callable using the simulator
+
+        Returns:
+            Result of the call
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(method, *args, **kwargs)
+        )
+
+    async def run_step(self) -> int:
+        """Runs a simulation step without blocking the event loop
+
+        Returns:
+            int: iteration step, -1 when the simulation is finished
+        """
+        return await self.call(self.simulator.run_step)
+
+    async def steps(self):
+        """Iterates over simulation steps. A step is computed only when the consumer requests it, a slow consumer holds back the simulator.
+
+        Returns:
+            AsyncIterator[int]: iteration steps
+        """
+        while self.simulator.do_next:
+            step = await self.run_step()
+            if step < 0:
+                break
+            yield step
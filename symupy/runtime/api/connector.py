@@ -30,11 +30,13 @@ from ctypes import (
     cdll,
     c_int,
     byref,
-    c_double,
-    c_char_p,
 )
+import sys
+import queue
+import threading
 import click
 import platform
+import numpy as np
 
 import typing
 from typing import Union
@@ -50,17 +52,23 @@ from symupy.utils.exceptions import (
     SymupyVehicleCreationError,
     SymupyDriveVehicleError,
     SymupyWarning,
+    SymupyError,
 )
 
 #
 from symupy.runtime.api.scenario import Simulation
+from symupy.runtime.api.prototypes import SymuFlowLibrary
+from symupy.runtime.api.mfd import MFDSampler, parse_vehicle_ids
 
 from symupy.utils.parser import SimulatorRequest
+from symupy.parser.xmlparser import SNAPSHOT_DTYPE
 from symupy.utils.configurator import Configurator
+from symupy.utils.buffer import ResponseBuffer
 from symupy.runtime.logic import RuntimeDevice
 from symupy.tsc.vehicles import Vehicle, VehicleList
 
 from symupy.utils.tools import timer_func, printer_time
+from symupy.utils.cache import StepCache, step_cached
 import symupy.utils.constants as CT
 
 # ============================================================================
@@ -72,6 +80,17 @@ import symupy.utils.constants as CT
 
 TupleFloat = Union[float, tuple]
 
+# Vehicle property → getter exposed by the library (one vehid per call)
+VEHICLE_GETTERS = {
+    "abscissa": "SymGetVehicleAbscissa",
+    "acceleration": "SymGetVehicleAcc",
+    "distance": "SymGetVehicleRelativePositionOnLink",
+    "lane": "SymGetVehicleLane",
+    "link": "SymGetVehicleLink",
+    "ordinate": "SymGetVehicleOrdinate",
+    "speed": "SymGetVehicleSpeed",
+}
+
 
 class Simulator(Configurator, RuntimeDevice):
     """
@@ -118,9 +137,15 @@ class Simulator(Configurator, RuntimeDevice):
     """
 
     def __init__(self, **kwargs) -> None:
+        step_cache = kwargs.pop("step_cache", False)
         Configurator.__init__(self, **kwargs)
         RuntimeDevice.__init__(self)
         self._net = []
+        self._demand = {}
+        self._drive_orders = []
+        self.drive_status = {}
+        self._step_cache = StepCache() if step_cache else None
+        self._pipelined = False
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.library_path})"
@@ -130,12 +155,12 @@ class Simulator(Configurator, RuntimeDevice):
     # =========================================================================
 
     def load_symuvia(self):
-        """Load SymuFlow shared library"""
+        """Load SymuFlow shared library, entry points are typed once here (see :py:mod:`~symupy.runtime.api.prototypes`)"""
         try:
             lib_symuvia = cdll.LoadLibrary(self.library_path)
         except OSError:
             raise SymupyLoadLibraryError("Library not found", self.library_path)
-        self.__library = lib_symuvia
+        self.__library = SymuFlowLibrary(lib_symuvia)
 
     def load_network(self) -> int:
         """Load SymuFlow Simulation File"""
@@ -149,6 +174,7 @@ class Simulator(Configurator, RuntimeDevice):
     def register_simulation(self, scenario_path: str):
         """Register simulation file within the simulator"""
         self._sim = Simulation(scenario_path)
+        self.__dict__.pop("_mfd", None)
 
     # def register_network(self, network: NetworkType):
     #     # TODO: Impleement this connection. This is for V2V
@@ -183,6 +209,7 @@ class Simulator(Configurator, RuntimeDevice):
 
     def request_answer(self):
         """Request simulator answer and maps the data locally"""
+        self.invalidate_cache()
         if self.step_launch_mode == "lite":
             self._bContinue = self.__library.SymRunNextStepLiteEx(
                 self.write_xml, byref(self._b_end)
@@ -191,9 +218,24 @@ class Simulator(Configurator, RuntimeDevice):
         self._bContinue = self.__library.SymRunNextStepEx(
             self.buffer_string, self.write_xml, byref(self._b_end)
         )
-        self.request.query = self.buffer_string.value
+        if not self.response.check():
+            # Truncated answer: the answer of this step is lost and the
+            # buffer is enlarged for the next one. The query is cleared since
+            # the previous one reads the overwritten buffer, vehicles keep
+            # their last known state
+            self.request.query = b""
+            return
+        # Parsed in place, no copy of the buffer
+        self.request.query = self.buffer_string
         self.vehicles.update_list()
 
+    def invalidate_cache(self) -> None:
+        """Clears getter results cached during the current step, see :py:attr:`step_cache`, and the current MFD sample"""
+        if self._step_cache is not None:
+            self._step_cache.clear()
+        if "_mfd" in self.__dict__:
+            self._mfd.invalidate()
+
     @printer_time
     def run_step(self) -> int:
         """Run simulation step by step
@@ -203,13 +245,103 @@ class Simulator(Configurator, RuntimeDevice):
 
         """
         try:
-            self.request_answer()
+            if self._drive_orders:
+                # Drive orders and simulator answer in a single round trip
+                self._flush_drive_orders()
+            else:
+                self.request_answer()
             self._c_iter = next(self._n_iter)
+            if self._demand:
+                self._inject_demand_step()
             return self._c_iter
         except StopIteration:
             self._bContinue = False
             return -1
 
+    def run_pipelined(self, depth: int = CT.PIPELINE_DEPTH):
+        """Runs the simulation overlapping the simulator computation and the parsing of its answers. Meant for observation only runs, commands to the simulator are rejected meanwhile.
+
+        A worker thread runs the simulator steps (the library releases the GIL) into a pool of buffers, up to ``depth`` steps ahead. Answers are parsed into :py:attr:`request` and :py:attr:`vehicles` in the calling thread, while the simulator computes the next steps. The simulator is always run in ``full`` mode.
+
+        :param depth: maximum amount of steps computed ahead, defaults to ``PIPELINE_DEPTH``
+        :type depth: int
+
+        :return: iterator over simulation steps
+        :rtype: Iterator[int]
+
+        Example:
+            Collect data from all steps ::
+
+            >>> with simulator as s:
+            >>>     for step in s.run_pipelined():
+            >>>         s.request.snapshot()
+        """
+        free = queue.Queue()
+        ready = queue.Queue(maxsize=depth)
+        for _ in range(depth + 2):
+            free.put(ResponseBuffer(self.response.size, self.response.max_size))
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._pipeline_worker, args=(free, ready, stop), daemon=True
+        )
+
+        self._pipelined = True
+        worker.start()
+        parsed = None
+        try:
+            while self._bContinue:
+                item = ready.get()
+                if item is None:
+                    self._bContinue = False
+                    break
+                response, self._bContinue = item
+                self.invalidate_cache()
+                if response.check():
+                    self.request.query = response.buffer
+                    self.vehicles.update_list()
+                    # The query reads its buffer lazily, the previous one is
+                    # handed back once it is no longer referenced
+                    response, parsed = parsed, response
+                if response is not None:
+                    free.put(response)
+                try:
+                    self._c_iter = next(self._n_iter)
+                except StopIteration:
+                    self._bContinue = False
+                    break
+                yield self._c_iter
+        finally:
+            stop.set()
+            free.put(None)
+            while worker.is_alive():
+                # Unblock the worker if it waits for room in the queue
+                try:
+                    ready.get(timeout=0.01)
+                except queue.Empty:
+                    pass
+            worker.join()
+            self._pipelined = False
+
+    def _pipeline_worker(self, free: queue.Queue, ready: queue.Queue, stop) -> None:
+        """Runs simulator steps into free buffers and hands them to the parser"""
+        run = self.__library.SymRunNextStepEx
+        b_end = c_int()
+        try:
+            while not stop.is_set():
+                response = free.get()
+                if response is None:
+                    break
+                more = bool(run(response.buffer, self.write_xml, byref(b_end)))
+                ready.put((response, more))
+                if not more:
+                    break
+        finally:
+            ready.put(None)
+
+    def _check_commands(self) -> None:
+        if self._pipelined:
+            raise SymupyError("Commands are not allowed while running pipelined", "")
+
     def stop_step(self):
         """Stop current current step of running simulation"""
         self._bContinue = False
@@ -257,12 +389,10 @@ class Simulator(Configurator, RuntimeDevice):
 
 
         """
-        endpoints = self._sim.get_network_endpoints()
-        veh_data = self._sim.get_vehicletype_information()
-        vehid = tuple(v["id"] for v in veh_data)
+        endpoints = self._sim.endpoints
 
         # Consistency checks
-        if vehtype not in vehid:
+        if vehtype not in self._sim.vehicle_types:
             raise SymupyVehicleCreationError(
                 "Unexisting Vehicle Class in File: ", self.scenarioFilename()
             )
@@ -273,12 +403,14 @@ class Simulator(Configurator, RuntimeDevice):
             )
 
         # Vehicle creation
+        self._check_commands()
+        self.invalidate_cache()
         vehid = self.__library.SymCreateVehicleEx(
             vehtype.encode("UTF8"),
             origin.encode("UTF8"),
             destination.encode("UTF8"),
-            c_int(lane),
-            c_double(self.simulationstep),
+            lane,
+            self.simulationstep,
         )
         return vehid
 
@@ -315,12 +447,10 @@ class Simulator(Configurator, RuntimeDevice):
         if origin == destination:
             return -1
 
-        endpoints = self._sim.get_network_endpoints()
-        veh_data = self._sim.get_vehicletype_information()
-        vehid = tuple(v["id"] for v in veh_data)
+        endpoints = self._sim.endpoints
 
         # Consistency checks
-        if vehtype not in vehid:
+        if vehtype not in self._sim.vehicle_types:
             raise SymupyVehicleCreationError(
                 "Unexisting Vehicle Class in File: ", self.scenarioFilename()
             )
@@ -331,16 +461,125 @@ class Simulator(Configurator, RuntimeDevice):
             )
 
         # Vehicle creation
+        self._check_commands()
+        self.invalidate_cache()
         vehid = self.__library.SymCreateVehicleWithRouteEx(
             origin.encode("UTF8"),
             destination.encode("UTF8"),
             vehtype.encode("UTF8"),
-            c_int(lane),
-            c_double(creation_time - self.simulationstep),
+            lane,
+            creation_time - self.simulationstep,
             route.encode("UTF8"),
         )
         return vehid
 
+    def inject_demand(self, schedule) -> int:
+        """Schedules the creation of a batch of vehicles. Vehicles are created in time order as the simulation advances via :py:meth:`run_step`.
+
+        The whole batch is validated at once against the scenario and strings are encoded once per distinct value.
+
+        :param schedule: columns ``type``, ``origin``, ``destination``, ``time`` and optionally ``lane`` (defaults to 1) and ``route`` (defaults to ""). A ``DataFrame`` or a dictionary of arrays
+        :type schedule: DataFrame, dict
+
+        :raises SymupyVehicleCreationError: if a vehicle type or an endpoint is not in the scenario
+
+        :return: amount of vehicles scheduled, trips with the same origin and destination are discarded
+        :rtype: int
+
+        Example:
+            Schedule two vehicles ::
+
+            >>> simulator.inject_demand({
+            ...     "type": ["VL", "VL"],
+            ...     "origin": ["Ext_In", "Ext_In"],
+            ...     "destination": ["Ext_Out", "Ext_Out"],
+            ...     "time": [1.0, 2.5],
+            ... })
+        """
+        self._check_commands()
+        size = len(schedule["time"])
+        batch = {
+            "type": np.asarray(schedule["type"], dtype=object),
+            "origin": np.asarray(schedule["origin"], dtype=object),
+            "destination": np.asarray(schedule["destination"], dtype=object),
+            "time": np.asarray(schedule["time"], dtype=float),
+            "lane": np.asarray(schedule["lane"], dtype=int)
+            if "lane" in schedule
+            else np.ones(size, dtype=int),
+            "route": np.asarray(schedule["route"], dtype=object)
+            if "route" in schedule
+            else np.full(size, "", dtype=object),
+        }
+
+        # Consistency checks
+        vehtypes = list(self._sim.vehicle_types)
+        unknown = set(batch["type"][~np.isin(batch["type"], vehtypes)])
+        if unknown:
+            raise SymupyVehicleCreationError(
+                f"Unexisting Vehicle Class {sorted(unknown)} in File: ",
+                self.scenarioFilename(),
+            )
+        endpoints = list(self._sim.endpoints)
+        unknown = set(batch["origin"][~np.isin(batch["origin"], endpoints)])
+        unknown |= set(batch["destination"][~np.isin(batch["destination"], endpoints)])
+        if unknown:
+            raise SymupyVehicleCreationError(
+                f"Unexisting Network Endpoint {sorted(unknown)} File: ",
+                self.scenarioFilename(),
+            )
+
+        keep = batch["origin"] != batch["destination"]
+        for key in ("type", "origin", "destination", "route"):
+            values, inverse = np.unique(batch[key].astype(str), return_inverse=True)
+            encoded = np.array([v.encode("UTF8") for v in values], dtype=object)
+            batch[key] = encoded[inverse.reshape(-1)]
+
+        # Merge with pending vehicles, in time order
+        pending = self._demand
+        for key, values in batch.items():
+            values = values[keep]
+            batch[key] = np.concatenate((pending[key], values)) if pending else values
+        if not len(batch["time"]):
+            return 0
+        order = np.argsort(batch["time"], kind="stable")
+        self._demand = {key: values[order] for key, values in batch.items()}
+        return int(keep.sum())
+
+    def _inject_demand_step(self) -> tuple:
+        """Creates scheduled vehicles due before the end of the current step
+
+        :return: ids of the vehicles created
+        :rtype: tuple
+        """
+        demand = self._demand
+        if not demand:
+            return ()
+        self._check_commands()
+        time_step = self.simulation.time_step
+        now = self.simulationstep * time_step
+        due = int(np.searchsorted(demand["time"], now + time_step, side="left"))
+        if not due:
+            return ()
+
+        self.invalidate_cache()
+
+        create = self.__library.SymCreateVehicleWithRouteEx
+        vehids = tuple(
+            create(origin, destination, vehtype, lane, max(time - now, 0.0), route)
+            for vehtype, origin, destination, lane, time, route in zip(
+                demand["type"][:due],
+                demand["origin"][:due],
+                demand["destination"][:due],
+                demand["lane"][:due].tolist(),
+                demand["time"][:due].tolist(),
+                demand["route"][:due],
+            )
+        )
+        self._demand = {key: values[due:] for key, values in demand.items()}
+        if not len(self._demand["time"]):
+            self._demand = {}
+        return vehids
+
     def drive_vehicle(
         self, vehid: int, new_pos: float, destination: str = None, lane: str = 1
     ):
@@ -371,7 +610,8 @@ class Simulator(Configurator, RuntimeDevice):
             >>>             drive_status = s.drive_vehicle(0, 1.0)
             >>>             force_driven = s.request.is_vehicle_driven("0")
         """
-        links = self._sim.get_network_links()
+        self._check_commands()
+        links = self._sim.links
 
         if not destination:
             destination = self.request.filter_vehicle_property("link", vehid)[0]
@@ -383,15 +623,85 @@ class Simulator(Configurator, RuntimeDevice):
 
         # TODO: Validate that position do not overpass the max pos
         dr_state = self.__library.SymDriveVehicleEx(
-            c_int(vehid),
-            destination.encode("UTF8"),
-            c_int(lane),
-            c_double(new_pos),
-            1,
+            vehid, destination.encode("UTF8"), lane, new_pos, True
         )
         self.request_answer()
         return dr_state
 
+    def drive_vehicles(self, vehids, positions, links=None, lanes=None) -> int:
+        """Queues drive orders for a set of vehicles. Orders are sent together during the ``Push`` state, either on the next :py:meth:`run_step` or on an explicit call to :py:meth:`push`, followed by a single simulator answer.
+
+        :param vehids: vehicle ids
+        :type vehids: iterable
+
+        :param positions: positions to place the vehicles
+        :type positions: iterable
+
+        :param links: links of destination, defaults to the current link of each vehicle
+        :type links: iterable, optional
+
+        :param lanes: lanes of destination, defaults to 1
+        :type lanes: iterable, optional
+
+        :raises SymupyDriveVehicleError: if a link is not in the network or sequences differ in length
+
+        :return: amount of drive orders queued
+        :rtype: int
+
+        Example:
+            Drive a platoon of vehicles ::
+
+            >>> with symuflow as s:
+            >>>     while s.do_next:
+            >>>         s.drive_vehicles((0, 1, 2), (30.0, 20.0, 10.0))
+            >>>         s.run_step()
+            >>>         s.drive_status # Drive state per vehicle
+
+        Vehicles not in the network are reported in ``drive_status`` with ``DRIVE_VEHICLE_ABSENT`` when their link is not given.
+        """
+        self._check_commands()
+        vehids = tuple(vehids)
+        positions = tuple(positions)
+        if links is None:
+            index = self.request.datatraj.index
+            column = self.request.get_vehicles_column("link")
+            links = tuple(
+                column[index[vehid]] if vehid in index else None for vehid in vehids
+            )
+        links = tuple(links)
+        lanes = (1,) * len(vehids) if lanes is None else tuple(lanes)
+
+        if not len(vehids) == len(positions) == len(links) == len(lanes):
+            raise SymupyDriveVehicleError(
+                "Drive orders differ in length (vehids, positions, links, lanes): "
+                f"{(len(vehids), len(positions), len(links), len(lanes))} File: ",
+                self.scenarioFilename(),
+            )
+
+        unknown = set(links) - self._sim.links - {None}
+        if unknown:
+            raise SymupyDriveVehicleError(
+                f"Unexisting Network Link {sorted(unknown)} File: ",
+                self.scenarioFilename(),
+            )
+
+        encoded = {link: link.encode("UTF8") for link in set(links) - {None}}
+        encoded[None] = None
+        self._drive_orders.extend(
+            zip(vehids, (encoded[link] for link in links), lanes, positions)
+        )
+        return len(vehids)
+
+    def push(self) -> dict:
+        """Sends all queued drive orders to the simulator and requests a single answer
+
+        :return: drive state per vehicle id, see :py:meth:`drive_vehicle`
+        :rtype: dict
+        """
+        self._check_commands()
+        self._flush_drive_orders()
+        return self.drive_status
+
     def drive_vehicle_new_route(self, vehid: int, new_route: str) -> int:
         """Modifies the current path of a vehicle by stablishing the new route
 
@@ -416,6 +726,8 @@ class Simulator(Configurator, RuntimeDevice):
                 ===========  =================================
 
         """
+        self._check_commands()
+        self.invalidate_cache()
         return self.__library.SymAlterRouteEx(vehid, new_route.encode("UTF8"))
 
     def drive_vehicle_with_control(
@@ -427,25 +739,46 @@ class Simulator(Configurator, RuntimeDevice):
         return self.drive_vehicle(vehid, new_pos, destination, lane)
 
     def init_symbol_states(self):
-        """Initializes symbols before call of a runtime for access in memory"""
+        """Initializes symbols before call of a runtime for access in memory.
 
+        Prototypes of the library entry points are applied once in :py:meth:`load_symuvia`, nothing remains to be done here. Kept for compatibility.
+        """
 
-        # Total network information
-        self.__library.SymGetListofVehicleIdsEx.restype = c_char_p
-        self.__library.SymGetTotalTravelTimeEx.restype = c_double
-        self.__library.SymGetTotalTravelDistanceEx.restype = c_double
+    def get_vehicles_state(
+        self, vehids, fields: tuple = tuple(VEHICLE_GETTERS), out: np.ndarray = None
+    ) -> np.ndarray:
+        """Pulls the state of a set of vehicles through the library getters. This is meant for the ``lite`` launch mode where no XML is produced.
 
-        # Vehicle information
-        self.__library.SymGetVehicleAcc.restype = c_double
-        self.__library.SymGetVehicleSpeed.restype = c_double
-        self.__library.SymGetVehicleLink.restype = c_char_p
-        self.__library.SymGetVehicleAbscissa.restype = c_double
-        self.__library.SymGetVehicleOrdinate.restype = c_double
-        self.__library.SymGetVehicleLane.restype = c_int
-        self.__library.SymGetVehicleRelativePositionOnLink.restype = c_double
-        self.__library.SymGetVehicleTravelDistance.restype = c_double
-        self.__library.SymGetVehicleTravelTime.restype = c_double
+        The library has no vectorized getter: each field is filled in a single Python loop over vehicles calling its getter once per vehicle. Plain integers are passed, the conversion is done by the ``argtypes`` declared in :py:data:`symupy.runtime.api.prototypes.PROTOTYPES`. The result has the same layout as :py:meth:`SimulatorRequest.snapshot`, fields without a getter (``elevation``, ``vehtype``, ``driven``) keep their default value.
 
+        Args:
+            vehids (iterable): vehicle identifiers
+            fields (tuple): vehicle properties to pull, defaults to all with a getter
+            out (ndarray): preallocated snapshot array to fill, at least as long as ``vehids``
+
+        Returns:
+            ndarray: structured array, one row per vehicle
+        """
+        self._check_commands()
+        vehids = tuple(vehids)
+        if out is None:
+            out = np.zeros(len(vehids), dtype=SNAPSHOT_DTYPE)
+        out = out[: len(vehids)]
+        out["vehid"] = vehids
+
+        for field in fields:
+            getter = getattr(self.__library, VEHICLE_GETTERS[field])
+            column = out[field]
+            if field == "link":
+                for i, vehid in enumerate(vehids):
+                    link = getter(vehid)
+                    column[i] = "" if link is None else sys.intern(link.decode("UTF8"))
+                continue
+            for i, vehid in enumerate(vehids):
+                column[i] = getter(vehid)
+        return out
+
+    @step_cached
     def get_vehicle_acceleration(self, vehid: int) -> float:
         """Extract information related to the vehicle's acceleration
 
@@ -455,8 +788,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle acceleration [m/s²]
         """
-        return self.__library.SymGetVehicleAcc(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleAcc(vehid)
 
+    @step_cached
     def get_vehicle_speed(self, vehid: int) -> float:
         """Extract information related to the vehicle's speed
 
@@ -466,8 +801,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle speed [m/s]
         """
-        return self.__library.SymGetVehicleSpeed(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleSpeed(vehid)
 
+    @step_cached
     def get_vehicle_link(self, vehid: int) -> str:
         """Extract information related to the vehicle's link
 
@@ -477,9 +814,11 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             str: vehicle link [string]
         """
-        response = self.__library.SymGetVehicleLink(c_int(vehid))
+        self._check_commands()
+        response = self.__library.SymGetVehicleLink(vehid)
         return "" if response is None else response.decode("UTF8")
 
+    @step_cached
     def get_vehicle_abscissa(self, vehid: int) -> float:
         """Extract information related to the vehicle's abscissa
 
@@ -489,8 +828,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle abcissa (x) position [m]
         """
-        return float(self.__library.SymGetVehicleAbscissa(c_int(vehid)))
+        self._check_commands()
+        return float(self.__library.SymGetVehicleAbscissa(vehid))
 
+    @step_cached
     def get_vehicle_ordinate(self, vehid: int) -> float:
         """Extract information related to the vehicle's ordinate
 
@@ -500,8 +841,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle ordinate (y) position [m]
         """
-        return self.__library.SymGetVehicleOrdinate(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleOrdinate(vehid)
 
+    @step_cached
     def get_vehicle_lane(self, vehid: int) -> int:
         """Extract information related to the vehicle's lane
 
@@ -511,8 +854,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             int: vehicle lane position (0) right most lane [int]
         """
-        return self.__library.SymGetVehicleLane(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleLane(vehid)
 
+    @step_cached
     def get_vehicle_distance(self, vehid: int) -> float:
         """Extract information related to the vehicle's distance
 
@@ -522,8 +867,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle distance in link position [m]
         """
-        return self.__library.SymGetVehicleRelativePositionOnLink(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleRelativePositionOnLink(vehid)
 
+    @step_cached
     def get_vehicle_total_travel_distance(self, vehid: int) -> float:
         """Extract information related to the vehicle's total
 
@@ -533,8 +880,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle total traveled distance [m]
         """
-        return self.__library.SymGetVehicleTravelDistance(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleTravelDistance(vehid)
 
+    @step_cached
     def get_vehicle_total_travel_time(self, vehid: int) -> float:
         """Extract information related to the vehicle's total
 
@@ -544,8 +893,10 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             float: vehicle total traveled time [s]
         """
-        return self.__library.SymGetVehicleTravelTime(c_int(vehid))
+        self._check_commands()
+        return self.__library.SymGetVehicleTravelTime(vehid)
 
+    @step_cached
     def get_total_travel_time(self, sensors_mfd: list = []) -> TupleFloat:
         """Extracts the total travel time of vehicles in a specific MFD region
 
@@ -556,6 +907,7 @@ class Simulator(Configurator, RuntimeDevice):
             TupleFloat: Associated total travel time
         """
         # TODO: Improvement → Better organizadtion
+        self._check_commands()
         if isinstance(sensors_mfd, str):
             return self.__library.SymGetTotalTravelTimeEx(
                 sensors_mfd.encode("UTF8")
@@ -569,6 +921,7 @@ class Simulator(Configurator, RuntimeDevice):
             for sensor in sensors_mfd
         )
 
+    @step_cached
     def get_total_travel_distance(self, sensors_mfd: list = []) -> TupleFloat:
         """Extracts total travel distance of vehicles in a specific MFD region
 
@@ -578,6 +931,7 @@ class Simulator(Configurator, RuntimeDevice):
         Returns:
             TupleFloat: Associated total travel distance
         """
+        self._check_commands()
         if isinstance(sensors_mfd, str):
             return self.__library.SymGetTotalTravelDistanceEx(
                 sensors_mfd.encode("UTF8")
@@ -591,6 +945,7 @@ class Simulator(Configurator, RuntimeDevice):
             for sensor in sensors_mfd
         )
 
+    @step_cached
     def get_mfd_speed(self, sensors_mfd: list = []) -> TupleFloat:
         """Estimates the spatial speed of vehicles in a specific MFD region
 
@@ -618,26 +973,26 @@ class Simulator(Configurator, RuntimeDevice):
                 spd.append(10)  # minimum speed?
         return tuple(spd)
 
+    @step_cached
     def get_vehicle_inside_area(self, sensors_mfd: list = []):
         """Obtains the set of vehicles inside a list
 
         Args:
-            sensors_mfd (list, optional): Sensor name. Defaults to [].
+            sensors_mfd (list, optional): Sensor name or list of sensor names. Defaults to [] (all sensors).
 
         Returns:
-            [type]: [description]
+            tuple: vehicle ids inside the sensor, or a tuple of them per sensor when a list is given
         """
+        self._check_commands()
         if isinstance(sensors_mfd, str):
-            return tuple(
-                (
-                    self.__library.SymGetListofVehicleIdsEx(
-                        sensors_mfd.encode("UTF8")
-                    )
-                )
-                .decode("UTF8")
-                .split(" ")[:-1]
+            return parse_vehicle_ids(
+                self.__library.SymGetListofVehicleIdsEx(sensors_mfd.encode("UTF8"))
             )
-        return tuple()
+
+        if not sensors_mfd:
+            sensors_mfd = self.simulation.get_mfd_sensor_names()
+
+        return tuple(self.get_vehicle_inside_area(sensor) for sensor in sensors_mfd)
 
     def add_control_probability_zone_mfd(
         self, access_probability: dict, minimum_distance: dict
@@ -651,6 +1006,7 @@ class Simulator(Configurator, RuntimeDevice):
         :param minimum_distance: Key (zone name) Value (distance before entering the zone to activate policy)
         :type minimum_distance: dict
         """
+        self._check_commands()
         self.dctidzone = {}
 
         for tp_zn_pb, tp_zn_md in zip(
@@ -661,14 +1017,11 @@ class Simulator(Configurator, RuntimeDevice):
             links = self.simulation.get_links_in_mfd_sensor(sensor)
             links_str = " ".join(links)
             self.dctidzone[sensor] = self.__library.SymAddControlZoneEx(
-                -1,
-                c_double(accrate),
-                c_double(min_dst),
-                c_double(1),
-                f"{links_str}".encode("UTF8"),
+                -1, accrate, min_dst, 1.0, f"{links_str}".encode("UTF8"),
             )
         # Apply set control
         self.__library.SymApplyControlZonesEx(-1)
+        self.invalidate_cache()
         return self.dctidzone
 
     def modify_control_probability_zone_mfd(self, access_probability: dict):
@@ -679,12 +1032,14 @@ class Simulator(Configurator, RuntimeDevice):
         :type access_probability: dict
         """
 
+        self._check_commands()
         for sensor, probablity in access_probability.items():
             self.__library.SymModifyControlZoneEx(
-                -1, self.dctidzone[sensor], c_double(probablity)
+                -1, self.dctidzone[sensor], probablity
             )
         # Apply set control
         self.__library.SymApplyControlZonesEx(-1)
+        self.invalidate_cache()
         return self.dctidzone
 
     def __enter__(self):
@@ -738,7 +1093,6 @@ class Simulator(Configurator, RuntimeDevice):
         """
         self.load_symuvia()
         self.load_network()
-        self.__library.SymGetListofVehicleIdsEx.restype = c_char_p
         self.next_state(True)
 
     def __performInitialize(self) -> None:
@@ -775,6 +1129,26 @@ class Simulator(Configurator, RuntimeDevice):
         """
         self.next_state(self.do_next)
 
+    def __performPush(self) -> None:
+        """
+        Perform simulator Push, queued drive orders are sent in one go
+        """
+        if self._drive_orders:
+            self._flush_drive_orders()
+        self.next_state(self.do_next)
+
+    def _flush_drive_orders(self) -> None:
+        """Sends queued drive orders and requests a single answer, the state is not modified"""
+        drive = self.__library.SymDriveVehicleEx
+        self.drive_status = {
+            vehid: drive(vehid, link, lane, position, True)
+            if link is not None
+            else CT.DRIVE_VEHICLE_ABSENT
+            for vehid, link, lane, position in self._drive_orders
+        }
+        self._drive_orders = []
+        self.request_answer()
+
     def _set_manual_initialization(self) -> None:
         """
         This method is a way to set manual initialization of the simulator
@@ -869,6 +1243,30 @@ class Simulator(Configurator, RuntimeDevice):
     def library(self):
         return self.__library
 
+    @property
+    def step_cache(self) -> StepCache:
+        """
+        Cache of getter results within a simulation step, enabled with ``Simulator(step_cache=True)``. Hit and miss counters are available as ``step_cache.hits`` and ``step_cache.misses``
+
+        :return: step cache or None when disabled
+        :rtype: StepCache
+        """
+        return self._step_cache
+
+    @property
+    def mfd(self) -> MFDSampler:
+        """
+        Sampler of MFD indicators for all sensors in the scenario, created on first access
+
+        :return: MFD sampler
+        :rtype: MFDSampler
+        """
+        try:
+            return self._mfd
+        except AttributeError:
+            self._mfd = MFDSampler(self)
+            return self._mfd
+
     # =========================================================================
     # CONSTRUCTORS
     # =========================================================================
@@ -0,0 +1,152 @@
+"""
+    This module contains a ``MFDSampler`` object in charge of sampling Macroscopic Fundamental Diagram (MFD) indicators for all the sensors of a scenario.
+
+    Sensor names are encoded once, indicators are fetched once per simulator answer for all sensors and stored as a time series.
+
+    Example:
+        To sample all MFD sensors at each step ::
+
+            >>> with simulator as s:
+            ...     while s.do_next:
+            ...         s.run_step()
+            ...         sample = s.mfd.sample()
+            ...         sample["speed"] # One value per sensor
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import numpy as np
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+# Speed reported when no travel time is accumulated in a sensor
+MFD_DEFAULT_SPEED = 10.0
+
+
+def parse_vehicle_ids(response: bytes) -> tuple:
+    """Splits the space separated list of vehicle ids returned by the simulator
+
+    Args:
+        response (bytes): simulator response e.g. ``b"0 1 4 "``
+
+    Returns:
+        tuple: vehicle ids as strings
+    """
+    return tuple(response.decode("UTF8").split(" ")[:-1]) if response else ()
+
+
+class MFDSampler:
+    """Samples MFD indicators of a set of sensors once per simulation step
+
+    ==================  ============================================
+    **Indicator**       **Description**
+    ------------------  --------------------------------------------
+    ``ttt``              Total travel time per sensor
+    ``ttd``              Total travel distance per sensor
+    ``speed``            Spatial speed ``ttd/ttt`` per sensor
+    ``accumulation``     Amount of vehicles inside per sensor
+    ``vehicles``         Vehicle ids inside per sensor (tuples)
+    ==================  ============================================
+
+    Args:
+        simulator (Simulator): simulator with a loaded library
+        sensors (tuple): sensor names, defaults to all MFD sensors in the scenario
+        vehicles (bool): also sample the vehicles inside each sensor, defaults to True
+
+    :return: MFD sampler
+    :rtype: MFDSampler
+    """
+
+    def __init__(self, simulator, sensors: tuple = (), vehicles: bool = True) -> None:
+        self._simulator = simulator
+        self.sensors = tuple(sensors) or simulator.simulation.get_mfd_sensor_names()
+        self._encoded = tuple(sensor.encode("UTF8") for sensor in self.sensors)
+        self._vehicles = vehicles
+        self._step = None
+        self._sample = {}
+        self._series = {"time": [], "ttt": [], "ttd": [], "speed": [], "accumulation": []}
+
+    def __len__(self) -> int:
+        return len(self._series["time"])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(sensors={len(self.sensors)}, samples={len(self)})"
+
+    def sample(self) -> dict:
+        """Indicators for all sensors at the current simulation step. The simulator is queried only once per answer: a new answer within the same step (e.g. after drive orders are pushed) replaces the sample of the step.
+
+        Returns:
+            dict: indicator name → array with one value per sensor
+        """
+        step = self._simulator.simulationstep
+        if step == self._step and self._sample:
+            return self._sample
+
+        # Rejected while the simulator is run pipelined
+        self._simulator._check_commands()
+        library = self._simulator.library
+        ttt = np.fromiter(
+            (library.SymGetTotalTravelTimeEx(s) for s in self._encoded),
+            dtype=float,
+            count=len(self._encoded),
+        )
+        ttd = np.fromiter(
+            (library.SymGetTotalTravelDistanceEx(s) for s in self._encoded),
+            dtype=float,
+            count=len(self._encoded),
+        )
+        speed = np.full_like(ttt, MFD_DEFAULT_SPEED)
+        np.divide(ttd, ttt, out=speed, where=ttt != 0)
+
+        sample = {"ttt": ttt, "ttd": ttd, "speed": speed}
+        if self._vehicles:
+            vehicles = tuple(
+                parse_vehicle_ids(library.SymGetListofVehicleIdsEx(s))
+                for s in self._encoded
+            )
+            sample["vehicles"] = vehicles
+            sample["accumulation"] = np.fromiter(
+                map(len, vehicles), dtype=int, count=len(vehicles)
+            )
+        else:
+            sample["accumulation"] = np.zeros(len(self._encoded), dtype=int)
+
+        if step == self._step:
+            for key in ("ttt", "ttd", "speed", "accumulation"):
+                self._series[key][-1] = sample[key]
+        else:
+            self._series["time"].append(step * self._simulator.simulation.time_step)
+            for key in ("ttt", "ttd", "speed", "accumulation"):
+                self._series[key].append(sample[key])
+
+        self._step = step
+        self._sample = sample
+        return sample
+
+    @property
+    def series(self) -> dict:
+        """Time series of the samples taken so far
+
+        Returns:
+            dict: ``time`` array of shape (samples,), indicators of shape (samples, sensors)
+        """
+        series = {"time": np.array(self._series["time"], dtype=float)}
+        for key in ("ttt", "ttd", "speed", "accumulation"):
+            values = self._series[key]
+            series[key] = np.vstack(values) if values else np.empty((0, len(self.sensors)))
+        return series
+
+    def invalidate(self) -> None:
+        """Drops the sample of the current step, the simulator is queried again on next call"""
+        self._sample = {}
+
+    def reset(self) -> None:
+        """Discards samples taken so far"""
+        self._step = None
+        self._sample = {}
+        for values in self._series.values():
+            values.clear()
@@ -0,0 +1,99 @@
+"""
+    This module declares the prototypes of the entry points of the SymuFlow library used by the ``Simulator``.
+
+    Prototypes (return and argument types) are applied once when the library is loaded, so that calls can pass plain Python values and wrong argument types are rejected by ``ctypes`` before reaching the simulator.
+
+    Example:
+        To use the typed library ::
+
+            >>> from ctypes import cdll
+            >>> library = SymuFlowLibrary(cdll.LoadLibrary(path_symuvia))
+            >>> library.SymGetVehicleSpeed(0)
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+from ctypes import POINTER, c_bool, c_char_p, c_double, c_int
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.utils.exceptions import SymupyWarning
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+# Entry point → (restype, argtypes)
+PROTOTYPES = {
+    # Loading & runtime
+    "SymLoadNetworkEx": (c_int, [c_char_p]),
+    "SymUnloadCurrentNetworkEx": (c_int, []),
+    "SymRunEx": (c_int, [c_char_p]),
+    "SymRunNextStepEx": (c_int, [c_char_p, c_bool, POINTER(c_int)]),
+    "SymRunNextStepLiteEx": (c_int, [c_bool, POINTER(c_int)]),
+    # Vehicle creation & drive
+    "SymCreateVehicleEx": (c_int, [c_char_p, c_char_p, c_char_p, c_int, c_double]),
+    "SymCreateVehicleWithRouteEx": (
+        c_int,
+        [c_char_p, c_char_p, c_char_p, c_int, c_double, c_char_p],
+    ),
+    "SymDriveVehicleEx": (c_int, [c_int, c_char_p, c_int, c_double, c_bool]),
+    "SymAlterRouteEx": (c_int, [c_int, c_char_p]),
+    # Vehicle information
+    "SymGetVehicleAcc": (c_double, [c_int]),
+    "SymGetVehicleSpeed": (c_double, [c_int]),
+    "SymGetVehicleLink": (c_char_p, [c_int]),
+    "SymGetVehicleAbscissa": (c_double, [c_int]),
+    "SymGetVehicleOrdinate": (c_double, [c_int]),
+    "SymGetVehicleLane": (c_int, [c_int]),
+    "SymGetVehicleRelativePositionOnLink": (c_double, [c_int]),
+    "SymGetVehicleTravelDistance": (c_double, [c_int]),
+    "SymGetVehicleTravelTime": (c_double, [c_int]),
+    # Total network information
+    "SymGetListofVehicleIdsEx": (c_char_p, [c_char_p]),
+    "SymGetTotalTravelTimeEx": (c_double, [c_char_p]),
+    "SymGetTotalTravelDistanceEx": (c_double, [c_char_p]),
+    # Control zones
+    "SymAddControlZoneEx": (c_int, [c_int, c_double, c_double, c_double, c_char_p]),
+    "SymModifyControlZoneEx": (c_int, [c_int, c_int, c_double]),
+    "SymApplyControlZonesEx": (c_int, [c_int]),
+}
+
+
+class SymuFlowLibrary:
+    """Typed entry points of the SymuFlow library. Each entry point in ``PROTOTYPES`` is resolved once and kept as an attribute.
+
+    Args:
+        library (CDLL): library loaded via ``ctypes``
+
+    :return: Typed library
+    :rtype: SymuFlowLibrary
+    """
+
+    def __init__(self, library) -> None:
+        self._library = library
+        missing = []
+        for name, (restype, argtypes) in PROTOTYPES.items():
+            try:
+                function = getattr(library, name)
+            except AttributeError:
+                missing.append(name)
+                continue
+            function.restype = restype
+            function.argtypes = argtypes
+            setattr(self, name, function)
+        if missing:
+            SymupyWarning(f"Entry points not found in library: {', '.join(missing)}")
+
+    def __getattr__(self, name):
+        # Entry points without prototype are reached untyped
+        if name == "_library":
+            raise AttributeError(name)
+        return getattr(self._library, name)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._library})"
@@ -10,6 +10,11 @@
 # ============================================================================
 
 import os
+import shutil
+import tempfile
+import threading
+from copy import deepcopy
+from itertools import count, product
 from lxml import etree
 from datetime import datetime
 
@@ -17,7 +22,7 @@ from datetime import datetime
 # INTERNAL IMPORTS
 # ============================================================================
 
-from symupy.utils.exceptions import SymupyFileLoadError
+from symupy.utils.exceptions import SymupyFileLoadError, SymupyWarning
 from symupy.utils.constants import HOUR_FORMAT
 
 # ============================================================================
@@ -41,7 +46,7 @@ class Simulation(object):
         # TODO: Add validation with DTD
         tree = etree.parse(self._file_name)
         root = tree.getroot()
-        self._xml_tree = root
+        self.xmltree = root
 
     @property
     def xmltree(self):
@@ -50,6 +55,16 @@ class Simulation(object):
     @xmltree.setter
     def xmltree(self, rootxml):
         self._xml_tree = rootxml
+        # Metadata is computed again from the new tree on demand
+        self._cache = {}
+
+    def _cached(self, key: str, build):
+        """Returns a metadata value computed once per XML tree"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = build()
+            return value
 
     def get_simulation_parameters(self) -> tuple:
         """Get simulation parameters
@@ -57,6 +72,9 @@ class Simulation(object):
         :return: tuple with XML dictionary containing parameters
         :rtype: tuple
         """
+        return self._cached("simulation_parameters", self._build_simulation_parameters)
+
+    def _build_simulation_parameters(self) -> tuple:
         branch_tree = "SIMULATIONS"
         sim_params = self.xmltree.xpath(branch_tree)[0].getchildren()
         return tuple(par.attrib for par in sim_params)
@@ -67,9 +85,7 @@ class Simulation(object):
         :return: tuple of dictionaries containing vehicle parameters
         :rtype: tuple
         """
-        branch_tree = "TRAFICS/TRAFIC/TYPES_DE_VEHICULE"
-        vehicle_types = self.xmltree.xpath(branch_tree)[0].getchildren()
-        return tuple(v.attrib for v in vehicle_types)
+        return tuple(self.vehicle_types.values())
 
     def get_network_endpoints(self) -> tuple:
         """Get networks endpoint names
@@ -77,6 +93,9 @@ class Simulation(object):
         :return: tuple containing endpoint names
         :rtype: tuple
         """
+        return self._cached("endpoints", self._build_network_endpoints)
+
+    def _build_network_endpoints(self) -> tuple:
         branch_tree = "TRAFICS/TRAFIC/EXTREMITES"
         end_points = self.xmltree.xpath(branch_tree)[0].getchildren()
         return tuple(ep.attrib["id"] for ep in end_points)
@@ -87,6 +106,9 @@ class Simulation(object):
         :return: tuple containing link names
         :rtype: tuple
         """
+        return self._cached("links", self._build_network_links)
+
+    def _build_network_links(self) -> tuple:
         branch_tree = "TRAFICS/TRAFIC/TRONCONS"
         links = self.xmltree.xpath(branch_tree)[0].getchildren()
         return tuple(ep.attrib["id"] for ep in links)
@@ -115,9 +137,7 @@ class Simulation(object):
         :return: tuple of MFD sensors in the network
         :rtype: tuple
         """
-        branch_tree = "TRAFICS/TRAFIC/PARAMETRAGE_CAPTEURS/CAPTEURS"
-        sensors = self.xmltree.xpath(branch_tree)[0].getchildren()
-        return tuple(sn.attrib["id"] for sn in sensors)
+        return tuple(self.sensor_links)
 
     def get_links_in_mfd_sensor(self, sensor_id: str) -> tuple:
         """Get links associated to a particular MFD sensor for a specific simulation
@@ -127,14 +147,55 @@ class Simulation(object):
         :return: tuple of strings with links covered by the sensor
         :rtype: tuple
         """
+        return self.sensor_links.get(sensor_id, ())
+
+    # =========================================================================
+    # CACHED METADATA
+    # =========================================================================
+
+    @property
+    def endpoints(self) -> frozenset:
+        """Set of network endpoint names"""
+        return self._cached(
+            "endpoint_set", lambda: frozenset(self.get_network_endpoints())
+        )
+
+    @property
+    def links(self) -> frozenset:
+        """Set of network link names"""
+        return self._cached("link_set", lambda: frozenset(self.get_network_links()))
+
+    @property
+    def vehicle_types(self) -> dict:
+        """Vehicle type parameters by vehicle type id"""
+        return self._cached("vehicle_types", self._build_vehicle_types)
+
+    def _build_vehicle_types(self) -> dict:
+        branch_tree = "TRAFICS/TRAFIC/TYPES_DE_VEHICULE"
+        vehicle_types = self.xmltree.xpath(branch_tree)[0].getchildren()
+        return {v.attrib["id"]: v.attrib for v in vehicle_types}
+
+    @property
+    def sensors(self) -> frozenset:
+        """Set of MFD sensor names"""
+        return self._cached("sensor_set", lambda: frozenset(self.sensor_links))
+
+    @property
+    def sensor_links(self) -> dict:
+        """Links covered by each MFD sensor, by sensor id"""
+        return self._cached("sensor_links", self._build_sensor_links)
+
+    def _build_sensor_links(self) -> dict:
         branch_tree = "TRAFICS/TRAFIC/PARAMETRAGE_CAPTEURS/CAPTEURS"
-        sensors = self.xmltree.xpath(branch_tree)[0].getchildren()
-        try:
-            sensor_element = sensors[self.get_mfd_sensor_names().index(sensor_id)]
-            links = sensor_element.getchildren()[0].getchildren()
-            return tuple(lk.attrib["id"] for lk in links)
-        except:
-            return ()
+        sensor_links = {}
+        for sensor_element in self.xmltree.xpath(f"{branch_tree}/*"):
+            try:
+                links = sensor_element.getchildren()[0].getchildren()
+                links = tuple(lk.attrib["id"] for lk in links)
+            except (IndexError, KeyError):
+                links = ()
+            sensor_links[sensor_element.attrib["id"]] = links
+        return sensor_links
 
     def __contains__(self, value: tuple) -> bool:
         # REVIEW: Implement? in method? maybe useful
@@ -156,3 +217,160 @@ class Simulation(object):
     @property
     def time_step(self):
         return float(self.get_simulation_parameters()[0].get("pasdetemps"))
+
+
+SIMULATION_ATTRIBUTES = ("seed", "debut", "fin", "pasdetemps")
+
+
+class ScenarioTemplate(object):
+    """Base scenario parsed once from which variants are derived.
+
+    Variants only hold their overrides, a mapping of XPath (relative to the scenario root) to attributes. Values can be callables receiving the current value of the attribute. The file is never parsed again: overrides are applied to a copy of the base tree when a variant is written, the base tree is never modified.
+
+    The temporary directory created for variants is removed by :py:meth:`close`, or when leaving the template used as a context manager.
+
+    Args:
+        file_name (str): path towards the base scenario
+        directory (str): directory where variants are written, defaults to a temporary directory. Use the directory of the base scenario if it references other files through relative paths
+
+    Example:
+        Ten seed replications with a demand increased by 20% ::
+
+            >>> with ScenarioTemplate("bottleneck_001.xml") as template:
+            ...     variants = template.sweep(seed=range(10), demand_scale=[1.2])
+            ...     variants[0].path # Written on first access
+    """
+
+    def __init__(self, file_name: str, directory: str = None) -> None:
+        if not os.path.exists(file_name):
+            raise SymupyFileLoadError("File not found", file_name)
+        self._file_name = file_name
+        self._tree = etree.parse(file_name)
+        self._directory = directory
+        self._temporary = None
+        self._counter = count()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._file_name})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Removes the temporary directory of variants, if any. A directory given by the user is kept"""
+        with self._lock:
+            if self._temporary is not None:
+                shutil.rmtree(self._temporary, ignore_errors=True)
+                self._directory = self._temporary = None
+
+    def filename(self) -> str:
+        """Path towards the base scenario"""
+        return self._file_name
+
+    @property
+    def directory(self) -> str:
+        """Directory where variants are written"""
+        with self._lock:
+            if self._directory is None:
+                self._directory = self._temporary = tempfile.mkdtemp(prefix="symupy_")
+            return self._directory
+
+    def variant(self, overrides: dict = None, demand_scale: float = None, **simulation):
+        """Declares a variant of the base scenario, nothing is written until its ``path`` is requested
+
+        Args:
+            overrides (dict): XPath → attributes to set, values may be callables of the current value
+            demand_scale (float): factor applied to the demand level (``niveau``) of all ``DEMANDE`` elements defining one
+            simulation: attributes of the ``SIMULATION`` elements, one of ``seed``, ``debut``, ``fin``, ``pasdetemps``
+
+        Returns:
+            ScenarioVariant: variant of the scenario
+        """
+        unknown = set(simulation) - set(SIMULATION_ATTRIBUTES)
+        if unknown:
+            raise SymupyFileLoadError(
+                f"Unknown simulation attributes {sorted(unknown)}", self._file_name
+            )
+        operations = {xpath: dict(attrs) for xpath, attrs in (overrides or {}).items()}
+        if simulation:
+            operations.setdefault("SIMULATIONS/SIMULATION", {}).update(simulation)
+        if demand_scale is not None:
+
+            def scale(value):
+                return float(value) * demand_scale
+
+            operations.setdefault(".//DEMANDE[@niveau]", {})["niveau"] = scale
+        return ScenarioVariant(self, operations, next(self._counter))
+
+    def sweep(self, **parameters) -> tuple:
+        """Variants for all combinations of parameters, see :py:meth:`variant`
+
+        Returns:
+            tuple: variants in the order of the cartesian product of parameters
+        """
+        keys = tuple(parameters)
+        return tuple(
+            self.variant(**dict(zip(keys, values)))
+            for values in product(*parameters.values())
+        )
+
+    def write(self, operations: dict, path: str) -> str:
+        """Writes the base scenario with overrides applied
+
+        Args:
+            operations (dict): XPath → attributes to set
+            path (str): destination file
+
+        Returns:
+            str: destination file
+        """
+        tree = deepcopy(self._tree)
+        root = tree.getroot()
+        for xpath, attributes in operations.items():
+            elements = root.xpath(xpath)
+            if not elements:
+                SymupyWarning(f"No element matching {xpath} in {self._file_name}")
+            for element in elements:
+                for key, value in attributes.items():
+                    if callable(value):
+                        value = value(element.get(key))
+                    element.set(key, str(value))
+        tree.write(path, xml_declaration=True, encoding="UTF-8")
+        return path
+
+
+class ScenarioVariant(object):
+    """Variant of a ``ScenarioTemplate``, written to disk on demand
+
+    Args:
+        template (ScenarioTemplate): base scenario
+        overrides (dict): XPath → attributes to set
+        index (int): variant number within the template
+    """
+
+    def __init__(self, template: ScenarioTemplate, overrides: dict, index: int) -> None:
+        self.template = template
+        self.overrides = overrides
+        self.index = index
+        self._path = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.index}, {self.overrides})"
+
+    @property
+    def path(self) -> str:
+        """Path of the variant file, written on first access"""
+        if self._path is None:
+            stem = os.path.splitext(os.path.basename(self.template.filename()))[0]
+            path = os.path.join(self.template.directory, f"{stem}_{self.index:04d}.xml")
+            self._path = self.template.write(self.overrides, path)
+        return self._path
+
+    def simulation(self) -> Simulation:
+        """Simulation object for the variant"""
+        return Simulation(self.path)
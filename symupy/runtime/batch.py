@@ -0,0 +1,270 @@
+"""
+Batch runner
+============
+This module runs a batch of scenarios in parallel. Each scenario is run by a separate worker process holding its own ``Simulator``, since the simulator library keeps a single network per process.
+
+Indicators (KPIs) computed in the workers are streamed back to the main process through pipes, either at each step or once the scenario is finished. Workers that crash are restarted a bounded amount of times.
+
+Example:
+    Run two scenarios with two workers and collect final indicators ::
+
+        >>> from symupy.runtime.batch import BatchJob, BatchRunner
+        >>> jobs = [
+        ...     BatchJob("bottleneck_001.xml"),
+        ...     BatchJob("bottleneck_001.xml", overrides={"SIMULATIONS/SIMULATION": {"fin": "07:10:00"}}),
+        ... ]
+        >>> results = BatchRunner(jobs, max_workers=2).run()
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import os
+import tempfile
+import traceback
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from dataclasses import dataclass, field, replace
+from typing import Callable
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, workers cannot be limited in memory
+    resource = None
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.utils.exceptions import SymupyWarning
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+
+@dataclass
+class BatchJob:
+    """Scenario to be run by a worker
+
+    Args:
+        scenario (str):
+            Path towards the scenario file, or a ``ScenarioVariant`` written just before its worker starts
+
+        overrides (dict):
+            XPath (relative to the scenario root) → attributes to set on the matching elements before running
+
+        options (dict):
+            Keyword parameters for the ``Simulator`` e.g. ``library_path``
+    """
+
+    scenario: str
+    overrides: dict = field(default_factory=dict)
+    options: dict = field(default_factory=dict)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a job
+
+    Args:
+        job (BatchJob): job description
+        status (str): ``done`` or ``failed``
+        kpis (dict): indicators returned once the scenario is finished
+        steps (list): ``(step, kpis)`` streamed by the last attempt when running ``per_step``
+        attempts (int): amount of times the job was started
+        error (str): last error when failed
+    """
+
+    job: BatchJob
+    status: str = "pending"
+    kpis: dict = field(default_factory=dict)
+    steps: list = field(default_factory=list)
+    attempts: int = 0
+    error: str = ""
+
+
+def default_kpis(simulator) -> dict:
+    """Default indicators: current step and amount of vehicles in the network"""
+    return {"step": simulator.simulationstep, "vehicles": len(simulator.vehicles)}
+
+
+def apply_overrides(scenario: str, overrides: dict) -> str:
+    """Writes a copy of a scenario with modified attributes next to the original file, so that relative references remain valid
+
+    Args:
+        scenario (str): path towards the scenario file
+        overrides (dict): XPath → attributes to set on the matching elements
+
+    Returns:
+        str: path towards the modified copy
+    """
+    from symupy.runtime.api.scenario import ScenarioTemplate
+
+    handle, path = tempfile.mkstemp(
+        suffix=".xml", prefix="batch_", dir=os.path.dirname(os.path.abspath(scenario))
+    )
+    os.close(handle)
+    return ScenarioTemplate(scenario).write(overrides, path)
+
+
+def run_job(conn, job: BatchJob, kpis: Callable, per_step: bool) -> None:
+    """Runs a single scenario in a worker process and sends messages back through ``conn``:
+
+    * ``("step", step, kpis)`` after each step when ``per_step`` is set
+    * ``("done", kpis)`` when the scenario is finished
+    * ``("error", traceback)`` when the scenario could not be run
+    """
+    from symupy.runtime.api import Simulator
+
+    path = job.scenario
+    try:
+        if job.overrides:
+            path = apply_overrides(job.scenario, job.overrides)
+        simulator = Simulator(**job.options)
+        simulator.register_simulation(path)
+        with simulator as s:
+            while s.do_next:
+                s.run_step()
+                if per_step:
+                    conn.send(("step", s.simulationstep, kpis(s)))
+            conn.send(("done", kpis(s)))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        if path != job.scenario:
+            os.remove(path)
+        conn.close()
+
+
+def _limit_memory(target: Callable, limit: int, *args) -> None:
+    # Address space limit for a worker, a worker exceeding it fails and is retried
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    target(*args)
+
+
+class BatchRunner:
+    """Runs a batch of scenarios in a pool of worker processes
+
+    Args:
+        jobs (list): ``BatchJob`` objects, scenario paths or ``ScenarioVariant`` objects
+
+        max_workers (int):
+            Maximum amount of simultaneous workers, defaults to the amount of CPUs
+
+        memory_budget (int):
+            Total memory in bytes granted to workers, defaults to unbounded
+
+        worker_memory (int):
+            Memory in bytes granted per worker, each worker is limited to it (Unix only, ignored with a warning elsewhere). With a ``memory_budget`` the amount of simultaneous workers is also capped to ``memory_budget // worker_memory``
+
+        retries (int):
+            Amount of times a crashed job is started again
+
+        kpis (Callable):
+            Top level function ``kpis(simulator) -> dict`` evaluated in the workers, defaults to ``default_kpis``
+
+        per_step (bool):
+            Stream indicators at every step, defaults to only final indicators
+
+        target (Callable):
+            Top level function running a job in a worker, defaults to ``run_job``
+
+    :return: Batch runner
+    :rtype: BatchRunner
+    """
+
+    def __init__(
+        self,
+        jobs: list,
+        max_workers: int = 0,
+        memory_budget: int = 0,
+        worker_memory: int = 0,
+        retries: int = 1,
+        kpis: Callable = default_kpis,
+        per_step: bool = False,
+        target: Callable = run_job,
+    ) -> None:
+        self.jobs = [job if isinstance(job, BatchJob) else BatchJob(job) for job in jobs]
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if memory_budget and worker_memory:
+            self.max_workers = max(1, min(self.max_workers, memory_budget // worker_memory))
+        if worker_memory and resource is None:
+            SymupyWarning("Worker memory cannot be limited on this platform")
+            worker_memory = 0
+        self.worker_memory = worker_memory
+        self.retries = retries
+        self.kpis = kpis
+        self.per_step = per_step
+        self.target = target
+        self._context = mp.get_context("spawn")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(jobs={len(self.jobs)}, max_workers={self.max_workers})"
+
+    def run(self, on_step: Callable = None) -> list:
+        """Runs all jobs
+
+        Args:
+            on_step (Callable): called as ``on_step(index, step, kpis)`` for each streamed step. When a job is retried, its steps are streamed again from the start
+
+        Returns:
+            list: ``BatchResult`` per job, in the order of jobs
+        """
+        results = [BatchResult(job) for job in self.jobs]
+        pending = list(range(len(self.jobs)))[::-1]
+        running = {}  # connection → (index, process)
+
+        while pending or running:
+            while pending and len(running) < self.max_workers:
+                index = pending.pop()
+                running.update(self._start(index, results[index]))
+
+            for conn in wait(list(running)):
+                index, process = running[conn]
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    # Worker ended without reporting, crashed
+                    process.join()
+                    message = ("error", f"Worker exited with code {process.exitcode}")
+
+                kind, *payload = message
+                if kind == "step":
+                    results[index].steps.append(tuple(payload))
+                    if on_step is not None:
+                        on_step(index, *payload)
+                    continue
+
+                del running[conn]
+                conn.close()
+                process.join()
+                result = results[index]
+                if kind == "done":
+                    result.status, result.kpis = "done", payload[0]
+                elif result.attempts <= self.retries:
+                    # Steps of the failed attempt are discarded
+                    result.steps.clear()
+                    pending.append(index)
+                else:
+                    result.status, result.error = "failed", payload[0]
+        return results
+
+    def _start(self, index: int, result: BatchResult) -> dict:
+        job = self.jobs[index]
+        if not isinstance(job.scenario, str):
+            # Variants are written lazily, only the path is sent to the worker
+            job = replace(job, scenario=job.scenario.path)
+        receiver, sender = self._context.Pipe(duplex=False)
+        args = (sender, job, self.kpis, self.per_step)
+        if self.worker_memory:
+            target, args = _limit_memory, (self.target, self.worker_memory, *args)
+        else:
+            target = self.target
+        process = self._context.Process(target=target, args=args, daemon=True)
+        process.start()
+        sender.close()
+        result.attempts += 1
+        return {receiver: (index, process)}
@@ -34,6 +34,11 @@ class Publisher(AbsSubject):
         # maps event names to subscribers
         # str -> dict
         self._channels = {channel: {} for channel in channels}
+        # keyed subscriptions
+        # str -> field -> value -> dict
+        self._keyed = {channel: {} for channel in channels}
+        self._keys = {channel: {} for channel in channels}
+        self._last = {}
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.channels})"
@@ -46,18 +51,28 @@ class Publisher(AbsSubject):
         """Retreive subscribers in a particular channel"""
         return self._channels[channel]
 
-    def attach(self, observer, channel: str, callback=None):
+    def attach(self, observer, channel: str, callback=None, key=None, changes_only=False):
         """Attach a new observer to a specific channel,, one can specify
         a method of the class to be called.
 
+        A keyed observer declares the data it cares about as a ``(field, value)`` pair e.g. ``("vehid", 0)`` or ``("link", "Zone_001")``. It is only notified when the value is present, and the callback receives the matching data (see :py:meth:`select`).
+
         Args:
             channel(str): channel name
             observer(observer): observer object
             callback(callable): method to be executed when publisher notifies.
+            key(tuple): ``(field, value)`` of interest, defaults to all data
+            changes_only(bool): for keyed observers, skip notifications when the data did not change
         """
         if callback == None:
             callback = getattr(observer, "update")
-        self.get_subscribers(channel)[observer] = callback
+        if key is None:
+            self.get_subscribers(channel)[observer] = callback
+            return
+        field, value = key
+        subscribers = self._keyed[channel].setdefault(field, {}).setdefault(value, {})
+        subscribers[observer] = (callback, changes_only)
+        self._keys[channel][observer] = key
 
     def detach(self, observer, channel: str):
         """Detach observer from the subject
@@ -67,7 +82,18 @@ class Publisher(AbsSubject):
             observer(observer): observer object
             callback(callable): method to be executed when publisher notifies.
         """
-        del self.get_subscribers(channel)[observer]
+        key = self._keys[channel].pop(observer, None)
+        if key is None:
+            del self.get_subscribers(channel)[observer]
+            return
+        field, value = key
+        by_value = self._keyed[channel][field]
+        del by_value[value][observer]
+        if not by_value[value]:
+            del by_value[value]
+            self._last.pop((channel, field, value), None)
+        if not by_value:
+            del self._keyed[channel][field]
 
     def dispatch(self, channel: str = "default"):
         """Dispatches a message to a specific channel
@@ -75,8 +101,46 @@ class Publisher(AbsSubject):
         Args:
             channel(str): channel name
         """
-        for _, callback in self.get_subscribers(channel).items():
+        # Callbacks may attach or detach observers, observers attached during
+        # the dispatch are notified from the next one
+        subscribers = tuple(self.get_subscribers(channel).items())
+        keyed = tuple(self._keyed[channel].items())
+        for _, callback in subscribers:
             callback()
+        for field, by_value in keyed:
+            self._dispatch_keyed(channel, field, by_value)
+
+    def _dispatch_keyed(self, channel: str, field: str, by_value: dict):
+        last = self._last
+        for value, data in tuple(self.select(field, tuple(by_value)).items()):
+            changed = True
+            previous = last.get((channel, field, value), last)
+            if previous is not last:
+                changed = not Publisher._same(previous, data)
+            last[(channel, field, value)] = data
+            for callback, changes_only in tuple(by_value.get(value, {}).values()):
+                if changed or not changes_only:
+                    callback(data)
+
+    @staticmethod
+    def _same(previous, data) -> bool:
+        try:
+            return bool(previous == data)
+        except ValueError:
+            # Arrays are compared element wise
+            return previous.tolist() == data.tolist()
+
+    def select(self, field: str, values: tuple) -> dict:
+        """Data delivered to keyed observers. Publishers holding data override this method to provide for each value of ``field`` the matching data, values absent from the data are omitted.
+
+        Args:
+            field(str): field name e.g. ``vehid``
+            values(tuple): values of interest
+
+        Returns:
+            dict: value → data, all values with ``None`` by default
+        """
+        return dict.fromkeys(values)
 
     def foo(self):
         """ Demo function"""
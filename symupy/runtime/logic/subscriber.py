@@ -35,14 +35,17 @@ class Subscriber(AbsObserver):
             >>> query = DataQuery(channels)
     """
 
-    def __init__(self, publisher, channel="default"):
+    __slots__ = ("_counter", "_call", "_publisher", "_channel", "_key")
+
+    def __init__(self, publisher, channel="default", key=None, changes_only=False):
         self._counter = count(0)
         self._call = next(self._counter)
         self._publisher = publisher
         self._channel = channel
-        publisher.attach(self, channel)
+        self._key = key
+        publisher.attach(self, channel, key=key, changes_only=changes_only)
 
-    def update(self):
+    def update(self, *data):
         self._call = next(self._counter)
 
     def __exit__(self, exc_type, exc_value, traceback):
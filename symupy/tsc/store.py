@@ -0,0 +1,321 @@
+"""
+Vehicle Store
+=============
+This module implements a struct of arrays holding the state of a set of vehicles.
+
+Each field of the vehicle state (see ``FIELD_DATA``) is stored in a numpy column, one row per active vehicle. Rows are kept sorted by vehicle id and compacted when vehicles leave, so that the state of the whole fleet can be read as a view without copies.
+
+A bounded history of past kinematic states can be kept in a circular buffer via ``VehicleHistory``.
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import numpy as np
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.utils import constants as ct
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+
+class VehicleStore:
+    """Struct of arrays storing vehicle states. Rows are sorted by ``vehid``.
+
+    Storage grows by doubling its capacity, rows freed by exiting vehicles are reused by compaction.
+
+    Args:
+        capacity (int): initial number of rows allocated
+
+    Example:
+        Store two vehicles and read their speeds ::
+
+            >>> store = VehicleStore()
+            >>> store.insert(vehid=0, speed=25.0)
+            >>> store.insert(vehid=1, speed=20.0)
+            >>> store.column("speed")
+            array([25., 20.])
+    """
+
+    fields = tuple(ct.FIELD_DATA[key] for key in ct.FIELD_FORMATCOL)
+    defaults = {
+        "abscissa": 0.0,
+        "acceleration": 0.0,
+        "distance": 0.0,
+        "driven": False,
+        "elevation": 0.0,
+        "lane": 1,
+        "link": "Zone_001",
+        "ordinate": 0.0,
+        "speed": 25.0,
+        "vehid": 0,
+        "vehtype": "",
+    }
+
+    def __init__(self, capacity: int = ct.STORE_CAPACITY):
+        self._size = 0
+        self._rows = {}
+        self._columns = {
+            ct.FIELD_DATA[key]: np.empty(max(capacity, 1), dtype=fmt)
+            for key, fmt in ct.FIELD_FORMATCOL.items()
+        }
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, vehid):
+        return vehid in self._rows
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(size={self._size}, capacity={self.capacity})"
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows allocated"""
+        return len(self._columns["vehid"])
+
+    def column(self, field: str) -> np.ndarray:
+        """Values of a field for all vehicles in store, sorted by ``vehid``
+
+        Args:
+            field (str): vehicle property e.g. ``speed``
+
+        Returns:
+            values (ndarray): view over the store column
+        """
+        return self._columns[field][: self._size]
+
+    def row(self, vehid: int) -> int:
+        """Row of a vehicle within the store
+
+        Args:
+            vehid (int): vehicle id
+
+        Returns:
+            row (int): row index
+        """
+        return self._rows[vehid]
+
+    def get(self, vehid: int, field: str):
+        """Value of a field for a single vehicle"""
+        return self._columns[field].item(self._rows[vehid])
+
+    def set(self, vehid: int, /, **values) -> None:
+        """Modifies fields of a single vehicle, unknown fields are ignored"""
+        row = self._rows[vehid]
+        for field, value in values.items():
+            if field in self._columns:
+                self._columns[field][row] = value
+        if values.get("vehid", vehid) != vehid:
+            self._reindex()
+
+    def insert(self, **values) -> int:
+        """Adds a vehicle to the store keeping rows sorted by ``vehid``.
+        Missing fields take default values.
+
+        Returns:
+            row (int): row of the inserted vehicle
+        """
+        values = {**self.defaults, **values}
+        vehids = self.column("vehid")
+        row = int(np.searchsorted(vehids, values["vehid"]))
+        if self._size == self.capacity:
+            self._grow()
+        for field, column in self._columns.items():
+            if row < self._size:
+                column[row + 1 : self._size + 1] = column[row : self._size].copy()
+            column[row] = values[field]
+        self._size += 1
+        # Only rows from the insertion point onward are shifted
+        moved = self._columns["vehid"][row : self._size].tolist()
+        self._rows.update(zip(moved, range(row, self._size)))
+        return row
+
+    def insert_many(self, records: list) -> list:
+        """Adds a batch of vehicles to the store in a single merge, rows are kept sorted by ``vehid``. Missing fields take default values.
+
+        Args:
+            records (list): vehicle properties (dict) per vehicle
+
+        Returns:
+            rows (list): row of each inserted vehicle, in the order of records
+        """
+        if not records:
+            return []
+        records = [{**self.defaults, **values} for values in records]
+        vehids = np.array([values["vehid"] for values in records])
+        order = np.argsort(vehids, kind="stable")
+        positions = np.searchsorted(self.column("vehid"), vehids[order])
+        size = self._size + len(records)
+        while size > self.capacity:
+            self._grow()
+        for field, column in self._columns.items():
+            values = np.array([records[i][field] for i in order.tolist()], dtype=column.dtype)
+            column[:size] = np.insert(column[: self._size], positions, values)
+        self._size = size
+        self._reindex()
+
+        rows = np.empty(len(records), dtype=int)
+        rows[order] = positions + np.arange(len(records))
+        return rows.tolist()
+
+    def remove(self, vehids) -> None:
+        """Removes vehicles from the store in bulk, freed rows are compacted
+        at the end of the store.
+
+        Args:
+            vehids (iterable): vehicle ids to remove
+        """
+        keep = np.ones(self._size, dtype=bool)
+        keep[[self._rows[vehid] for vehid in vehids]] = False
+        size = int(keep.sum())
+        for column in self._columns.values():
+            column[:size] = column[: self._size][keep]
+        self._size = size
+        self._reindex()
+
+    def _grow(self) -> None:
+        capacity = 2 * self.capacity
+        for field, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[field] = grown
+
+    def _reindex(self) -> None:
+        self._rows = dict(zip(self.column("vehid").tolist(), range(self._size)))
+
+
+class VehicleHistory:
+    """Circular buffer keeping the last ``depth`` kinematic states of a set of vehicles.
+
+    The buffer is preallocated with shape (depth, vehicles, fields). Each vehicle owns a slot along the vehicle axis, slots of released vehicles are recycled and the vehicle axis grows by doubling. Missing states are filled with ``nan``.
+
+    Args:
+        depth (int): amount of time samples kept in memory
+        capacity (int): initial number of vehicle slots allocated
+
+    Example:
+        Record the states of a store and retrieve the last 3 speeds of a vehicle ::
+
+            >>> history = VehicleHistory(depth=10)
+            >>> history.record(time, store)
+            >>> history.last(0, 3, "speed")
+    """
+
+    fields = ("abscissa", "acceleration", "distance", "elevation", "ordinate", "speed")
+
+    def __init__(self, depth: int = ct.BUFFER_CONTROL, capacity: int = ct.STORE_CAPACITY):
+        self._depth = depth
+        self._head = -1
+        self._count = 0
+        self._times = np.full(depth, np.nan)
+        self._buffer = np.full((depth, max(capacity, 1), len(self.fields)), np.nan)
+        self._slots = {}
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, vehid):
+        return vehid in self._slots
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(depth={self._depth}, records={self._count})"
+
+    @property
+    def depth(self) -> int:
+        """Amount of time samples kept in memory"""
+        return self._depth
+
+    @property
+    def capacity(self) -> int:
+        """Number of vehicle slots allocated"""
+        return self._buffer.shape[1]
+
+    def record(self, time: float, store: VehicleStore) -> None:
+        """Appends the current states of all vehicles in a store, overwriting the oldest record when the buffer is full
+
+        Args:
+            time (float): simulation time of the record
+            store (VehicleStore): store holding current vehicle states
+        """
+        slots = [
+            self._slots[vehid] if vehid in self._slots else self._allocate(vehid)
+            for vehid in store.column("vehid").tolist()
+        ]
+        self._head = (self._head + 1) % self._depth
+        self._count = min(self._count + 1, self._depth)
+        self._times[self._head] = time
+        frame = self._buffer[self._head]
+        frame[:] = np.nan
+        if slots:
+            frame[slots] = np.column_stack([store.column(f) for f in self.fields])
+
+    def release(self, vehids) -> None:
+        """Frees the slots of vehicles, their history is discarded
+
+        Args:
+            vehids (iterable): vehicle ids
+        """
+        for vehid in vehids:
+            slot = self._slots.pop(vehid, None)
+            if slot is not None:
+                self._free.append(slot)
+
+    def times(self, k: int = None) -> np.ndarray:
+        """Simulation times of the last ``k`` records, oldest first"""
+        return self._times[self._order(k)]
+
+    def last(self, vehid: int, k: int = None, field: str = None) -> np.ndarray:
+        """Last ``k`` states of a single vehicle, oldest first
+
+        Args:
+            vehid (int): vehicle id
+            k (int): amount of records, defaults to all records available
+            field (str): one of ``VehicleHistory.fields``, defaults to all fields
+
+        Returns:
+            states (ndarray): array of shape (k, fields) or (k,) when a field is given
+        """
+        states = self._buffer[self._order(k), self._slots[vehid]]
+        return states if field is None else states[:, self.fields.index(field)]
+
+    def fleet(self, vehids, k: int = None, field: str = None) -> np.ndarray:
+        """Last ``k`` states of a set of vehicles, oldest first
+
+        Args:
+            vehids (iterable): vehicle ids
+            k (int): amount of records, defaults to all records available
+            field (str): one of ``VehicleHistory.fields``, defaults to all fields
+
+        Returns:
+            states (ndarray): array of shape (k, vehicles, fields) or (k, vehicles) when a field is given
+        """
+        slots = [self._slots[vehid] for vehid in vehids]
+        states = self._buffer[np.ix_(self._order(k), slots)]
+        return states if field is None else states[..., self.fields.index(field)]
+
+    def _order(self, k: int = None) -> np.ndarray:
+        k = self._count if k is None else min(k, self._count)
+        return (self._head - np.arange(k)[::-1]) % self._depth
+
+    def _allocate(self, vehid: int) -> int:
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._buffer[:, slot, :] = np.nan
+        self._slots[vehid] = slot
+        return slot
+
+    def _grow(self) -> None:
+        capacity = self.capacity
+        grown = np.full((self._depth, 2 * capacity, len(self.fields)), np.nan)
+        grown[:, :capacity] = self._buffer
+        self._buffer = grown
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
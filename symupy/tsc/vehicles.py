@@ -11,10 +11,10 @@ Vehicle model acts as an instance to trace individual vehicle data and modify ve
 # ============================================================================
 
 from typing import Dict, List
+from bisect import bisect_left
 import itertools
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass, asdict
 
 
 # ============================================================================
@@ -23,7 +23,9 @@ from dataclasses import dataclass, asdict
 
 from symupy.runtime.logic.subscriber import Subscriber
 from symupy.utils import constants as ct
+from symupy.utils.exceptions import SymupyError
 from .dynamics import VehicleDynamic
+from .store import VehicleStore, VehicleHistory
 from symupy.runtime.logic.sorted_frozen_set import SortedFrozenSet
 
 # ============================================================================
@@ -31,7 +33,6 @@ from symupy.runtime.logic.sorted_frozen_set import SortedFrozenSet
 # ============================================================================
 
 
-@dataclass
 class Vehicle(Subscriber):
     """Vehicle class defined for storing data on a single vehicle:
 
@@ -41,7 +42,7 @@ class Vehicle(Subscriber):
         request (Publisher): Parser or object publishing data
 
     Retunrns:
-        vehicle (Vehicle): A Dataclass with vehicle parameters
+        vehicle (Vehicle): A view over the vehicle state held in a VehicleStore
 
     ============================  =================================
     **Variable**                  **Description**
@@ -79,30 +80,32 @@ class Vehicle(Subscriber):
     """
 
     counter = itertools.count()
-    abscissa: float = 0.0
-    acceleration: float = 0.0
-    distance: float = 0.0
-    driven: bool = False
-    elevation: float = 0.0
-    lane: int = 1
-    link: str = "Zone_001"
-    ordinate: float = 0.0
-    speed: float = 25.0
-    vehid: int = 0
-    vehtype: str = ""
-
-    def __init__(self, request, **kwargs):
-        """This initializer creates a Vehicle"""
+
+    __slots__ = ("count", "dynamic", "itinerary", "_store", "_shared", "_vehid")
+
+    def __init__(self, request, store: VehicleStore = None, **kwargs):
+        """This initializer creates a Vehicle
+
+        Args:
+            request (Publisher): Parser or object publishing data
+            store (VehicleStore): store already holding the vehicle state, its owner is in charge of refreshing it. By default the vehicle keeps its own store and subscribes to the request.
+        """
         # Undefined properties
         self.count = next(self.__class__.counter)
         self.dynamic = VehicleDynamic()
         self.itinerary = []
-
-        # Optional properties
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-
-        super().__init__(request)
+        self._vehid = kwargs.get("vehid", VehicleStore.defaults["vehid"])
+
+        self._shared = store is not None
+        if store is None:
+            self._store = VehicleStore(capacity=1)
+            self._store.insert(**kwargs)
+            super().__init__(request, key=("vehid", self._vehid))
+        else:
+            self._store = store
+            self._publisher = request
+            self._channel = None
+            self._key = None
 
     def __hash__(self):
         return hash((type(self), self.vehid))
@@ -112,27 +115,87 @@ class Vehicle(Subscriber):
             return NotImplemented
         return self.vehid == veh.vehid
 
-    def update(self):
-        """Updates data from publisher"""
-        dataveh = self._publisher.get_vehicle_properties(self.vehid)
-        self.__dict__.update(**dataveh)
+    def __repr__(self):
+        data = ", ".join(f"{k}={getattr(self, k)!r}" for k in VehicleStore.defaults)
+        return f"{self.__class__.__name__}({data})"
+
+    def update(self, dataveh: dict = None):
+        """Updates data from publisher
 
-        link = getattr(self, "link")
-        if link not in getattr(self, "itinerary"):
+        Args:
+            dataveh (dict): vehicle properties delivered by the publisher, fetched from the publisher when not provided
+        """
+        if dataveh is None:
+            dataveh = self._publisher.get_vehicle_properties(self.vehid)
+        if dataveh:
+            self._store.set(self._vehid, **dataveh)
+
+        link = self.link
+        if link not in self.itinerary:
             self.itinerary.append(link)
 
+    def detach_store(self):
+        """Copies the vehicle state into a private store, the vehicle is then independent from the store it was created in"""
+        state = self.asdict()
+        self._store = VehicleStore(capacity=1)
+        self._store.insert(**state)
+        self._shared = False
+
+    def asdict(self) -> dict:
+        """Vehicle state as a dictionary"""
+        return {field: self._store.get(self._vehid, field) for field in VehicleStore.fields}
+
+    @property
+    def vehid(self) -> int:
+        """Vehicle id"""
+        return self._vehid
+
+    @vehid.setter
+    def vehid(self, value: int):
+        if self._shared:
+            # Rows of a shared store (e.g. a VehicleList) are sorted by id
+            raise SymupyError(
+                f"Vehicle {self._vehid} belongs to a shared store, its id cannot be changed"
+            )
+        # Subscription follows the vehicle id, vehicles hash on their id
+        keyed = self._channel is not None and self._key is not None
+        if keyed:
+            self._publisher.detach(self, self._channel)
+        self._store.set(self._vehid, vehid=value)
+        self._vehid = value
+        if keyed:
+            self._key = ("vehid", value)
+            self._publisher.attach(self, self._channel, key=self._key)
+
     @property
     def x(self):
         """Vehicle state vector (x,v,a)"""
         return np.array((self.distance, self.speed, self.acceleration))
 
 
+def _store_field(field: str) -> property:
+    def getter(self):
+        return self._store.get(self._vehid, field)
+
+    def setter(self, value):
+        self._store.set(self._vehid, **{field: value})
+
+    return property(getter, setter, doc=f"Current {field}")
+
+
+for _field in VehicleStore.fields:
+    if _field != "vehid":
+        setattr(Vehicle, _field, _store_field(_field))
+
+
 class VehicleList(SortedFrozenSet):
     """Class defining a set of vehicles. This class is based on a sorted
     frozen set and supports multiple operations in between sets. You can define a list based on a simluator request and the list will update automatically via a single method.
 
     Args:
         request (Publisher): Publisher of information
+        history (bool): Keep a bounded history of vehicle states, defaults to False
+        depth (int): Amount of past states kept when history is enabled
 
     Example:
         Define a list of vehicles to trace the requests ::
@@ -145,78 +208,168 @@ class VehicleList(SortedFrozenSet):
     The list could be eventually updated as an observer but for simplicity reasons it is kept like this.
     """
 
-    _cumul = set()
-
-    def __init__(self, request):
+    def __init__(self, request, history: bool = False, depth: int = ct.BUFFER_CONTROL):
         self._request = request
-        data = [Vehicle(request, **v) for v in request.get_vehicle_data()]
+        self._store = VehicleStore()
+        self._history = VehicleHistory(depth) if history else None
         self._free = []
-        self.__class__._cumul = self.__class__._cumul.union(
-            request.get_vehicles_property("vehid")
-        )
+        data = []
+        for v in sorted(request.get_vehicle_data(), key=lambda v: v["vehid"]):
+            self._store.insert(**v)
+            data.append(Vehicle(request, store=self._store, **v))
         SortedFrozenSet.__init__(self, tuple(data))
+        self._vehids = [veh.vehid for veh in self._items]
+        self._entered = frozenset(self._vehids)
+        self._exited = frozenset()
+        for veh in self._items:
+            veh.itinerary.append(veh.link)
+        # The store is refreshed in a single pass whenever the request is updated
+        request.attach(self._store, "default", self._refresh)
+
+    def _refresh(self):
+        """Copies the state of vehicles in the list from the request"""
+        if not len(self._store):
+            return
+        ids = self._request.get_vehicles_column("vehid")
+        if not len(ids):
+            return
+        vehids = self._store.column("vehid")
+        order = np.argsort(ids, kind="stable")
+        rows = order[np.minimum(np.searchsorted(ids, vehids, sorter=order), len(ids) - 1)]
+        found = ids[rows] == vehids
+        slots = np.flatnonzero(found)
+        rows = rows[found]
+
+        links = self._store.column("link")
+        previous = links[slots]
+        for field in VehicleStore.fields:
+            self._store.column(field)[slots] = self._request.get_vehicles_column(field)[rows]
+
+        # Itinerary only for vehicles changing link
+        for slot in slots[previous != links[slots]].tolist():
+            veh = self._items[slot]
+            if links[slot] not in veh.itinerary:
+                veh.itinerary.append(links[slot])
 
     def update_list(self):
-        """Update vehicle data according to an update in the request."""
-
-        newveh = []
-        # Create only new vehicles
-        for v in self._request.get_vehicle_data():
-            if v.get("vehid") not in self.__class__._cumul:
-                newveh.append(Vehicle(self._request, **v))
-                self.__class__._cumul.add(v.get("vehid"))
-
-        data = SortedFrozenSet(self._items).union(newveh)
-
-       # Put vehicles on list
-        self._items = data._items
-
-        # Take out exciting vehicles
-        for veh in self._items:
-            if veh.vehid not in self._request.get_vehicles_property("vehid"):
-                self.release(veh)
+        """Update vehicle data according to an update in the request.
 
+        Current vehicle ids are compared once against the previous ones, only entering vehicles are created and exiting vehicles are released in bulk.
+        """
+        current = set(self._request.get_vehicles_property("vehid"))
+        previous = set(self._vehids)
+
+        self._entered = frozenset(current - previous)
+        self._exited = frozenset(previous - current)
+
+        # Take out exiting vehicles, located by bisection on sorted ids
+        if self._exited:
+            for vehid in sorted(self._exited, reverse=True):
+                index = bisect_left(self._vehids, vehid)
+                self._retire(self._items[index])
+                del self._items[index]
+                del self._vehids[index]
+            self._store.remove(self._exited)
+
+        # Create only new vehicles, merged into the store in one go
+        if self._entered:
+            records = [
+                self._request.get_vehicle_properties(vehid)
+                for vehid in sorted(self._entered)
+            ]
+            rows = self._store.insert_many(records)
+            items = [None] * len(self._store)
+            for row, dataveh in zip(rows, records):
+                veh = Vehicle(self._request, store=self._store, **dataveh)
+                veh.itinerary.append(veh.link)
+                items[row] = veh
+            remaining = iter(self._items)
+            self._items = [veh if veh is not None else next(remaining) for veh in items]
+            self._vehids = [veh.vehid for veh in self._items]
+
+        if self._history is not None:
+            time = self._request.current_time
+            # Empty responses (e.g. lite launch mode) carry no instant
+            if time is not None:
+                self._history.record(time, self._store)
 
     def release(self, veh: Vehicle):
         """Moves a vehicle to a free list so that it is not considered in the
+        list and stops receiving updates from the publisher
 
         Args:
             r (VehType): Vehicle object
         """
-        self._items.remove(veh)
-        self.__class__._cumul.remove(veh.vehid)
+        index = bisect_left(self._vehids, veh.vehid)
+        self._retire(veh)
+        self._store.remove((veh.vehid,))
+        del self._items[index]
+        del self._vehids[index]
+
+    def _retire(self, veh: Vehicle):
+        veh.detach_store()
+        if self._history is not None:
+            self._history.release((veh.vehid,))
         self._free.append(veh)
 
+    @property
+    def history(self) -> VehicleHistory:
+        """History of past vehicle states, None if not enabled
+
+        Example:
+            Speeds of all vehicles in the list over the last 3 steps ::
 
-    def _get_vehicles_attribute(self, attribute: str) -> pd.Series:
+                >>> vl = VehicleList(simrequest, history=True)
+                >>> vl.history.fleet(vl.vehids, 3, "speed")
+        """
+        return self._history
+
+    @property
+    def vehids(self) -> tuple:
+        """Ids of vehicles in the list"""
+        return tuple(self._vehids)
+
+    @property
+    def entered(self) -> frozenset:
+        """Vehicle ids that entered the network during the last update"""
+        return self._entered
+
+    @property
+    def exited(self) -> frozenset:
+        """Vehicle ids that left the network during the last update"""
+        return self._exited
+
+    def _get_vehicles_attribute(self, attribute: str) -> np.ndarray:
         """Retrieve list of parameters
 
         Args:
             attribute (str): One of the vehicles attribute e.g. 'distance'
 
         Returns
-            dataframe (series): Returns values for a set of vehicles
+            values (ndarray): Read-only view over the values for a set of vehicles, in the order of the list
         """
-        return self._to_pandas()[attribute]
+        values = self._store.column(attribute)
+        values.flags.writeable = False
+        return values
 
     @property
-    def acceleration(self) -> pd.Series:
+    def acceleration(self) -> np.ndarray:
         """
         Returns all vehicle's accelerations
         """
         return self._get_vehicles_attribute("acceleration")
 
     @property
-    def speed(self) -> pd.Series:
+    def speed(self) -> np.ndarray:
         """
-        Returns all vehicle's accelerations
+        Returns all vehicle's speeds
         """
         return self._get_vehicles_attribute("speed")
 
     @property
-    def distance(self) -> pd.Series:
+    def distance(self) -> np.ndarray:
         """
-        Returns all vehicle's accelerations
+        Returns all vehicle's distances
         """
         return self._get_vehicles_attribute("distance")
 
@@ -227,7 +380,7 @@ class VehicleList(SortedFrozenSet):
             df (DataFrame): Returns a table with pandas data.
 
         """
-        return pd.DataFrame([asdict(v) for v in self._items])
+        return pd.DataFrame({f: self._store.column(f) for f in VehicleStore.fields})
 
     def __str__(self):
         if not self._items:
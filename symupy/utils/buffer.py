@@ -0,0 +1,143 @@
+"""This module contains a ``ResponseBuffer`` object.
+    The response buffer holds the string buffer filled by the simulator at
+    each step. It detects truncated responses, grows geometrically when the
+    simulator answer does not fit and optionally shrinks back after a
+    sustained period of low usage.
+
+    Example:
+        To use the ``ResponseBuffer`` pass its ``buffer`` to the simulator
+        and check it after each step ::
+
+            >>> response = ResponseBuffer(size=65536)
+            >>> lib.SymRunNextStepEx(response.buffer, write_xml, byref(b_end))
+            >>> if response.check():
+            ...     request.query = response.buffer
+"""
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import re
+from ctypes import create_string_buffer
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.utils.constants import (
+    BUFFER_STRING,
+    BUFFER_STRING_MIN,
+    BUFFER_STRING_MAX,
+    BUFFER_SHRINK_STEPS,
+)
+from symupy.utils.exceptions import SymupyWarning
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+END_OF_STRING = re.compile(rb"\x00")
+
+
+class ResponseBuffer:
+    """String buffer receiving the simulator responses
+
+    Args:
+        size (int):
+            Initial size of the buffer in bytes
+
+        max_size (int):
+            Upper bound for the buffer size
+
+        shrink (bool):
+            Flag to release memory after a sustained low usage
+
+        shrink_after (int):
+            Amount of consecutive steps using less than a quarter of the
+            buffer before it is halved
+
+    :return: Response buffer
+    :rtype: ResponseBuffer
+    """
+
+    def __init__(
+        self,
+        size: int = BUFFER_STRING,
+        max_size: int = BUFFER_STRING_MAX,
+        shrink: bool = False,
+        shrink_after: int = BUFFER_SHRINK_STEPS,
+    ) -> None:
+        self.max_size = max(max_size, size)
+        self.shrink = shrink
+        self.shrink_after = shrink_after
+        self.buffer = create_string_buffer(size)
+        self.used = 0
+        self.high_water = 0
+        self.overflows = 0
+        self._low_steps = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={self.size}, high_water={self.high_water})"
+
+    @property
+    def size(self) -> int:
+        """Size of the buffer in bytes"""
+        return len(self.buffer)
+
+    @property
+    def truncated(self) -> bool:
+        """True if the last response filled the whole buffer"""
+        return self.used >= self.size - 1
+
+    def check(self) -> bool:
+        """Measures the last response written by the simulator. When the
+        response was truncated the buffer is grown for the next step.
+
+        Returns:
+            bool: True if the response is complete and can be parsed
+        """
+        self.used = self._measure()
+        self.high_water = max(self.high_water, self.used)
+        if self.truncated:
+            self.overflows += 1
+            self.grow()
+            return False
+        self._release()
+        return True
+
+    def grow(self, size: int = 0) -> None:
+        """Reallocates the buffer doubling its size, up to ``max_size``
+
+        Args:
+            size (int): minimum size required, defaults to twice the current size
+        """
+        size = min(max(2 * self.size, size), self.max_size)
+        if size <= self.size:
+            SymupyWarning(
+                f"Simulator response truncated at maximum buffer size {self.max_size}"
+            )
+            return
+        SymupyWarning(
+            f"Simulator response truncated, buffer resized from {self.size} to {size}"
+        )
+        self.buffer = create_string_buffer(size)
+        self._low_steps = 0
+
+    def _measure(self) -> int:
+        # Position of the terminating NUL, the buffer is scanned in place
+        end = END_OF_STRING.search(self.buffer)
+        return end.start() if end else self.size
+
+    def _release(self) -> None:
+        if not self.shrink:
+            return
+        if 4 * self.used >= self.size or self.size <= BUFFER_STRING_MIN:
+            self._low_steps = 0
+            return
+        self._low_steps += 1
+        if self._low_steps >= self.shrink_after:
+            self.buffer = create_string_buffer(max(self.size // 2, BUFFER_STRING_MIN))
+            self._low_steps = 0
@@ -0,0 +1,91 @@
+"""This module contains a ``StepCache`` object and the ``step_cached`` decorator.
+    The cache keeps the results of simulator getters during a simulation step so that repeated queries with the same arguments do not cross the library boundary again. It is cleared whenever the state of the simulator changes.
+
+    Example:
+        To cache a getter of an object holding a ``StepCache`` in ``_step_cache`` ::
+
+            >>> class Simulator:
+            ...     @step_cached
+            ...     def get_vehicle_speed(self, vehid):
+            ...         return library.SymGetVehicleSpeed(vehid)
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+from functools import wraps
+from typing import Callable
+
+# ============================================================================
+# CLASS AND DEFINITIONS
+# ============================================================================
+
+
+class StepCache:
+    """Results of getters for the current simulation step, keyed on (method, arguments)
+
+    :return: Step cache
+    :rtype: StepCache
+    """
+
+    def __init__(self) -> None:
+        self._data = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+    def clear(self) -> None:
+        """Discards cached results, counters are kept"""
+        self._data.clear()
+
+    def reset(self) -> None:
+        """Discards cached results and resets counters"""
+        self.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: tuple, compute: Callable):
+        """Returns the cached result for ``key``, computing it on a miss"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = compute()
+            return value
+        self.hits += 1
+        return value
+
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def step_cached(orig_func: Callable) -> Callable:
+    """Memoizes a method within a simulation step when the instance holds a ``StepCache`` in ``_step_cache``. Methods are executed normally when the cache is disabled (``None``).
+
+    Args:
+        orig_func (Callable): Method to be cached, its arguments must be hashable (lists are converted to tuples)
+
+    Returns:
+        Callable: Wrapped method
+    """
+
+    @wraps(orig_func)
+    def wrapper(self, *args, **kwargs):
+        cache = self._step_cache
+        if cache is None:
+            return orig_func(self, *args, **kwargs)
+        key = (
+            orig_func.__name__,
+            tuple(map(_freeze, args)),
+            tuple((k, _freeze(v)) for k, v in sorted(kwargs.items())),
+        )
+        return cache.lookup(key, lambda: orig_func(self, *args, **kwargs))
+
+    return wrapper
@@ -9,7 +9,7 @@
 # STANDARD  IMPORTS
 # ============================================================================
 
-from ctypes import create_string_buffer, c_bool, c_char
+from ctypes import c_bool, c_char
 from dataclasses import dataclass
 import click
 from symupy.utils.screen import log_verify
@@ -20,12 +20,14 @@ from symupy.utils.screen import log_verify
 
 from symupy.utils.constants import (
     BUFFER_STRING,
+    BUFFER_STRING_MAX,
     WRITE_XML,
     TRACE_FLOW,
     DEFAULT_PATH_SYMUFLOW,
     TOTAL_SIMULATION_STEPS,
     LAUNCH_MODE,
 )
+from symupy.utils.buffer import ResponseBuffer
 
 # ============================================================================
 # CLASS AND DEFINITIONS
@@ -47,7 +49,13 @@ class Configurator:
             Absolute path towards the simulator library
 
         bufferSize (int):
-            Size of the buffer for message for data received from simulator
+            Initial size of the buffer for message for data received from simulator. The buffer grows automatically when a response is truncated
+
+        bufferMaxSize (int):
+            Maximum size of the buffer
+
+        bufferShrink (bool):
+            Flag to shrink the buffer after a sustained low usage
 
         write_xml (bool):
             Flag to turn on writting the XML output
@@ -65,7 +73,6 @@ class Configurator:
     :rtype: Configurator
     """
 
-    buffer_string: c_char = create_string_buffer(BUFFER_STRING)
     write_xml: c_bool = c_bool(WRITE_XML)
     trace_flow: bool = TRACE_FLOW
     library_path: str = DEFAULT_PATH_SYMUFLOW
@@ -80,7 +87,13 @@ class Configurator:
                 Absolute path towards the simulator library
 
             bufferSize (int):
-                Size of the buffer for message for data received from simulator
+                Initial size of the buffer for message for data received from simulator. The buffer grows automatically when a response is truncated
+
+            bufferMaxSize (int):
+                Maximum size of the buffer
+
+            bufferShrink (bool):
+                Flag to shrink the buffer after a sustained low usage
 
             write_xml (bool):
                 Flag to turn on writting the XML output
@@ -95,6 +108,12 @@ class Configurator:
                 Determine to way to launch the ``RunStepEx``. Options ``lite``/``full``
         """
         click.echo("Configurator: Initialization")
+        # One buffer per instance
+        self.response = ResponseBuffer(
+            size=kwargs.pop("bufferSize", BUFFER_STRING),
+            max_size=kwargs.pop("bufferMaxSize", BUFFER_STRING_MAX),
+            shrink=kwargs.pop("bufferShrink", False),
+        )
         for key, value in kwargs.items():
             setattr(self, key, value)
         try:
@@ -105,6 +124,11 @@ class Configurator:
         finally:
             return
 
+    @property
+    def buffer_string(self) -> c_char:
+        """String buffer where the simulator writes its responses"""
+        return self.response.buffer
+
     def __repr__(self):
         data_dct = ", ".join(f"{k}={v}" for k, v in self.__dict__.items())
         return f"{self.__class__.__name__}({data_dct})"
@@ -14,12 +14,22 @@
      **Variable**                 **Description**
     ----------------------------  ---------------------------------
     ``BUFFER_STRING``              Buffer size
+    ``BUFFER_STRING_MIN``          Minimum buffer size when shrinking
+    ``BUFFER_STRING_MAX``          Maximum buffer size when growing
+    ``BUFFER_SHRINK_STEPS``        Low usage steps before shrinking
+    ``PIPELINE_DEPTH``             Steps computed ahead when pipelined
+    ``DRIVE_VEHICLE_ABSENT``       Drive status of vehicles not in network
+    ``XML_INDEX_EXTENSION``        Extension of XML index sidecar files
+    ``TRAJ_CACHE_EXTENSION``       Extension of columnar trajectory stores
+    ``TRAJ_CACHE_WINDOW``          Time window (s) of trajectory partitions
+    ``SCAN_BATCH_INSTANTS``        Instants per batch when scanning outputs
     ``DEFAULT_LIB_OSX``            Default OS X library path
     ``DEFAULT_LIB_LINUX``          Default Linux library path
     ``FIELD_DATA``                 Vehicle trajectory data
     ``FIELD_FORMAT``               Trajectory data types
     ``HOUR_FORMAT``                Time format
     ``FIELD_FORMATAGG``            Format aggretations
+    ``FIELD_FORMATCOL``            Trajectory column data types
     ``DCT_SIMULATION_INFO```       XML Simulation information
     ``DCT_EXPORT_INFO``            XML Export information
     ``DCT_TRAFIC_INFO``            XML Traffic information
@@ -129,11 +139,25 @@ except NameError:
 # =============================================================================
 
 BUFFER_STRING = 1000000
+BUFFER_STRING_MIN = 65536
+BUFFER_STRING_MAX = 1 << 30
+BUFFER_SHRINK_STEPS = 100
+PIPELINE_DEPTH = 2
+DRIVE_VEHICLE_ABSENT = -2
 WRITE_XML = False
 TRACE_FLOW = False
 LAUNCH_MODE = "lite"
 TOTAL_SIMULATION_STEPS = 0
 
+# =============================================================================
+# XML INDEX
+# =============================================================================
+
+XML_INDEX_EXTENSION = ".symidx"
+TRAJ_CACHE_EXTENSION = ".symcache"
+TRAJ_CACHE_WINDOW = 900.0
+SCAN_BATCH_INSTANTS = 100
+
 FIELD_DATA = {
     "abs": "abscissa",
     "acc": "acceleration",
@@ -178,6 +202,20 @@ FIELD_FORMATAGG = {
     "elevation": (array, FLOATFORMAT),
 }
 
+FIELD_FORMATCOL = {
+    "abs": FLOATFORMAT,
+    "acc": FLOATFORMAT,
+    "dst": FLOATFORMAT,
+    "etat_pilotage": bool,
+    "id": INTFORMAT,
+    "ord": FLOATFORMAT,
+    "tron": object,
+    "type": object,
+    "vit": FLOATFORMAT,
+    "voie": INTFORMAT,
+    "z": FLOATFORMAT,
+}
+
 # =============================================================================
 # XML Data
 # =============================================================================
@@ -255,6 +293,12 @@ TP_ACCEL = (
 
 BUFFER_CONTROL = 10  # Amount of control samples stored in memory
 
+# =============================================================================
+# VEHICLE STORE
+# =============================================================================
+
+STORE_CAPACITY = 256  # Initial amount of vehicles allocated in a store
+
 # =============================================================================
 # VEHICLE DYNAMICS
 # =============================================================================
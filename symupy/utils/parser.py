@@ -14,6 +14,8 @@ from ctypes import create_string_buffer
 from typing import Union, Dict, List, Tuple
 from collections import defaultdict
 
+import numpy as np
+
 # ============================================================================
 # INTERNAL IMPORTS
 # ============================================================================
@@ -28,6 +30,8 @@ from symupy.utils.constants import BUFFER_STRING, FIELD_DATA, FIELD_FORMAT
 # CLASS AND DEFINITIONS
 # ============================================================================
 
+FIELD_KEYS = {value: key for key, value in FIELD_DATA.items()}
+
 
 class SimulatorRequest(Publisher):
     def __init__(self, **kwargs):
@@ -52,11 +56,16 @@ class SimulatorRequest(Publisher):
 
     @property
     def query(self):
-        """String response from the simulator"""
+        """String response from the simulator. When the response was parsed
+        in place from the simulator buffer, it is decoded on first access
+        """
         return self.datatraj._xml
 
     @query.setter
     def query(self, response: bytes):
+        """Parses a new response from the simulator, either ``bytes`` or the
+        string buffer filled by the simulator, and notifies subscribers
+        """
         self.datatraj = XMLTrajectory(response)
         for c in self._channels:
             self.dispatch(c)
@@ -79,6 +88,109 @@ class SimulatorRequest(Publisher):
 
         return self.datatraj.todict
 
+    def snapshot(self) -> np.ndarray:
+        """Structured array view of the current query, one record per vehicle
+
+        Example:
+            Select speeds of vehicles in a link ::
+
+                >>> snap = simrequest.snapshot()
+                >>> snap["speed"][snap["link"] == "Zone_001"]
+
+        Returns:
+            records (ndarray): fields named after vehicle properties e.g. ``vehid``, ``link``, ``speed``
+        """
+        return self.datatraj.records
+
+    def select(self, field: str, values: tuple) -> dict:
+        """Slices of the current query delivered to keyed subscribers, rows are grouped in a single pass over the column.
+
+        Example:
+            Subscribe to vehicles in a link ::
+
+                >>> simrequest.attach(observer, "default", callback, key=("link", "Zone_001"))
+
+        Args:
+            field (str): ``vehid`` or any other vehicle property e.g. ``link``, ``lane``
+            values (tuple): values of interest
+
+        Returns:
+            dict: vehid → vehicle properties (dict), otherwise value → records (ndarray). Values absent from the query are omitted
+        """
+        if field == "vehid":
+            index = self.datatraj.index
+            return {v: self.get_vehicle_properties(v) for v in values if v in index}
+
+        wanted = set(values)
+        rows = defaultdict(list)
+        for row, value in enumerate(self.get_vehicles_column(field).tolist()):
+            if value in wanted:
+                rows[value].append(row)
+        records = self.snapshot()
+        return {value: records[row] for value, row in rows.items()}
+
+    # =========================================================================
+    # VECTORIZED METHODS
+    # =========================================================================
+
+    def get_vehicles_column(self, property_key: str, mask=None) -> np.ndarray:
+        """Extracts a specific property as an array for all vehicles (or the
+        subset selected by a boolean mask)
+
+        Args:
+            property_key (str):
+                one of the following options abscissa, acceleration, distance, driven, elevation, lane, link, ordinate, speed, vehid, vehtype
+
+            mask (ndarray):
+                boolean mask as returned by :py:meth:`vehicles_mask`, defaults to None
+
+        Returns:
+            values (ndarray): array with corresponding values
+        """
+        column = self.datatraj.columns[FIELD_KEYS[property_key]]
+        return column if mask is None else column[mask]
+
+    def vehicles_mask(self, **conditions) -> np.ndarray:
+        """Boolean mask of vehicles fulfilling all conditions
+
+        Example:
+            Vehicles in lane 1 of a link ::
+
+                >>> mask = simrequest.vehicles_mask(link="Zone_001", lane=1)
+                >>> simrequest.get_vehicles_column("vehid", mask)
+
+        Args:
+            conditions: property=value pairs, values can be a scalar or a collection of accepted values
+
+        Returns:
+            mask (ndarray): boolean array, one entry per vehicle
+        """
+        mask = np.ones(len(self.datatraj.columns["id"]), dtype=bool)
+        for property_key, value in conditions.items():
+            column = self.get_vehicles_column(property_key)
+            if isinstance(value, (tuple, list, set, frozenset, np.ndarray)):
+                mask &= np.isin(column, list(value))
+            else:
+                mask &= column == value
+        return mask
+
+    def filter_vehicle_column(self, property: str, *args) -> np.ndarray:
+        """Filter out a property for a subset of vehicles
+
+        Args:
+            property (str):
+                one of the following options abscissa, acceleration, distance, driven, elevation, lane, link, ordinate, speed, vehid, vehtype
+
+            vehids (int):
+                separate the ``vehid`` via commas to get the corresponding property
+
+        Returns:
+            values (ndarray): values following the order of vehicles in the query
+        """
+        if args:
+            return self.get_vehicles_column(property, self.vehicles_mask(vehid=args))
+        return self.get_vehicles_column(property)
+
     # =========================================================================
     # METHODS
     # =========================================================================
@@ -104,7 +216,9 @@ class SimulatorRequest(Publisher):
             values (tuple):
                 tuple with corresponding values e.g (0,1), (0,),(None,)
         """
-        return tuple(x.get(property_key) for x in self.data_query)
+        if property_key not in FIELD_KEYS:
+            return (None,) * len(self.datatraj.id)
+        return tuple(self.get_vehicles_column(property_key).tolist())
 
     def filter_vehicle_property(self, property: str, *args):
         """Filter out a property for a subset of vehicles
@@ -116,16 +230,10 @@ class SimulatorRequest(Publisher):
             vehids (int):
                 separate the ``vehid`` via commas to get the corresponding property
         """
-        if args:
-            sargs = set(args)
-            vehids = set(self.get_vehicles_property("vehid"))
-            fin_ids = vehids.intersection(sargs)
-            return tuple(
-                veh.get(property)
-                for veh in self.get_vehicle_data()
-                if veh.get("vehid") in fin_ids
-            )
-        return self.get_vehicles_property(property)
+        if property not in FIELD_KEYS:
+            vehids = self.filter_vehicle_column("vehid", *args)
+            return (None,) * len(vehids)
+        return tuple(self.filter_vehicle_column(property, *args).tolist())
 
     def get_vehicle_properties(self, vehid: int) -> dict:
         """Return all properties for a given vehicle id
@@ -133,11 +241,10 @@ class SimulatorRequest(Publisher):
         Returns:
             vehdata (dict): Dictionary with all vehicle properties
         """
-        data = self.get_vehicle_data()
-        for v in data:
-            if v["vehid"] == vehid:
-                return v
-        return {}
+        row = self.datatraj.index.get(vehid)
+        if row is None:
+            return {}
+        return self.get_vehicle_data()[row]
 
     def is_vehicle_in_network(self, vehid: int, *args) -> bool:
         """True if veh id is in the network at current state, for multiple
@@ -150,11 +257,8 @@ class SimulatorRequest(Publisher):
             present (bool): True if vehicle is in the network otherwise false.
 
         """
-        all_vehs = self.get_vehicles_property("vehid")
-        if not args:
-            return vehid in all_vehs
-        vehids = set((vehid, *args))
-        return set(vehids).issubset(set(all_vehs))
+        index = self.datatraj.index
+        return all(v in index for v in (vehid, *args))
 
     def vehicles_in_link(self, link: str, lane: int = 1) -> tuple:
         """Returns a tuple containing vehicle ids traveling on the same
@@ -168,11 +272,7 @@ class SimulatorRequest(Publisher):
             vehs (tuple): set of vehicles in link/lane
 
         """
-        return tuple(
-            veh.get("vehid")
-            for veh in self.get_vehicle_data()
-            if veh.get("link") == link and veh.get("lane") == lane
-        )
+        return self.datatraj.link_index.get((link, lane), ())
 
     def is_vehicle_in_link(self, veh: int, link: str) -> bool:
         """Returns true if a vehicle is in a link at current state
@@ -185,8 +285,10 @@ class SimulatorRequest(Publisher):
             present (bool): True if veh is in link
 
         """
-        veh_ids = self.vehicles_in_link(link)
-        return set((veh,)).issubset(set(veh_ids))
+        row = self.datatraj.index.get(veh)
+        if row is None:
+            return False
+        return self.datatraj.columns["tron"][row] == link
 
     def is_vehicle_driven(self, vehid: int) -> bool:
         """Returns true if the vehicle state is exposed to a driven state
@@ -198,15 +300,10 @@ class SimulatorRequest(Publisher):
         Returns:
             driven (bool): True if veh is driven
         """
-        if self.is_vehicle_in_network(vehid):
-
-            forced = tuple(
-                veh.get("driven") == True
-                for veh in self.get_vehicle_data()
-                if veh.get("vehid") == vehid
-            )
-            return any(forced)
-        return False
+        row = self.datatraj.index.get(vehid)
+        if row is None:
+            return False
+        return bool(self.datatraj.columns["etat_pilotage"][row])
 
     def vehicle_downstream_of(self, vehid: int) -> tuple:
         """Get ids of vehicles downstream to vehid
@@ -77,3 +77,52 @@ def test_context_observer(channels):
 
 def test_context_dispatch(channels):
     pass
+
+
+def test_keyed_observer_selected_values():
+    class Values(Publisher):
+        data = {1: "a", 2: "b"}
+
+        def select(self, field, values):
+            return {v: self.data[v] for v in values if v in self.data}
+
+    p = Values()
+    received = []
+    s1 = Subscriber(p, key=("vehid", 1))
+    s3 = Subscriber(p, key=("vehid", 3))
+    p.attach(p, "default", received.append, key=("vehid", 2))
+    p.dispatch()
+    assert received == ["b"]
+    assert s1._call == 1
+    assert s3._call == 0
+    p.detach(s1, "default")
+    p.dispatch()
+    assert received == ["b", "b"]
+    assert s1._call == 1
+    assert p._keyed["default"]["vehid"].keys() == {2, 3}
+
+
+def test_keyed_observer_changes_only():
+    p = Publisher()
+    received = []
+    s = Subscriber(p)
+    p.detach(s, "default")
+    p.attach(s, "default", received.append, key=("link", "Zone_001"), changes_only=True)
+    p.dispatch()
+    p.dispatch()
+    assert received == [None]
+
+
+def test_dispatch_callbacks_change_subscriptions():
+    p = Publisher()
+    received = []
+
+    def attach_keyed():
+        p.detach(p, "default")
+        p.attach(p, "default", received.append, key=("link", "Zone_001"))
+
+    p.attach(p, "default", attach_keyed)
+    p.dispatch()
+    assert received == []
+    p.dispatch()
+    assert received == [None]
@@ -0,0 +1,64 @@
+"""
+    Unit tests for symupy.parser.columnar
+"""
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import os
+import shutil
+import pytest
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.parser.columnar import TrajectoryCache
+
+# ============================================================================
+# TESTS AND DEFINITIONS
+# ============================================================================
+
+
+@pytest.fixture
+def bottleneck_001_traf(tmp_path):
+    file_path = ("tests", "mocks", "outputs", "bottleneck_001_traf.xml")
+    return shutil.copy(os.path.join(os.getcwd(), *file_path), tmp_path)
+
+
+def test_build_partitions(bottleneck_001_traf):
+    cache = TrajectoryCache.build(bottleneck_001_traf, window=2.0)
+    assert len(cache) == 4
+    assert [(p["t0"], p["t1"]) for p in cache.partitions] == [(1.0, 1.0), (2.0, 3.0)]
+    assert cache.start == "08:00:00"
+    assert cache.links.tolist() == ["Zone_001", "Zone_002"]
+    assert cache.partition(1)["id"].tolist() == [0, 1, 1]
+    assert cache.vehicles["itineraire"].tolist() == ["Zone_001", "Zone_001 Zone_002"]
+
+
+def test_trajectories(bottleneck_001_traf):
+    cache = TrajectoryCache.build(bottleneck_001_traf, window=2.0)
+    trajectories = cache.trajectories(["1", 5])
+    assert list(trajectories) == ["1"]
+    assert trajectories["1"]["time"].tolist() == [2.0, 3.0]
+    assert trajectories["1"]["tron"].tolist() == ["Zone_001", "Zone_002"]
+    assert trajectories["1"]["voie"].tolist() == [1, 2]
+
+
+def test_scan_partitions(bottleneck_001_traf, monkeypatch):
+    cache = TrajectoryCache.build(bottleneck_001_traf, window=2.0)
+    read = []
+    partition = cache.partition
+    monkeypatch.setattr(cache, "partition", lambda index: read.append(index) or partition(index))
+    batches = list(cache.scan(2.5, 10.0, vehids=[1]))
+    assert read == [1]
+    assert [batch["time"].tolist() for batch in batches] == [[3.0]]
+
+
+def test_load_fresh_only(bottleneck_001_traf):
+    assert TrajectoryCache.load(bottleneck_001_traf) is None
+    TrajectoryCache.build(bottleneck_001_traf)
+    assert len(TrajectoryCache.load(bottleneck_001_traf)) == 4
+    with open(bottleneck_001_traf, "a") as f:
+        f.write("<!-- modified -->\n")
+    assert TrajectoryCache.load(bottleneck_001_traf) is None
@@ -8,6 +8,7 @@
 import os
 import platform
 import pytest
+import numpy as np
 
 # ============================================================================
 # INTERNAL IMPORTS
@@ -18,7 +19,8 @@ import pytest
 # TESTS AND DEFINITIONS
 # ============================================================================
 
-from symupy.parser.xmlparser import XMLParser, XMLTrajectory
+from symupy.parser.xmlparser import XMLIndex, XMLParser, XMLTrajectory
+from symupy.utils.exceptions import SymupyFileLoadError
 
 
 @pytest.fixture
@@ -40,6 +42,82 @@ def test_sourceline(bottleneck_001):
     assert elem.sourceline == 60
 
 
+def test_index_lookups(bottleneck_001):
+    parser = XMLParser(bottleneck_001)
+    simulations = parser.xpath("ROOT_SYMUBRUIT/SIMULATIONS")
+    simulation = simulations.find_children_attr("id", "simID2")
+    assert simulation.sourceline == 7
+    assert simulation.attr["fin"] == "00:00:30"
+    assert simulation.find_children_tag("RESTITUTION").attr["trajectoires"] == "true"
+    assert simulations.find_children_attr("id", "missing") is None
+    assert parser.get_root().tag == "ROOT_SYMUBRUIT"
+
+
+def test_index_sidecar(tmp_path):
+    filename = str(tmp_path / "scenario.xml")
+    with open(filename, "w") as f:
+        f.write('<?xml version="1.0"?>\n<!-- <A/> -->\n<ROOT>\n  <A id="1"/>\n  <A id="2">\n  </A>\n</ROOT>\n')
+    index = XMLIndex(filename, sidecar=True)
+    assert os.path.exists(filename + ".symidx")
+    assert index.tags == ("ROOT", "A")
+    assert index.line.tolist() == [3, 4, 5]
+    assert list(index.children(0)) == [1, 2]
+
+    assert index.child_values(0, "id").tolist() == [1.0, 2.0]
+
+    reloaded = XMLIndex(filename, sidecar=True)
+    assert reloaded.stop.tolist() == index.stop.tolist()
+    assert reloaded.child_by_attr(0, "id", "2") == 2
+    assert reloaded._values[0, "id"].tolist() == [1.0, 2.0]
+
+    with open(filename, "a") as f:
+        f.write("<!-- modified -->\n")
+    assert len(XMLIndex(filename, sidecar=True)) == 3
+
+
+def test_index_no_sidecar_by_default(tmp_path):
+    filename = str(tmp_path / "scenario.xml")
+    with open(filename, "w") as f:
+        f.write("<ROOT><A/></ROOT>")
+    assert len(XMLIndex(filename)) == 2
+    assert not os.path.exists(filename + ".symidx")
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ("<ROOT>\n  <A>\n</ROOT>\n", "</ROOT> on line 3"),
+        ("<ROOT>\n</ROOT>\n</A>\n", "</A> on line 3"),
+        ("<ROOT>\n  <A/>\n", "<ROOT> on line 1"),
+    ],
+)
+def test_index_malformed(tmp_path, content, message):
+    filename = str(tmp_path / "broken.xml")
+    with open(filename, "w") as f:
+        f.write(content)
+    with pytest.raises(SymupyFileLoadError, match=message):
+        XMLIndex(filename)
+
+
+def test_shared_mapping(tmp_path):
+    filename = str(tmp_path / "network.xml")
+    content = '<RESEAU id="réseau">\r\n  <TRONCON id="élément" vit_reg="13.9"/>\r\n  <TRONCON id="Zone_002"/>\r\n</RESEAU>\r\n'
+    with open(filename, "w", encoding="UTF8", newline="") as f:
+        f.write(content)
+
+    with XMLParser(filename) as parser:
+        root = parser.get_root()
+        # Elements are sliced from the mapping, the file is not opened again
+        os.remove(filename)
+        first, second = root.getchildrens()
+        assert root.attr["id"] == "réseau"
+        assert first.attr == {"id": "élément", "vit_reg": "13.9"}
+        assert second.sourceline == 3
+        assert second.source == b'<TRONCON id="Zone_002"/>'
+        assert root.source == content.strip().encode("UTF8")
+        assert root.find_children_attr("id", "Zone_002") == second
+
+
 @pytest.fixture
 def multiple_traces():
     STREAM = b'<INST nbVeh="92" val="301.00"><CREATIONS/><SORTIES/><TRAJS><TRAJ abs="999.63" acc="0.00" dst="999.63" id="148" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="992.28" acc="0.00" dst="992.28" id="149" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="984.93" acc="0.00" dst="984.93" id="150" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="977.57" acc="0.00" dst="977.57" id="151" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="970.22" acc="0.00" dst="970.22" id="152" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="962.87" acc="0.00" dst="962.87" id="153" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="955.51" acc="0.00" dst="955.51" id="154" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="948.16" acc="0.00" dst="948.16" id="155" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="940.81" acc="0.00" dst="940.81" id="156" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="933.46" acc="0.00" dst="933.46" id="157" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="926.10" acc="0.00" dst="926.10" id="158" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="918.75" acc="0.00" dst="918.75" id="159" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="911.40" acc="0.00" dst="911.40" id="160" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="904.04" acc="0.00" dst="904.04" id="161" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="896.69" acc="0.00" dst="896.69" id="162" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="889.34" acc="0.00" dst="889.34" id="163" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="881.99" acc="0.00" dst="881.99" id="164" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="874.63" acc="0.00" dst="874.63" id="165" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="867.28" acc="0.00" dst="867.28" id="166" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="859.93" acc="0.00" dst="859.93" id="167" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="852.57" acc="0.00" dst="852.57" id="168" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="845.22" acc="0.00" dst="845.22" id="169" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="837.87" acc="0.00" dst="837.87" id="170" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="830.51" acc="0.00" dst="830.51" id="171" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="823.16" acc="0.00" dst="823.16" id="172" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="815.81" acc="0.00" dst="815.81" id="173" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="808.46" acc="0.00" dst="808.46" id="174" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="801.10" acc="0.00" dst="801.10" id="175" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="793.75" acc="0.00" dst="793.75" id="176" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="786.40" acc="0.00" dst="786.40" id="177" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="779.04" acc="0.00" dst="779.04" id="178" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="771.69" acc="0.00" dst="771.69" id="179" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="764.34" acc="0.00" dst="764.34" id="180" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="756.98" acc="0.00" dst="756.98" id="181" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="749.63" acc="0.00" dst="749.63" id="182" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="742.28" acc="0.00" dst="742.28" id="183" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="734.93" acc="0.00" dst="734.93" id="184" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="727.57" acc="0.00" dst="727.57" id="185" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="720.22" acc="0.00" dst="720.22" id="186" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="712.87" acc="0.00" dst="712.87" id="187" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="705.51" acc="0.00" dst="705.51" id="188" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="698.16" acc="0.00" dst="698.16" id="189" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="690.81" acc="0.00" dst="690.81" id="190" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="683.46" acc="0.00" dst="683.46" id="191" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="676.10" acc="0.00" dst="676.10" id="192" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="668.75" acc="0.00" dst="668.75" id="193" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="661.40" acc="0.00" dst="661.40" id="194" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="654.04" acc="0.00" dst="654.04" id="195" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="646.69" acc="0.00" dst="646.69" id="196" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="639.34" acc="0.00" dst="639.34" id="197" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="631.98" acc="0.00" dst="631.98" id="198" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="624.63" acc="0.00" dst="624.63" id="199" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="617.28" acc="0.00" dst="617.28" id="200" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="609.93" acc="0.00" dst="609.93" id="201" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="602.57" acc="0.00" dst="602.57" id="202" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="595.22" acc="0.00" dst="595.22" id="203" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="587.87" acc="0.00" dst="587.87" id="204" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="580.51" acc="0.00" dst="580.51" id="205" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="573.16" acc="0.00" dst="573.16" id="206" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="565.81" acc="-0.00" dst="565.81" id="207" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="558.45" acc="0.00" dst="558.45" id="208" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="551.10" acc="0.00" dst="551.10" id="209" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="543.75" acc="0.00" dst="543.75" id="210" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="536.40" acc="-0.00" dst="536.40" id="211" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="529.04" acc="0.00" dst="529.04" id="212" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="521.69" acc="0.00" dst="521.69" id="213" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="514.34" acc="0.00" dst="514.34" id="214" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="506.98" acc="-0.00" dst="506.98" id="215" ord="0.00" tron="L_0" type="VL" vit="1.47" voie="1" z="0.00"/><TRAJ abs="499.63" acc="0.00" dst="499.63" id="216" ord="0.00" tron="L_0" type="VL" vit="1.48" voie="1" z="0.00"/><TRAJ abs="492.27" acc="0.00" dst="492.27" id="217" ord="0.00" tron="L_0" type="VL" vit="1.48" voie="1" z="0.00"/><TRAJ abs="484.91" acc="0.00" dst="484.91" id="218" ord="0.00" tron="L_0" type="VL" vit="1.48" voie="1" z="0.00"/><TRAJ abs="477.56" acc="-0.08" dst="477.56" id="219" ord="0.00" tron="L_0" type="VL" vit="1.48" voie="1" z="0.00"/><TRAJ abs="470.20" acc="0.00" dst="470.20" id="220" ord="0.00" tron="L_0" type="VL" vit="1.56" voie="1" z="0.00"/><TRAJ abs="462.76" acc="0.00" dst="462.76" id="221" ord="0.00" tron="L_0" type="VL" vit="1.56" voie="1" z="0.00"/><TRAJ abs="455.32" acc="0.00" dst="455.32" id="222" ord="0.00" tron="L_0" type="VL" vit="1.56" voie="1" z="0.00"/><TRAJ abs="447.88" acc="-1.39" dst="447.88" id="223" ord="0.00" tron="L_0" type="VL" vit="1.56" voie="1" z="0.00"/><TRAJ abs="440.44" acc="-1.06" dst="440.44" id="224" ord="0.00" tron="L_0" type="VL" vit="2.94" voie="1" z="0.00"/><TRAJ abs="431.62" acc="-11.11" dst="431.62" id="225" ord="0.00" tron="L_0" type="VL" vit="4.00" voie="1" z="0.00"/><TRAJ abs="421.73" acc="-9.52" dst="421.73" id="226" ord="0.00" tron="L_0" type="VL" vit="15.48" voie="1" z="0.00"/><TRAJ abs="400.00" acc="0.00" dst="400.00" id="227" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="368.75" acc="0.00" dst="368.75" id="228" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="337.50" acc="0.00" dst="337.50" id="229" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="306.25" acc="0.00" dst="306.25" id="230" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="275.00" acc="0.00" dst="275.00" id="231" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="243.75" acc="0.00" dst="243.75" id="232" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="212.50" acc="0.00" dst="212.50" id="233" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="181.25" acc="0.00" dst="181.25" id="234" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="150.00" acc="0.00" dst="150.00" id="235" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="118.75" acc="0.00" dst="118.75" id="236" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="87.50" acc="0.00" dst="87.50" id="237" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="56.25" acc="0.00" dst="56.25" id="238" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="25.00" acc="0.00" dst="25.00" id="239" ord="0.00" tron="L_0" type="VL" vit="25.00" voie="1" z="0.00"/></TRAJS><STREAMS/><LINKS/><SGTS/><FEUX/><ENTREES><ENTREE id="O" nb_veh_en_attente="0"/></ENTREES><REGULATIONS/></INST>'
@@ -193,3 +271,26 @@ def test_xml_trajectory_parse_hybrid(
     assert z.vit == dict(zip(ids, [x[8] for x in multiple_traces_hybrid_tuple]))
     assert z.lane == dict(zip(ids, [x[9] for x in multiple_traces_hybrid_tuple]))
     assert z.z == dict(zip(ids, [x[10] for x in multiple_traces_hybrid_tuple]))
+
+
+def test_xml_trajectory_columns(multiple_traces, multiple_traces_tuple):
+    z = XMLTrajectory(multiple_traces)
+    columns = z.columns
+    assert columns["vit"].dtype == np.float64
+    assert columns["id"].dtype == np.int32
+    assert columns["voie"].dtype == np.int32
+    assert columns["etat_pilotage"].dtype == bool
+    assert columns["id"].tolist() == [x[4] for x in multiple_traces_tuple]
+    assert columns["tron"].tolist() == [x[6] for x in multiple_traces_tuple]
+
+
+def test_xml_trajectory_parse_extra_attributes():
+    STREAM = b'<INST nbVeh="2" val="6.00"><CREATIONS/><SORTIES/><TRAJS><TRAJ abs="843554.88" acc="2.00" deltaN="1.00" dst="43.56" id="0" lead="-1" ord="6519864.04" tron="Rue_Crequi_SN_1" type="VL" vit="14.00" voie="1" z="0.00"/><TRAJ abs="843559.27" acc="0,50" deltaN="1.00" dst="17.41" etat_pilotage="force" id="1" lead="0" ord="6519838.26" tron="Rue_Crequi_SN_1" type="VL" vit="99.00" voie="2" z="0.00"/></TRAJS><STREAMS/></INST>'
+    z = XMLTrajectory(STREAM)
+    assert z.id == (0, 1)
+    assert z.acc == {0: 2.0, 1: 0.5}
+    assert z.lane == {0: 1, 1: 2}
+    assert z.driven == {0: False, 1: True}
+    assert z.traj[1] == (
+        843559.27, 0.5, 17.41, True, 1, 6519838.26, "Rue_Crequi_SN_1", "VL", 99.0, 2, 0.0,
+    )
@@ -6,6 +6,7 @@
 # ============================================================================
 
 import os
+import shutil
 import platform
 import pytest
 
@@ -18,7 +19,11 @@ import pytest
 # TESTS AND DEFINITIONS
 # ============================================================================
 
-from symupy.plugins.reader.symuflow import SymuFlowNetworkReader
+from symupy.plugins.reader.symuflow import (
+    SymuFlowNetworkReader,
+    SymuFlowTrafficDataReader,
+)
+from symupy.parser.xmlparser import XMLIndex
 
 
 @pytest.fixture
@@ -28,6 +33,13 @@ def bottleneck_001():
     return os.path.join(os.getcwd(), *file_path)
 
 
+@pytest.fixture
+def bottleneck_001_traf():
+    file_name = "bottleneck_001_traf.xml"
+    file_path = ("tests", "mocks", "outputs", file_name)
+    return os.path.join(os.getcwd(), *file_path)
+
+
 def test_getlinks(bottleneck_001):
     reader = SymuFlowNetworkReader(bottleneck_001)
     links = reader.get_links()
@@ -53,3 +65,83 @@ def test_getlinkattributes(bottleneck_001):
     assert lkinfo.get("Zone_001") == 1
     lkinfo = network.get_links_attributes("internal_points")
     assert lkinfo.get("Zone_001") == []
+
+
+@pytest.mark.parametrize("backend", ["index", "stream"])
+def test_get_trip(bottleneck_001_traf, backend):
+    reader = SymuFlowTrafficDataReader(bottleneck_001_traf, backend=backend)
+    trip = reader.get_trip("1")
+    assert trip.path.links == ["Zone_001", "Zone_002"]
+    assert [state.time.to_hhmmss() for state in trip.states] == [
+        "08:00:02.0",
+        "08:00:03.0",
+    ]
+    assert [state.link for state in trip.states] == ["Zone_001", "Zone_002"]
+    assert trip.states[-1].lane == 2
+
+
+def test_reader_sidecar(bottleneck_001_traf, tmp_path, monkeypatch):
+    filename = str(tmp_path / "output_traf.xml")
+    shutil.copy(bottleneck_001_traf, filename)
+    reader = SymuFlowTrafficDataReader(filename, cache=False, sidecar=True)
+    assert os.path.exists(filename + ".symidx")
+    assert not os.path.exists(bottleneck_001_traf + ".symidx")
+
+    def rebuild(index):
+        raise AssertionError("Index rebuilt")
+
+    monkeypatch.setattr(XMLIndex, "_build", rebuild)
+    reader = SymuFlowTrafficDataReader(filename, cache=False, sidecar=True)
+    assert reader.get_trip("1").path.links == ["Zone_001", "Zone_002"]
+
+
+def test_get_trips_single_pass(bottleneck_001_traf):
+    reader = SymuFlowTrafficDataReader(bottleneck_001_traf, backend="stream")
+    trips = reader.get_trips([0, 1, 7])
+    assert set(trips) == {"0", "1"}
+    assert [state.speed for state in trips["0"].states] == [25.0, 25.0]
+    assert trips["0"].arrival_time == "2.50"
+
+
+def test_get_trip_from_cache(bottleneck_001_traf, tmp_path):
+    filename = shutil.copy(bottleneck_001_traf, tmp_path)
+    SymuFlowTrafficDataReader(filename).build_cache(window=2.0)
+    reader = SymuFlowTrafficDataReader(filename)
+    assert reader._cache is not None
+    trip = reader.get_trip(1)
+    assert [state.speed for state in trip.states] == [20.0, 21.0]
+    assert trip.states[0].time.to_hhmmss() == "08:00:02.0"
+    assert reader.get_path(1).links == ["Zone_001", "Zone_002"]
+    assert reader.count_OD(("08:00:00", "08:00:01")) == {("Ext_In", "Ext_Out"): 1}
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_scan(bottleneck_001_traf, tmp_path, cached):
+    filename = shutil.copy(bottleneck_001_traf, tmp_path)
+    reader = SymuFlowTrafficDataReader(filename)
+    if cached:
+        reader.build_cache(window=2.0)
+
+    (batch,) = reader.scan("08:00:02", "08:00:03")
+    assert batch["time"].tolist() == [2.0, 2.0, 3.0]
+    assert batch["id"].tolist() == [0, 1, 1]
+    assert batch["tron"].tolist() == ["Zone_001", "Zone_001", "Zone_002"]
+
+    (batch,) = reader.scan(1.0, vehids=["1"], links=["Zone_002"])
+    assert batch["vit"].tolist() == [21.0]
+    assert list(reader.scan("08:00:04")) == []
+
+
+def test_scan_reuses_sidecar(bottleneck_001_traf, tmp_path, monkeypatch):
+    filename = shutil.copy(bottleneck_001_traf, tmp_path)
+    reader = SymuFlowTrafficDataReader(filename, cache=False, sidecar=True)
+    (expected,) = reader.scan("08:00:02", "08:00:03")
+
+    def rebuild(*args):
+        raise AssertionError("Index rebuilt")
+
+    monkeypatch.setattr(XMLIndex, "_build", rebuild)
+    monkeypatch.setattr(XMLIndex, "_save", rebuild)
+    reader = SymuFlowTrafficDataReader(filename, cache=False, sidecar=True)
+    (batch,) = reader.scan("08:00:02", "08:00:03")
+    assert batch["id"].tolist() == expected["id"].tolist()
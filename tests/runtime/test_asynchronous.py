@@ -0,0 +1,78 @@
+"""
+    Unit tests for symupy.runtime.api.asynchronous
+"""
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import asyncio
+import threading
+from ctypes import c_int
+from types import SimpleNamespace
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.runtime.api import Simulator, AsyncSimulator
+from symupy.tsc.vehicles import VehicleList
+from symupy.utils.parser import SimulatorRequest
+
+# ============================================================================
+# TESTS AND DEFINITIONS
+# ============================================================================
+
+
+def stream(step):
+    return (
+        f'<INST nbVeh="1" val="{step}.00"><CREATIONS/><SORTIES/><TRAJS>'
+        f'<TRAJ abs="{step}.00" acc="0.00" dst="{step}.00" id="0" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/>'
+        "</TRAJS></INST>"
+    ).encode()
+
+
+def mock_simulator(last, threads):
+    steps = iter(range(1, 100))
+
+    def answer(buffer, write_xml, b_end):
+        threads.add(threading.get_ident())
+        step = next(steps)
+        buffer.value = stream(step)
+        return step < last
+
+    simulator = Simulator(bufferSize=4096, step_launch_mode="full")
+    simulator._Simulator__library = SimpleNamespace(SymRunNextStepEx=answer)
+    simulator.request = SimulatorRequest()
+    simulator.vehicles = VehicleList(simulator.request)
+    simulator._n_iter = iter(range(10))
+    simulator._c_iter = next(simulator._n_iter)
+    simulator._bContinue = True
+    simulator._b_end = c_int()
+    return simulator
+
+
+def test_async_steps_responsive():
+    threads = set()
+    ticks = []
+
+    async def follow(simulator):
+        times = []
+        async for step in simulator.steps():
+            times.append((step, simulator.request.current_time))
+            await asyncio.sleep(0)
+        return times
+
+    async def tick():
+        for i in range(3):
+            ticks.append(i)
+            await asyncio.sleep(0)
+
+    async def main():
+        simulator = AsyncSimulator(mock_simulator(5, threads))
+        times, _ = await asyncio.gather(follow(simulator), tick())
+        return times
+
+    times = asyncio.run(main())
+    assert times == [(1, 1.0), (2, 2.0), (3, 3.0), (4, 4.0), (5, 5.0)]
+    assert ticks == [0, 1, 2]
+    assert threading.get_ident() not in threads
@@ -0,0 +1,78 @@
+"""
+    Unit tests for symupy.runtime.batch
+"""
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import os
+import pytest
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.runtime.batch import BatchJob, BatchRunner, apply_overrides
+from symupy.runtime.api import Simulation
+
+# ============================================================================
+# TESTS AND DEFINITIONS
+# ============================================================================
+
+
+@pytest.fixture
+def bottleneck_001():
+    file_name = "bottleneck_001.xml"
+    file_path = ("tests", "mocks", "bottlenecks", file_name)
+    return os.path.join(os.getcwd(), *file_path)
+
+
+def fake_job(conn, job, kpis, per_step):
+    # Emulates a scenario run, crashes on first attempt for "crash" jobs
+    marker = job.options.get("marker", "")
+    if job.scenario == "crash" and not os.path.exists(marker):
+        open(marker, "w").close()
+        conn.send(("step", 0, {"step": 0}))
+        os._exit(1)
+    if job.scenario == "error":
+        conn.send(("error", "boom"))
+        return
+    for step in range(3):
+        if per_step:
+            conn.send(("step", step, {"step": step}))
+    conn.send(("done", {"scenario": job.scenario}))
+
+
+def test_apply_overrides(bottleneck_001):
+    path = apply_overrides(bottleneck_001, {"SIMULATIONS/SIMULATION": {"fin": "07:00:10"}})
+    try:
+        assert os.path.dirname(path) == os.path.dirname(bottleneck_001)
+        assert Simulation(path).get_simulation_parameters()[0]["fin"] == "07:00:10"
+    finally:
+        os.remove(path)
+
+
+def test_batch_runner_streams_and_retries(tmp_path):
+    marker = str(tmp_path / "crashed")
+    jobs = [
+        "a",
+        BatchJob("crash", options={"marker": marker}),
+        "error",
+    ]
+    steps = []
+    runner = BatchRunner(jobs, max_workers=2, retries=1, per_step=True, target=fake_job)
+    results = runner.run(on_step=lambda index, step, kpis: steps.append((index, step)))
+
+    assert [r.status for r in results] == ["done", "done", "failed"]
+    assert results[0].kpis == {"scenario": "a"}
+    assert results[1].attempts == 2
+    assert results[2].error == "boom"
+    assert sorted(s for i, s in steps if i == 0) == [0, 1, 2]
+    assert [s for s, _ in results[1].steps] == [0, 1, 2]
+
+
+def test_batch_runner_memory_budget():
+    runner = BatchRunner(["a"] * 4, max_workers=4, memory_budget=2 << 30, worker_memory=1 << 30)
+    assert runner.max_workers == 2
+    assert runner.worker_memory == 1 << 30
+    assert BatchRunner(["a"], worker_memory=1 << 30).worker_memory == 1 << 30
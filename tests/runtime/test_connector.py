@@ -8,12 +8,24 @@
 import os
 import platform
 import pytest
+from types import SimpleNamespace
+from ctypes import c_int, c_double
 
 # ============================================================================
 # INTERNAL IMPORTS
 # ============================================================================
 
 from symupy.runtime.api import Simulation, Simulator
+from symupy.runtime.api.prototypes import SymuFlowLibrary
+from symupy.runtime.api.mfd import MFDSampler
+from symupy.parser.xmlparser import SNAPSHOT_DTYPE
+from symupy.utils.exceptions import (
+    SymupyVehicleCreationError,
+    SymupyDriveVehicleError,
+    SymupyError,
+)
+from symupy.utils.parser import SimulatorRequest
+from symupy.tsc.vehicles import VehicleList
 import symupy.utils.constants as CT
 
 # ============================================================================
@@ -56,6 +68,256 @@ def test_load_symuvia_via_api(symuvia_library_path):
     assert simulator.library_path == symuvia_library_path
 
 
+def test_library_prototypes():
+    library = SimpleNamespace(
+        SymGetVehicleSpeed=lambda vehid: 25.0, SymOther=lambda: 1
+    )
+    with pytest.warns(UserWarning):
+        typed = SymuFlowLibrary(library)
+    assert typed.SymGetVehicleSpeed.restype is c_double
+    assert typed.SymGetVehicleSpeed.argtypes == [c_int]
+    assert typed.SymOther() == 1
+    assert not hasattr(typed, "SymRunEx")
+
+
+def test_add_control_zone_arguments():
+    calls = []
+    simulator = Simulator()
+    simulator._Simulator__library = SimpleNamespace(
+        SymAddControlZoneEx=lambda *args: calls.append(args) or len(calls),
+        SymApplyControlZonesEx=lambda n: 0,
+    )
+    simulator._sim = SimpleNamespace(get_links_in_mfd_sensor=lambda sensor: ["L1", "L2"])
+    zones = simulator.add_control_probability_zone_mfd({"Zone": 0.5}, {"Zone": 100})
+    assert zones == {"Zone": 1}
+    assert calls == [(-1, 0.5, 100, 1.0, b"L1 L2")]
+    assert type(calls[0][3]) is float
+
+
+def test_run_pipelined():
+    def stream(step):
+        return (
+            f'<INST nbVeh="1" val="{step}.00"><CREATIONS/><SORTIES/><TRAJS>'
+            f'<TRAJ abs="{step}.00" acc="0.00" dst="{step}.00" id="0" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/>'
+            "</TRAJS></INST>"
+        ).encode()
+
+    steps = iter(range(1, 100))
+
+    def answer(buffer, write_xml, b_end):
+        step = next(steps)
+        buffer.value = stream(step)
+        return step < 6
+
+    simulator = Simulator(bufferSize=4096)
+    simulator._Simulator__library = SimpleNamespace(SymRunNextStepEx=answer)
+    simulator.request = SimulatorRequest()
+    simulator.request.query = stream(0)
+    simulator.vehicles = VehicleList(simulator.request)
+    simulator._n_iter = iter(range(10))
+    simulator._c_iter = next(simulator._n_iter)
+    simulator._bContinue = True
+    simulator._mfd = MFDSampler(simulator, sensors=("Zone",))
+
+    times = []
+    for step in simulator.run_pipelined(depth=2):
+        times.append((step, simulator.request.current_time))
+        with pytest.raises(SymupyError):
+            simulator.drive_vehicles((0,), (1.0,), links=("Zone_001",))
+        with pytest.raises(SymupyError):
+            simulator.get_vehicle_speed(0)
+        with pytest.raises(SymupyError):
+            simulator.drive_vehicle_new_route(0, "Zone_001")
+        with pytest.raises(SymupyError):
+            simulator.mfd.sample()
+    assert times == [(1, 1.0), (2, 2.0), (3, 3.0), (4, 4.0), (5, 5.0), (6, 6.0)]
+    assert simulator.vehicles.distance.tolist() == [6.0]
+    assert not simulator.do_next
+
+
+def test_request_answer_truncated():
+    answers = iter(
+        [
+            b'<INST nbVeh="0" val="1.00"><CREATIONS/><SORTIES/><TRAJS/></INST>',
+            b"<INST" + b" " * 200,
+        ]
+    )
+
+    def answer(buffer, write_xml, b_end):
+        buffer.value = next(answers)[: len(buffer) - 1]
+        return True
+
+    simulator = Simulator(bufferSize=128, step_launch_mode="full")
+    simulator._Simulator__library = SimpleNamespace(SymRunNextStepEx=answer)
+    simulator.request = SimulatorRequest()
+    simulator.vehicles = VehicleList(simulator.request)
+    simulator._b_end = c_int()
+
+    simulator.request_answer()
+    assert simulator.request.current_time == 1.0
+    with pytest.warns(UserWarning):
+        simulator.request_answer()
+    assert simulator.request.query == ""
+    assert simulator.request.current_time is None
+    assert simulator.response.size == 256
+
+
+def test_step_cache_getters():
+    simulator = Simulator(step_cache=True)
+    calls = []
+
+    def speed(vehid):
+        calls.append(vehid)
+        return 25.0
+
+    simulator._Simulator__library = SimpleNamespace(SymGetVehicleSpeed=speed)
+    assert simulator.get_vehicle_speed(0) == 25.0
+    assert simulator.get_vehicle_speed(0) == 25.0
+    assert simulator.get_vehicle_speed(1) == 25.0
+    assert calls == [0, 1]
+    assert (simulator.step_cache.hits, simulator.step_cache.misses) == (1, 2)
+
+    simulator.invalidate_cache()
+    simulator.get_vehicle_speed(0)
+    assert calls == [0, 1, 0]
+
+    assert Simulator().step_cache is None
+
+
+def _getter(values):
+    def call(vehid):
+        return values[vehid]
+
+    return call
+
+
+def test_get_vehicles_state_lite():
+    simulator = Simulator(step_launch_mode="lite")
+    library = SimpleNamespace()
+    library.SymGetVehicleAcc = _getter({0: 0.5, 3: -1.0})
+    library.SymGetVehicleSpeed = _getter({0: 25.0, 3: 12.0})
+    library.SymGetVehicleLink = _getter({0: b"Zone_001", 3: None})
+    library.SymGetVehicleAbscissa = _getter({0: 10.0, 3: 5.0})
+    library.SymGetVehicleOrdinate = _getter({0: 0.0, 3: 1.0})
+    library.SymGetVehicleLane = _getter({0: 1, 3: 2})
+    library.SymGetVehicleRelativePositionOnLink = _getter({0: 10.0, 3: 5.0})
+    simulator._Simulator__library = library
+
+    state = simulator.get_vehicles_state((0, 3))
+    assert state.dtype == SNAPSHOT_DTYPE
+    assert state["vehid"].tolist() == [0, 3]
+    assert state["speed"].tolist() == [25.0, 12.0]
+    assert state["link"].tolist() == ["Zone_001", ""]
+    assert state["lane"].tolist() == [1, 2]
+
+    state = simulator.get_vehicles_state((3,), fields=("speed",), out=state)
+    assert state["speed"].tolist() == [12.0]
+
+
+def test_inject_demand_bottleneck_001(bottleneck_001):
+    simulator = Simulator()
+    simulator.register_simulation(bottleneck_001)
+    created = []
+
+    def create(origin, destination, vehtype, lane, offset, route):
+        created.append((vehtype, origin, lane, offset, route))
+        return len(created) - 1
+
+    simulator._Simulator__library = SimpleNamespace(
+        SymCreateVehicleWithRouteEx=create
+    )
+    scheduled = simulator.inject_demand(
+        {
+            "type": ["VL", "VL2", "VL"],
+            "origin": ["Ext_In", "Ext_In", "Ext_Out"],
+            "destination": ["Ext_Out", "Ext_Out", "Ext_Out"],
+            "time": [2.5, 0.5, 1.0],
+        }
+    )
+    assert scheduled == 2
+
+    simulator._c_iter = 0
+    assert simulator._inject_demand_step() == (0,)
+    assert created == [(b"VL2", b"Ext_In", 1, 0.5, b"")]
+    simulator._c_iter = 1
+    assert simulator._inject_demand_step() == ()
+    simulator._c_iter = 2
+    assert simulator._inject_demand_step() == (1,)
+    assert created[-1] == (b"VL", b"Ext_In", 1, 0.5, b"")
+    assert simulator._demand == {}
+
+    empty = {"type": ["VL"], "origin": ["Ext_In"], "destination": ["Ext_In"], "time": [0.0]}
+    assert simulator.inject_demand(empty) == 0
+    assert simulator._demand == {}
+    simulator._Simulator__library = None
+    assert simulator._inject_demand_step() == ()
+
+
+def test_inject_demand_validation_bottleneck_001(bottleneck_001):
+    simulator = Simulator()
+    simulator.register_simulation(bottleneck_001)
+    with pytest.raises(SymupyVehicleCreationError):
+        simulator.inject_demand(
+            {
+                "type": ["VL", "TRUCK"],
+                "origin": ["Ext_In", "Ext_In"],
+                "destination": ["Ext_Out", "Ext_Out"],
+                "time": [0.0, 0.0],
+            }
+        )
+
+
+def test_drive_vehicles_single_answer(bottleneck_001):
+    STREAM = b'<INST nbVeh="2" val="4.00"><CREATIONS/><SORTIES/><TRAJS><TRAJ abs="75.00" acc="0.00" dst="75.00" id="0" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="44.12" acc="0.00" dst="44.12" id="1" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/></TRAJS></INST>'
+    simulator = Simulator(step_launch_mode="full", bufferSize=4096)
+    simulator.register_simulation(bottleneck_001)
+    calls = {"answers": 0, "drives": []}
+
+    def answer(buffer, write_xml, b_end):
+        calls["answers"] += 1
+        buffer.value = STREAM
+        return True
+
+    def drive(vehid, link, lane, position, flag):
+        calls["drives"].append((vehid, link, position))
+        return 0
+
+    simulator._Simulator__library = SimpleNamespace(
+        SymRunNextStepEx=answer, SymDriveVehicleEx=drive
+    )
+    simulator._b_end = c_int()
+    simulator.request = SimulatorRequest()
+    simulator.request.query = STREAM
+    simulator.vehicles = VehicleList(simulator.request)
+
+    assert simulator.drive_vehicles((0, 1), (80.0, 50.0)) == 2
+    assert calls["drives"] == []
+    status = simulator.push()
+    assert status == {0: 0, 1: 0}
+    assert calls["answers"] == 1
+    assert calls["drives"] == [(0, b"Zone_001", 80.0), (1, b"Zone_001", 50.0)]
+
+    with pytest.raises(SymupyDriveVehicleError):
+        simulator.drive_vehicles((0,), (10.0,), links=("Unknown",))
+
+    with pytest.raises(SymupyDriveVehicleError):
+        simulator.drive_vehicles((0, 1), (10.0,))
+
+    state = simulator.state
+    simulator._n_iter = iter(range(10))
+    simulator._c_iter = next(simulator._n_iter)
+    simulator.drive_vehicles((0, 7), (90.0, 10.0))
+    simulator.run_step()
+    assert simulator.drive_status == {0: 0, 7: CT.DRIVE_VEHICLE_ABSENT}
+    assert calls["drives"][-1] == (0, b"Zone_001", 90.0)
+    assert simulator.state is state
+
+    # Push without queued orders does not advance the simulator
+    answers = calls["answers"]
+    simulator._Simulator__performPush()
+    assert calls["answers"] == answers
+
+
 # ============================================================================
 # BOTTLENECK 001
 # ============================================================================
@@ -0,0 +1,77 @@
+"""
+    Unit tests for symupy.runtime.api.mfd
+"""
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.runtime.api.mfd import MFDSampler, parse_vehicle_ids
+
+# ============================================================================
+# TESTS AND DEFINITIONS
+# ============================================================================
+
+
+@pytest.fixture
+def simulator():
+    calls = []
+
+    def ttt(sensor):
+        calls.append(sensor)
+        return {b"A": 10.0, b"B": 0.0}[sensor]
+
+    library = SimpleNamespace(
+        SymGetTotalTravelTimeEx=ttt,
+        SymGetTotalTravelDistanceEx=lambda sensor: {b"A": 150.0, b"B": 0.0}[sensor],
+        SymGetListofVehicleIdsEx=lambda sensor: {b"A": b"0 3 ", b"B": b""}[sensor],
+    )
+    return SimpleNamespace(
+        library=library,
+        simulationstep=0,
+        simulation=SimpleNamespace(time_step=1.0),
+        calls=calls,
+        _check_commands=lambda: None,
+    )
+
+
+def test_parse_vehicle_ids():
+    assert parse_vehicle_ids(b"0 3 ") == ("0", "3")
+    assert parse_vehicle_ids(None) == ()
+
+
+def test_mfd_sample_memoized(simulator):
+    sampler = MFDSampler(simulator, sensors=("A", "B"))
+    sample = sampler.sample()
+    assert sample["speed"].tolist() == [15.0, 10.0]
+    assert sample["accumulation"].tolist() == [2, 0]
+    assert sample["vehicles"] == (("0", "3"), ())
+    assert sampler.sample() is sample
+    assert simulator.calls == [b"A", b"B"]
+
+
+def test_mfd_series(simulator):
+    sampler = MFDSampler(simulator, sensors=("A", "B"), vehicles=False)
+    sampler.sample()
+    simulator.simulationstep = 1
+    sampler.sample()
+    series = sampler.series
+    assert series["time"].tolist() == [0.0, 1.0]
+    assert series["ttd"].shape == (2, 2)
+    np.testing.assert_array_equal(series["ttt"][:, 0], [10.0, 10.0])
+
+
+def test_mfd_invalidate(simulator):
+    sampler = MFDSampler(simulator, sensors=("A", "B"), vehicles=False)
+    sample = sampler.sample()
+    sampler.invalidate()
+    assert sampler.sample() is not sample
+    assert simulator.calls == [b"A", b"B", b"A", b"B"]
+    assert sampler.series["time"].tolist() == [0.0]
@@ -9,13 +9,15 @@ import os
 import unittest
 import platform
 import pytest
+from lxml import etree
 from ctypes import create_string_buffer
 
 # ============================================================================
 # INTERNAL IMPORTS
 # ============================================================================
 
-from symupy.runtime.api import Simulation, Simulator
+from symupy.runtime.api import Simulation, Simulator, ScenarioTemplate
+from symupy.utils.exceptions import SymupyFileLoadError
 import symupy.utils.constants as CT
 from symupy.utils.constants import TRACE_FLOW
 
@@ -95,3 +97,55 @@ def test_get_network_endpoints_botleneck_001(bottleneck_001):
     sim_endpoints = scenario.get_network_endpoints()
     END_POINTS = ("Ext_In", "Ext_Out")
     sim_endpoints == END_POINTS
+
+
+def test_cached_metadata_bottleneck_001(bottleneck_001):
+    scenario = Simulation(bottleneck_001)
+    assert scenario.endpoints == frozenset(("Ext_In", "Ext_Out"))
+    assert set(scenario.vehicle_types) == {"VL", "VL2"}
+    assert scenario.links == frozenset(scenario.get_network_links())
+    assert scenario.get_network_links() is scenario.get_network_links()
+    assert scenario.sensors == frozenset()
+
+
+def test_cached_metadata_invalidation(bottleneck_001, bottleneck_002):
+    scenario = Simulation(bottleneck_001)
+    links = scenario.links
+    scenario.xmltree = Simulation(bottleneck_002).xmltree
+    assert scenario.links == Simulation(bottleneck_002).links
+    scenario.load_xml_tree()
+    assert scenario.links == links
+
+
+def test_scenario_template_variants(bottleneck_001, tmp_path):
+    template = ScenarioTemplate(bottleneck_001, directory=str(tmp_path))
+    variants = template.sweep(seed=[1, 2], fin=["00:00:10"])
+    assert len(variants) == 2
+    assert not os.listdir(tmp_path)
+
+    params = Simulation(variants[1].path).get_simulation_parameters()[0]
+    assert params["seed"] == "2"
+    assert params["fin"] == "00:00:10"
+    assert len(os.listdir(tmp_path)) == 1
+    # Base tree is left untouched
+    assert template._tree.getroot().xpath("SIMULATIONS/SIMULATION")[0].get("seed") == "1"
+
+
+def test_scenario_template_callable_override(bottleneck_001, tmp_path):
+    template = ScenarioTemplate(bottleneck_001, directory=str(tmp_path))
+    variant = template.variant({"TRAFICS/TRAFIC": {"coeffrelax": lambda v: float(v) * 2}})
+    assert variant.simulation().xmltree.xpath("TRAFICS/TRAFIC")[0].get("coeffrelax") == "1.1"
+    with pytest.raises(SymupyFileLoadError):
+        template.variant(duration=10)
+
+
+def test_scenario_template_demand_scale(tmp_path):
+    file_name = str(tmp_path / "demand.xml")
+    with open(file_name, "w") as f:
+        f.write('<ROOT><DEMANDES><DEMANDE niveau="0.5"/><DEMANDE duree="60"/></DEMANDES></ROOT>')
+    with ScenarioTemplate(file_name) as template:
+        path = template.variant(demand_scale=2).path
+        demands = etree.parse(path).getroot().xpath(".//DEMANDE")
+        assert [d.get("niveau") for d in demands] == ["1.0", None]
+        assert os.path.dirname(path) == template.directory
+    assert not os.path.exists(os.path.dirname(path))
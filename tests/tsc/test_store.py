@@ -0,0 +1,92 @@
+"""
+    Unit tests for symupy.tsc.store
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import pytest
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.tsc.store import VehicleStore, VehicleHistory
+
+# ============================================================================
+# TESTS AND DEFINITIONS
+# ============================================================================
+
+
+@pytest.fixture
+def store():
+    return VehicleStore(capacity=2)
+
+
+def test_insert_sorted(store):
+    store.insert(vehid=3, speed=10.0)
+    store.insert(vehid=1, speed=20.0)
+    store.insert(vehid=2, speed=30.0, link="L_0")
+    assert store.column("vehid").tolist() == [1, 2, 3]
+    assert store.column("speed").tolist() == [20.0, 30.0, 10.0]
+    assert store.get(2, "link") == "L_0"
+    assert [store.row(vehid) for vehid in (1, 2, 3)] == [0, 1, 2]
+    assert store.capacity == 4
+
+
+def test_insert_many(store):
+    store.insert(vehid=2, speed=10.0)
+    store.insert(vehid=5, speed=20.0)
+    rows = store.insert_many([{"vehid": 6, "speed": 1.0}, {"vehid": 0}, {"vehid": 3, "link": "L_3"}])
+    assert rows == [4, 0, 2]
+    assert store.column("vehid").tolist() == [0, 2, 3, 5, 6]
+    assert store.column("speed").tolist() == [25.0, 10.0, 25.0, 20.0, 1.0]
+    assert [store.row(vehid) for vehid in (0, 2, 3, 5, 6)] == [0, 1, 2, 3, 4]
+    assert store.get(3, "link") == "L_3"
+    assert store.insert_many([]) == []
+
+
+def test_remove_compacts(store):
+    for vehid in range(4):
+        store.insert(vehid=vehid, distance=float(vehid))
+    store.remove({0, 2})
+    assert len(store) == 2
+    assert store.column("distance").tolist() == [1.0, 3.0]
+    assert store.row(3) == 1
+    assert 0 not in store
+
+
+def test_set(store):
+    store.insert(vehid=0)
+    store.set(0, speed=5.0, unknown=1)
+    assert store.get(0, "speed") == 5.0
+
+
+def test_history_ring_buffer(store):
+    history = VehicleHistory(depth=3, capacity=1)
+    store.insert(vehid=0, speed=0.0)
+    for t in range(5):
+        store.set(0, speed=float(t))
+        if t == 2:
+            store.insert(vehid=1, speed=10.0)
+        history.record(float(t), store)
+    assert len(history) == 3
+    assert history.times().tolist() == [2.0, 3.0, 4.0]
+    assert history.last(0, field="speed").tolist() == [2.0, 3.0, 4.0]
+    assert history.last(1, 2, "speed").tolist() == [10.0, 10.0]
+    assert history.fleet([0, 1], 2, "speed").tolist() == [[3.0, 10.0], [4.0, 10.0]]
+    assert history.capacity == 2
+
+
+def test_history_recycled_slot(store):
+    history = VehicleHistory(depth=2, capacity=1)
+    store.insert(vehid=0, speed=5.0)
+    history.record(0.0, store)
+    history.release((0,))
+    store.remove((0,))
+    store.insert(vehid=1, speed=7.0)
+    history.record(1.0, store)
+    first, last = history.last(1, field="speed").tolist()
+    assert first != first  # nan
+    assert last == 7.0
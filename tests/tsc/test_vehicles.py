@@ -14,6 +14,7 @@ import pytest
 
 from symupy.utils.parser import SimulatorRequest
 from symupy.tsc.vehicles import Vehicle, VehicleList
+from symupy.utils.exceptions import SymupyError
 
 # ============================================================================
 # TESTS AND DEFINITIONS
@@ -53,6 +54,13 @@ def two_vehicle_xml():
     return STREAM
 
 
+@pytest.fixture
+def three_vehicle_xml():
+    """ Emulate a XML response for 3 vehicle trajectories"""
+    STREAM = b'<INST nbVeh="3" val="6.00"><CREATIONS/><SORTIES/><TRAJS><TRAJ abs="125.00" acc="0.00" dst="125.00" id="0" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="94.12" acc="0.00" dst="94.12" id="1" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="50.00" acc="0.00" dst="50.00" id="2" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/></TRAJS><STREAMS/><LINKS/><SGTS/><FEUX/><ENTREES><ENTREE id="Ext_In" nb_veh_en_attente="0"/></ENTREES><REGULATIONS/></INST>'
+    return STREAM
+
+
 def test_create_default_vehicle(simrequest):
     v = Vehicle(simrequest)
     assert v.abscissa == 0.0
@@ -91,6 +99,16 @@ def test_create_2_update_vehicle_states(simrequest, two_vehicle_one_forced_xml):
     assert v2.distance == 19.12
 
 
+def test_keyed_vehicle_subscription(simrequest, two_vehicle_xml):
+    v = Vehicle(simrequest, vehid=0)
+    v.vehid = 1
+    simrequest.query = two_vehicle_xml
+    assert v.distance == 44.12
+    links = simrequest.select("link", ("Zone_001", "Zone_002"))
+    assert tuple(links) == ("Zone_001",)
+    assert links["Zone_001"]["vehid"].tolist() == [0, 1]
+
+
 def test_create_vehicle_list_empty(simrequest):
     vl = VehicleList(simrequest)
     assert len(vl) == 0
@@ -120,7 +138,6 @@ def test_create_vehicle_list_1_vehicle_update(
     assert vl[0].distance == 48.00
 
 
-@pytest.mark.skip
 def test_create_vehicle_list_2_vehicles_gradual_update(
     simrequest, one_vehicle_xml, two_vehicle_xml
 ):
@@ -133,3 +150,66 @@ def test_create_vehicle_list_2_vehicles_gradual_update(
     assert len(vl) == 2
     assert vl[0].distance == 75.00
     assert vl[1].distance == 44.12
+
+
+def test_vehicle_list_enter_exit(
+    simrequest, one_vehicle_xml, two_vehicle_xml, one_vehicle_forced_xml
+):
+    simrequest.query = one_vehicle_xml
+    vl = VehicleList(simrequest)
+    assert vl.entered == {0}
+    simrequest.query = two_vehicle_xml
+    vl.update_list()
+    assert vl.entered == {1}
+    assert vl.exited == set()
+    assert [v.vehid for v in vl] == [0, 1]
+    simrequest.query = one_vehicle_forced_xml
+    vl.update_list()
+    assert vl.entered == set()
+    assert vl.exited == {1}
+    assert [v.vehid for v in vl] == [0]
+    assert vl[0].distance == 48.00
+
+
+def test_vehicle_list_vehid_frozen(simrequest, two_vehicle_xml):
+    simrequest.query = two_vehicle_xml
+    vl = VehicleList(simrequest)
+    with pytest.raises(SymupyError):
+        vl[0].vehid = 5
+    assert [veh.vehid for veh in vl] == list(vl.vehids) == [0, 1]
+
+    veh = vl[0]
+    vl.release(veh)
+    veh.vehid = 5
+    assert veh.vehid == 5
+
+
+def test_vehicle_list_views(simrequest, two_vehicle_xml, three_vehicle_xml):
+    simrequest.query = two_vehicle_xml
+    vl = VehicleList(simrequest)
+    assert vl.distance.tolist() == [75.00, 44.12]
+    simrequest.query = three_vehicle_xml
+    vl.update_list()
+    assert vl.distance.tolist() == [125.00, 94.12, 50.00]
+    assert vl.speed.base is not None
+    assert vl[2].itinerary == ["Zone_001"]
+
+
+def test_vehicle_list_history(simrequest, two_vehicle_xml, three_vehicle_xml):
+    simrequest.query = two_vehicle_xml
+    vl = VehicleList(simrequest, history=True, depth=2)
+    vl.update_list()
+    simrequest.query = three_vehicle_xml
+    vl.update_list()
+    assert vl.history.times().tolist() == [4.0, 6.0]
+    assert vl.history.last(0, field="distance").tolist() == [75.0, 125.0]
+    assert vl.history.fleet(vl.vehids, 1, "distance").tolist() == [[125.0, 94.12, 50.0]]
+
+
+def test_vehicle_list_history_empty_query(simrequest, two_vehicle_xml):
+    vl = VehicleList(simrequest, history=True)
+    vl.update_list()
+    assert len(vl.history.times()) == 0
+    simrequest.query = two_vehicle_xml
+    vl.update_list()
+    assert vl.history.times().tolist() == [4.0]
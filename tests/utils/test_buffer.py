@@ -0,0 +1,56 @@
+"""Unit tests for symupy.utils.buffer
+"""
+
+# ============================================================================
+# STANDARD  IMPORTS
+# ============================================================================
+
+import pytest
+
+# ============================================================================
+# INTERNAL IMPORTS
+# ============================================================================
+
+from symupy.utils.buffer import ResponseBuffer
+
+# ============================================================================
+# TESTS AND DEFINITIONS
+# ============================================================================
+
+
+@pytest.fixture
+def response():
+    return ResponseBuffer(size=16, max_size=64)
+
+
+def test_response_complete(response):
+    response.buffer.value = b"<INST/>"
+    assert response.check()
+    assert response.used == 7
+    assert response.size == 16
+
+
+def test_response_truncated_grows(response):
+    response.buffer.raw = b"x" * 16
+    with pytest.warns(UserWarning):
+        assert not response.check()
+    assert response.size == 32
+    assert response.high_water == 16
+    assert response.overflows == 1
+
+
+def test_response_grow_bounded(response):
+    with pytest.warns(UserWarning):
+        response.grow(1000)
+        response.grow()
+    assert response.size == 64
+
+
+def test_response_shrink():
+    response = ResponseBuffer(size=1 << 18, shrink=True, shrink_after=2)
+    response.buffer.value = b"<INST/>"
+    response.check()
+    assert response.size == 1 << 18
+    response.check()
+    assert response.size == 1 << 17
+    assert response.high_water == 7
@@ -32,3 +32,10 @@ def test_default_configurator_constructor(symuvia_library_path):
     assert config.trace_flow == CT.TRACE_FLOW
     assert config.total_steps == CT.TOTAL_SIMULATION_STEPS
     assert config.step_launch_mode == CT.LAUNCH_MODE
+
+
+def test_configurator_buffer_per_instance():
+    config_a = Configurator()
+    config_b = Configurator(bufferSize=1024)
+    assert config_a.buffer_string is not config_b.buffer_string
+    assert len(config_b.buffer_string) == 1024
@@ -456,3 +456,73 @@ def test_retrieve_time_step(simrequest, three_vehicle_xml):
 def test_retrieve_nb_veh(simrequest, three_vehicle_xml):
     simrequest.query = three_vehicle_xml
     assert simrequest.current_nbveh == 3
+
+
+def test_snapshot_nodata(simrequest):
+    snap = simrequest.snapshot()
+    assert len(snap) == 0
+    assert "vehid" in snap.dtype.names
+
+
+def test_snapshot_3_vehicles(simrequest, three_vehicle_xml):
+    simrequest.query = three_vehicle_xml
+    snap = simrequest.snapshot()
+    assert snap["vehid"].tolist() == [0, 1, 2]
+    assert snap["distance"].tolist() == [125.0, 94.12, 50.0]
+    assert snap["link"].tolist() == ["Zone_001"] * 3
+
+
+def test_vehicles_mask(simrequest, three_vehicle_xml):
+    simrequest.query = three_vehicle_xml
+    mask = simrequest.vehicles_mask(link="Zone_001", lane=1)
+    assert mask.tolist() == [True, True, True]
+    mask = simrequest.vehicles_mask(link=("Zone_001", "Zone_002"), vehid=[0, 2])
+    assert simrequest.get_vehicles_column("vehid", mask).tolist() == [0, 2]
+    mask = simrequest.vehicles_mask(lane=2)
+    assert simrequest.get_vehicles_column("vehid", mask).tolist() == []
+
+
+def test_filter_vehicle_column(simrequest, three_vehicle_xml):
+    simrequest.query = three_vehicle_xml
+    dst = simrequest.filter_vehicle_column("distance", 2, 0, 5)
+    assert dst.tolist() == [125.0, 50.0]
+    assert simrequest.filter_vehicle_column("speed").tolist() == [25.0] * 3
+
+
+def test_vehicle_index_two_lanes(simrequest):
+    simrequest.query = b'<INST nbVeh="2" val="4.00"><CREATIONS/><SORTIES/><TRAJS><TRAJ abs="75.00" acc="0.00" dst="75.00" id="3" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="1" z="0.00"/><TRAJ abs="44.12" acc="0.00" dst="44.12" id="7" ord="0.00" tron="Zone_001" type="VL" vit="25.00" voie="2" z="0.00"/></TRAJS><STREAMS/></INST>'
+    assert simrequest.get_vehicle_properties(7)["distance"] == 44.12
+    assert simrequest.get_vehicle_properties(1) == {}
+    assert simrequest.vehicles_in_link("Zone_001", 2) == (7,)
+    assert simrequest.is_vehicle_in_link(7, "Zone_001")
+    assert not simrequest.is_vehicle_in_link(7, "Zone_002")
+    assert simrequest.is_vehicle_in_network(3, 7)
+    assert not simrequest.is_vehicle_driven(3)
+
+
+def test_parse_from_string_buffer(simrequest, two_vehicle_xml, three_vehicle_xml):
+    buffer = create_string_buffer(BUFFER_STRING)
+    buffer.value = three_vehicle_xml
+    buffer.value = two_vehicle_xml  # stale data remains after the terminating NUL
+    simrequest.query = buffer
+    assert simrequest.get_vehicles_property("vehid") == (0, 1)
+    assert simrequest.current_time == 4.00
+    buffer.value = three_vehicle_xml
+    assert simrequest.current_nbveh == 2
+
+
+def test_query_from_string_buffer(simrequest, two_vehicle_xml, three_vehicle_xml):
+    buffer = create_string_buffer(BUFFER_STRING)
+    buffer.value = three_vehicle_xml
+    buffer.value = two_vehicle_xml
+    simrequest.query = buffer
+    assert simrequest.query == two_vehicle_xml.decode("UTF8")
+
+
+def test_parse_buffer_without_instant(simrequest):
+    buffer = create_string_buffer(BUFFER_STRING)
+    buffer.value = b"<OUT/>"
+    simrequest.query = buffer
+    assert simrequest.current_time is None
+    assert simrequest.current_nbveh is None
+    assert simrequest.query == "<OUT/>"